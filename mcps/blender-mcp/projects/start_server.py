@@ -1,38 +1,17 @@
 #!/usr/bin/env python3
-import http.server
-import socketserver
-import os
-import webbrowser
-import threading
-import time
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from static_server import serve, parse_args, CROSS_ORIGIN_ISOLATION_HEADERS
 
 def start_server():
-    PORT = 8000
-    os.chdir('/Users/nukuiyuki/Dev/mcp-tools/Blender')
-    
-    class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-        def end_headers(self):
-            self.send_header('Cross-Origin-Embedder-Policy', 'require-corp')
-            self.send_header('Cross-Origin-Opener-Policy', 'same-origin')
-            super().end_headers()
-    
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
-        print(f"🌐 Server running at http://localhost:{PORT}")
-        print(f"📁 Serving from: {os.getcwd()}")
-        print(f"🦄 Open: http://localhost:{PORT}/projects/fixed_unicorn_viewer.html")
-        print("Press Ctrl+C to stop")
-        
-        # ブラウザを開く
-        def open_browser():
-            time.sleep(1)
-            webbrowser.open(f'http://localhost:{PORT}/projects/fixed_unicorn_viewer.html')
-        
-        threading.Thread(target=open_browser, daemon=True).start()
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Server stopped")
+    root, port, open_path = parse_args(sys.argv[1:], '/Users/nukuiyuki/Dev/mcp-tools/Blender', 8000)
+    serve(
+        root, port, CROSS_ORIGIN_ISOLATION_HEADERS,
+        open_path=open_path or '/projects/fixed_unicorn_viewer.html',
+        links=[("🦄 Open", '/projects/fixed_unicorn_viewer.html')],
+    )
 
 if __name__ == "__main__":
     start_server()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+asyncio版の開発用静的ファイルサーバー
+デモで多数のクライアントが同じビューワーを開くとき用（start_integrated_server.py --async）
+
+- loop.sendfile(): ファイル本体をブロックせずにソケットへ転送
+- 接続ごとの書き込みバックプレッシャー（送信バッファが溜まったら drain で待つ）
+- 大きなファイル（GLBなど）の同時転送数に上限
+- Ctrl+C / SIGTERM で新規接続を止め、処理中の転送を待ってから終了
+- キャッシュヘッダー・Range・ETag/304・圧縮済みファイル・メモリキャッシュ（--cache MB、/__stats）は
+  static_server.py と同じ
+
+ディレクトリ一覧は返さない（index.html がなければ404）
+
+使用方法:
+  python3 async_static_server.py [--root ディレクトリ] [--port 番号] [--open パス] [--cache MB]
+"""
+
+import os
+import sys
+import time
+import signal
+import asyncio
+import posixpath
+import mimetypes
+import contextlib
+import webbrowser
+import email.utils
+import email.parser
+import http.client
+import urllib.parse
+from http import HTTPStatus
+
+from static_server import (
+    KEEP_ALIVE_TIMEOUT, CORS_HEADERS, STATS_PATH, CachedFile, HotFileCache, make_etag, parse_range,
+    cache_control, find_precompressed, not_modified, range_applies, parse_args, parse_cache_size,
+)
+
+# これ以上のファイルは同時転送数を制限する
+LARGE_FILE_BYTES = 1024 * 1024
+MAX_LARGE_TRANSFERS = 8
+
+# 接続ごとの送信バッファの上限（超えたら drain で待つ）
+WRITE_BUFFER_HIGH = 256 * 1024
+
+# リクエストヘッダーの行数上限
+MAX_HEADER_LINES = 100
+
+# 終了時に処理中の転送を待つ秒数
+SHUTDOWN_TIMEOUT = 10
+
+SERVER_NAME = "AsyncStaticServer"
+
+def translate_path(root, url_path):
+    """URLのパスを root 以下のファイルパスにする（.. は取り除く）"""
+    path = urllib.parse.unquote(urllib.parse.urlsplit(url_path).path)
+    trailing_slash = path.endswith("/")
+    parts = [part for part in posixpath.normpath(path).split("/")
+             if part and part not in (".", "..") and not os.path.dirname(part)]
+    result = os.path.join(root, *parts)
+    if trailing_slash:
+        result += "/"
+    return result
+
+def resolve_path(path):
+    """
+    translate_path の結果を配信するファイルにする（ディスクを見るのでスレッドで呼ぶ）
+
+    Returns:
+        (ファイルパスか None, ディレクトリだったか)
+    """
+    if os.path.isdir(path):
+        for index in ("index.html", "index.htm"):
+            if os.path.isfile(os.path.join(path, index)):
+                return os.path.join(path, index), True
+        return None, True
+    if path.endswith("/"):
+        return None, False
+    return path, False
+
+def guess_type(path):
+    return mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+class AsyncStaticServer:
+    """root 以下を配信する asyncio サーバー"""
+
+    def __init__(self, root, headers=None, max_large_transfers=MAX_LARGE_TRANSFERS,
+                 large_file_bytes=LARGE_FILE_BYTES, keep_alive_timeout=KEEP_ALIVE_TIMEOUT, quiet=False,
+                 cache_bytes=None):
+        self.root = os.path.abspath(root)
+        self.hot_cache = HotFileCache(cache_bytes) if cache_bytes else None
+        self.extra_headers = dict(headers or {})
+        self.large_file_bytes = large_file_bytes
+        self.keep_alive_timeout = keep_alive_timeout
+        self.quiet = quiet
+        self._large_transfers = asyncio.Semaphore(max_large_transfers)
+        self._server = None
+        self._closing = False
+        # 接続ごとのタスク → リクエスト処理中か
+        self._connections = {}
+
+    async def start(self, host, port):
+        self._server = await asyncio.start_server(self._handle_connection, host or None, port)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def shutdown(self, timeout=SHUTDOWN_TIMEOUT):
+        """
+        新規接続を止め、待機中のkeep-alive接続を閉じ、処理中の転送を timeout 秒まで待つ
+
+        Returns:
+            待ちきれずに打ち切った接続の数
+        """
+        self._closing = True
+        self._server.close()
+        for task, busy in list(self._connections.items()):
+            if not busy:
+                task.cancel()
+        pending = [task for task in self._connections if not task.done()]
+        if pending:
+            _, pending = await asyncio.wait(pending, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self._server.wait_closed()
+        return len(pending)
+
+    def log(self, address, request_line, status):
+        if self.quiet:
+            return
+        sys.stderr.write(f"[{time.strftime('%d/%b/%Y %H:%M:%S')}] {address} \"{request_line}\" {int(status)} -\n")
+
+    async def _handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = False
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        address = (writer.get_extra_info("peername") or ("-",))[0]
+        try:
+            while not self._closing:
+                # リクエスト行からヘッダー・本文までまとめて時間制限をかける（途中で止まるクライアント対策）
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                self._connections[task] = True
+                keep_alive = await self._handle_request(*request, writer, address)
+                self._connections[task] = False
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # 終了処理で待機中の接続を閉じた
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def _read_headers(self, reader):
+        lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            lines.append(line)
+            if len(lines) > MAX_HEADER_LINES:
+                raise ValueError("too many headers")
+        return email.parser.BytesParser(_class=http.client.HTTPMessage).parsebytes(b"".join(lines))
+
+    async def _read_request(self, reader):
+        """リクエスト行とヘッダーを読み、本文は読み捨てる。接続が閉じられたら None"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        headers = await self._read_headers(reader)
+        # リクエスト本文は使わない
+        content_length = int(headers.get("Content-Length") or 0)
+        if content_length:
+            await reader.readexactly(content_length)
+        return request_line.decode("iso-8859-1").rstrip("\r\n"), headers
+
+    async def _handle_request(self, request_line, headers, writer, address):
+        """1リクエストを処理し、接続を続けるかを返す"""
+        words = request_line.split()
+        if len(words) != 3 or not words[2].startswith("HTTP/"):
+            await self._send(writer, HTTPStatus.BAD_REQUEST, {}, keep_alive=False)
+            self.log(address, request_line, HTTPStatus.BAD_REQUEST)
+            return False
+        method, url_path, version = words
+
+        connection = (headers.get("Connection") or "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        keep_alive = keep_alive and not self._closing
+
+        if method not in ("GET", "HEAD"):
+            status = HTTPStatus.NOT_IMPLEMENTED
+            await self._send(writer, status, {}, keep_alive=keep_alive)
+        elif self.hot_cache and urllib.parse.urlsplit(url_path).path == STATS_PATH:
+            status = HTTPStatus.OK
+            body = b"" if method == "HEAD" else self.hot_cache.stats_json()
+            await self._send(writer, status, {"Content-Type": "application/json", "Cache-Control": "no-cache"},
+                             body, keep_alive)
+        else:
+            status = await self._send_file(writer, method == "HEAD", url_path, headers, keep_alive)
+        self.log(address, request_line, status)
+        return keep_alive
+
+    def _header_block(self, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {int(status)} {status.phrase}",
+                 f"Server: {SERVER_NAME}",
+                 f"Date: {email.utils.formatdate(usegmt=True)}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines += [f"{name}: {value}" for name, value in self.extra_headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1", "strict")
+
+    async def _send(self, writer, status, headers, body=b"", keep_alive=True):
+        headers = {"Content-Length": str(len(body)), **headers}
+        writer.write(self._header_block(status, headers, keep_alive) + body)
+        await writer.drain()
+
+    async def _send_error(self, writer, status, keep_alive):
+        body = f"{int(status)} {status.phrase}\n".encode()
+        await self._send(writer, status, {"Content-Type": "text/plain; charset=utf-8", "Cache-Control": "no-store"},
+                         body, keep_alive)
+        return status
+
+    def _open_file(self, path, accept_encoding):
+        """
+        stat・圧縮済みファイル探し・open をまとめて行う（イベントループを止めないようスレッドで呼ぶ）
+
+        Returns:
+            (CachedFile かファイルオブジェクト, 元ファイルの stat, サイズ, Content-Encoding か None, Vary が要るか)
+        """
+        stat = os.stat(path)
+        served_path, encoding, vary = find_precompressed(path, stat, accept_encoding)
+        f = self.hot_cache.open(served_path) if self.hot_cache else open(served_path, "rb")
+        size = f.size if isinstance(f, CachedFile) else os.fstat(f.fileno()).st_size
+        return f, stat, size, encoding, vary
+
+    async def _send_file(self, writer, head_only, url_path, request_headers, keep_alive):
+        path, is_dir = await asyncio.to_thread(resolve_path, translate_path(self.root, url_path))
+        parts = urllib.parse.urlsplit(url_path)
+        if is_dir and not parts.path.endswith("/"):
+            location = urllib.parse.urlunsplit(("", "", parts.path + "/", parts.query, parts.fragment))
+            await self._send(writer, HTTPStatus.MOVED_PERMANENTLY, {"Location": location}, keep_alive=keep_alive)
+            return HTTPStatus.MOVED_PERMANENTLY
+        if path is None:
+            return await self._send_error(writer, HTTPStatus.NOT_FOUND, keep_alive)
+
+        try:
+            f, stat, size, encoding, vary = await asyncio.to_thread(
+                self._open_file, path, request_headers.get("Accept-Encoding"))
+        except OSError:
+            return await self._send_error(writer, HTTPStatus.NOT_FOUND, keep_alive)
+
+        with f:
+            etag = make_etag(path, stat, encoding)
+            last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            headers = {"Cache-Control": cache_control(url_path), "ETag": etag, "Last-Modified": last_modified}
+            if vary:
+                headers["Vary"] = "Accept-Encoding"
+
+            if not_modified(request_headers, etag, stat):
+                writer.write(self._header_block(HTTPStatus.NOT_MODIFIED, headers, keep_alive))
+                await writer.drain()
+                return HTTPStatus.NOT_MODIFIED
+
+            byte_range = None
+            if "Range" in request_headers and range_applies(request_headers, etag, last_modified):
+                byte_range = parse_range(request_headers["Range"], size)
+            if byte_range == "unsatisfiable":
+                headers["Content-Range"] = f"bytes */{size}"
+                headers["Cache-Control"] = cache_control(url_path, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                await self._send(writer, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers, keep_alive=keep_alive)
+                return HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+
+            if byte_range:
+                status = HTTPStatus.PARTIAL_CONTENT
+                start, length = byte_range
+                headers["Content-Range"] = f"bytes {start}-{start + length - 1}/{size}"
+            else:
+                status = HTTPStatus.OK
+                start, length = 0, size
+            headers["Content-Type"] = guess_type(path)
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(length)
+            headers["Accept-Ranges"] = "bytes"
+
+            writer.write(self._header_block(status, headers, keep_alive))
+            await writer.drain()
+            if head_only or length == 0:
+                return status
+
+            if isinstance(f, CachedFile):
+                writer.write(memoryview(f.data)[start:start + length])
+                await writer.drain()
+                self.hot_cache.record(length, cached=True)
+                return status
+
+            large = length >= self.large_file_bytes
+            async with (self._large_transfers if large else contextlib.nullcontext()):
+                # sendfile が使えない環境では読み込み＋drain に自動でフォールバック
+                sent = await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+            if self.hot_cache:
+                self.hot_cache.record(sent, cached=False)
+            return status
+
+async def serve_async(root, port, headers=None, open_path=None, links=(), title="🌐 Async Server",
+                      open_delay=1, host="", max_large_transfers=MAX_LARGE_TRANSFERS, cache_bytes=None):
+    server = AsyncStaticServer(root, headers, max_large_transfers=max_large_transfers, cache_bytes=cache_bytes)
+    await server.start(host, port)
+    print(f"{title} running at http://localhost:{port}")
+    print(f"📁 Serving from: {root}")
+    for label, path in links:
+        print(f"  {label}: http://localhost:{port}{path}")
+    print(f"⚡ asyncio（大きなファイルの同時転送は最大 {max_large_transfers} 件）")
+    if cache_bytes:
+        print(f"🧠 メモリキャッシュ: {cache_bytes / (1024 * 1024):.0f}MB（統計: http://localhost:{port}{STATS_PATH}）")
+    print("Press Ctrl+C to stop")
+
+    loop = asyncio.get_running_loop()
+    if open_path:
+        url = f'http://localhost:{port}{open_path}'
+
+        def open_browser():
+            print(f"🚀 Opening browser: {url}")
+            loop.run_in_executor(None, webbrowser.open, url)
+
+        loop.call_later(open_delay, open_browser)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+    await stop.wait()
+
+    print(f"\n⏳ 処理中の転送を待っています（最大 {SHUTDOWN_TIMEOUT} 秒）...")
+    aborted = await server.shutdown(SHUTDOWN_TIMEOUT)
+    if aborted:
+        print(f"⚠️  {aborted} 件の接続を打ち切りました")
+    print("🛑 Server stopped")
+
+def serve(root, port, headers=None, open_path=None, links=(), title="🌐 Async Server", open_delay=1,
+          cache_bytes=None):
+    """static_server.serve と同じ引数で asyncio 版を起動する"""
+    try:
+        asyncio.run(serve_async(root, port, headers, open_path, links, title, open_delay, cache_bytes=cache_bytes))
+    except KeyboardInterrupt:
+        # シグナルハンドラーを登録できない環境（Windows）
+        print("\n🛑 Server stopped")
+
+if __name__ == "__main__":
+    root, port, open_path = parse_args(sys.argv[1:], os.getcwd(), 8000)
+    serve(os.path.abspath(root), port, CORS_HEADERS, open_path, cache_bytes=parse_cache_size(sys.argv[1:]))
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+常駐Blenderワーカー
+ヘッドレスBlenderを起動したままにして、ローカルソケット経由でジョブ
+（.blendを開いてGLBエクスポート、スクリプト実行）を受け付ける。
+2回目以降のジョブはBlenderの起動時間がかからない。
+
+任意のコードを実行するので、TCPではなく本人だけが読み書きできる
+Unixドメインソケット（0600、ディレクトリは0700）で待ち受ける。
+ブラウザなど他のプロセスから localhost 経由で送り込むことはできない。
+
+接続ごとのスレッドで受け付け、ジョブはキューに入れてメインスレッドで1件ずつ実行する
+（bpy はメインスレッドからしか触れない）。ping はジョブの実行中でもすぐ返る。
+稼働中はロックファイル（<ソケット>.lock、pid とバージョン入り）を flock で握っているので、
+ping が返らなくても生きているワーカーのソケットを消すことはない。
+
+プロトコル: Unixドメインソケット、1行1リクエストのJSONオブジェクト（レスポンスも1行JSON）
+  {"type": "ping"}                               → {"ok", "version", "pid", "busy", "queued"}
+  {"type": "export", "blend_file": ..., "output_path": ..., "settings": {...}}
+  {"type": "script", "path": ... | "code": ..., "blend_file": 任意, "cwd": 任意}
+  {"type": "shutdown"}
+  JSONオブジェクトとして読めない行が来たら、その接続はすぐ切る
+
+使用方法（Blender外）:
+  python3 blender_worker.py start              # ワーカー起動
+  python3 blender_worker.py status             # 稼働確認
+  python3 blender_worker.py run <script.py> [.blend]
+  python3 blender_worker.py stop               # ワーカー停止
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import fcntl
+import queue
+import socket
+import runpy
+import threading
+import traceback
+import contextlib
+import subprocess
+from pathlib import Path
+
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+DEFAULT_SOCKET = os.environ.get("BLENDER_WORKER_SOCKET") or str(
+    Path.home() / ".cache" / "blender-worker" / "worker.sock")
+# 接続したまま何も送ってこないクライアントでワーカーが止まらないように
+REQUEST_TIMEOUT = 30
+
+# ---------------------------------------------------------------------------
+# Blender内で動くサーバー側
+# ---------------------------------------------------------------------------
+
+def _open_blend(blend_file):
+    """ジョブごとにシーンを初期化（.blend指定時はそれを開く）"""
+    if blend_file:
+        bpy.ops.wm.open_mainfile(filepath=str(blend_file))
+    else:
+        bpy.ops.wm.read_homefile()
+
+def _run_export(request):
+    """.blendを開いてGLBをエクスポート"""
+    _open_blend(request["blend_file"])
+    output_path = request["output_path"]
+
+    # すべてのオブジェクトを選択
+    bpy.ops.object.select_all(action='SELECT')
+
+    settings = dict(request.get("settings") or {})
+    settings["filepath"] = output_path
+    settings.setdefault("export_format", "GLB")
+    bpy.ops.export_scene.gltf(**settings)
+
+    if not os.path.exists(output_path):
+        raise RuntimeError(f"エクスポートされたファイルが見つかりません: {output_path}")
+    print(f"✅ エクスポート成功: {output_path}")
+    return {"output_size": os.path.getsize(output_path)}
+
+@contextlib.contextmanager
+def _job_imports(script_dir=None):
+    """
+    ジョブが足した sys.path と、そこ（とスクリプトのディレクトリ）から読み込んだモジュールを後で取り除く
+
+    常駐プロセスに残すと、編集した補助スクリプト（texture_budget など）が次のジョブで古いまま使われる
+    """
+    saved_path = list(sys.path)
+    saved_modules = set(sys.modules)
+    try:
+        yield
+    finally:
+        job_dirs = {Path(entry or ".").resolve() for entry in sys.path if entry not in saved_path}
+        if script_dir:
+            job_dirs.add(Path(script_dir).resolve())
+        sys.path[:] = saved_path
+        for name in set(sys.modules) - saved_modules:
+            module_file = getattr(sys.modules[name], "__file__", None)
+            if module_file and any(Path(module_file).resolve().is_relative_to(d) for d in job_dirs):
+                del sys.modules[name]
+
+def _run_script(request):
+    """Pythonスクリプト（ファイルまたはコード文字列）を実行"""
+    _open_blend(request.get("blend_file"))
+
+    previous_cwd = os.getcwd()
+    if request.get("cwd"):
+        os.chdir(request["cwd"])
+    script_dir = os.path.dirname(os.path.abspath(request["path"])) if request.get("path") else None
+    try:
+        with _job_imports(script_dir):
+            _exec_script(request)
+    finally:
+        os.chdir(previous_cwd)
+    return {}
+
+def _exec_script(request):
+    try:
+        if request.get("path"):
+            runpy.run_path(request["path"], run_name="__main__")
+        else:
+            exec(compile(request["code"], "<worker-job>", "exec"), {"__name__": "__main__"})
+    except SystemExit as e:
+        # 生成スクリプトは失敗時に exit(1) する
+        if e.code not in (None, 0):
+            raise RuntimeError(f"スクリプトが終了コード {e.code} で終了しました")
+
+def handle_request(request):
+    """1件のジョブを実行してレスポンスを返す（メインスレッドで呼ぶ）"""
+    job_type = request.get("type")
+    handlers = {"export": _run_export, "script": _run_script}
+    if job_type not in handlers:
+        return {"ok": False, "error": f"不明なジョブ: {job_type}"}
+
+    start = time.perf_counter()
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            result = handlers[job_type](request)
+        response = {"ok": True, **result}
+    except Exception as e:
+        traceback.print_exc(file=output)
+        response = {"ok": False, "error": str(e)}
+    response["output"] = output.getvalue()
+    response["seconds"] = time.perf_counter() - start
+    return response
+
+def _lock_path(socket_path):
+    return Path(f"{socket_path}.lock")
+
+def _acquire_lock(socket_path):
+    """
+    稼働中の印のロックファイルを flock で握る（プロセスが終われば自動で外れる）
+
+    Raises:
+        RuntimeError: 別のワーカーが握っている
+    """
+    lock_file = open(_lock_path(socket_path), "a+", encoding="utf-8")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        raise RuntimeError(f"Blenderワーカーは既に起動しています: {socket_path}") from None
+    lock_file.truncate(0)
+    json.dump({"pid": os.getpid(), "version": f"Blender {bpy.app.version_string}"}, lock_file)
+    lock_file.flush()
+    return lock_file
+
+def _bind_socket(socket_path):
+    """本人だけが使える Unix ドメインソケットを作る（ロックを握ってから。残っているソケットは前回の残骸）"""
+    socket_path = Path(socket_path)
+    socket_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(socket_path.parent, 0o700)
+    lock_file = _acquire_lock(socket_path)
+    if socket_path.exists() or socket_path.is_symlink():
+        socket_path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous_umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(previous_umask)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    return server, lock_file
+
+def _read_request(line):
+    """1行をJSONオブジェクトとして読む（読めなければ None）"""
+    try:
+        request = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return request if isinstance(request, dict) else None
+
+class _WorkerState:
+    """接続スレッドとメインスレッドで共有する状態"""
+
+    def __init__(self):
+        self.version = f"Blender {bpy.app.version_string}"
+        # (リクエスト, 完了通知, レスポンスの入れ物)。None は停止の合図
+        self.jobs = queue.Queue()
+        self.busy = False
+        self.stopping = False
+
+    def ping(self):
+        return {"ok": True, "version": self.version, "pid": os.getpid(),
+                "busy": self.busy, "queued": self.jobs.qsize()}
+
+    def submit(self, request):
+        """ジョブをメインスレッドに渡して、終わるまで待つ"""
+        done = threading.Event()
+        slot = {}
+        self.jobs.put((request, done, slot))
+        done.wait()
+        return slot["response"]
+
+def _handle_connection(conn, state):
+    """1接続のリクエストを読む（ping・shutdown はこのスレッドで、ジョブはメインスレッドで）"""
+    conn.settimeout(REQUEST_TIMEOUT)
+    try:
+        with conn, conn.makefile("rwb") as stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                request = _read_request(line)
+                if request is None:
+                    # プロトコル外のデータを送ってくる相手とはそれ以上やり取りしない
+                    stream.write(b'{"ok": false, "error": "invalid request"}\n')
+                    stream.flush()
+                    break
+                job_type = request.get("type")
+                if job_type == "ping":
+                    response = state.ping()
+                elif job_type == "shutdown":
+                    # 応答を返してから、受け付け済みのジョブを終えて止まる
+                    state.stopping = True
+                    stream.write(b'{"ok": true}\n')
+                    stream.flush()
+                    state.jobs.put(None)
+                    break
+                elif state.stopping:
+                    response = {"ok": False, "error": "Blenderワーカーは停止中です"}
+                else:
+                    response = state.submit(request)
+                stream.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                stream.flush()
+    except OSError:
+        # 受信タイムアウト・切断（閉じるときの送信失敗も）
+        pass
+
+def _accept_loop(server, state):
+    while True:
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            # serve の終了時にソケットが閉じられた
+            return
+        threading.Thread(target=_handle_connection, args=(conn, state), daemon=True).start()
+
+def serve(socket_path=DEFAULT_SOCKET):
+    """接続は別スレッドで受け、ジョブはメインスレッドで1件ずつ処理する（bpyはメインスレッドからしか触れない）"""
+    server, lock_file = _bind_socket(socket_path)
+    state = _WorkerState()
+    print(f"♨️  Blenderワーカー待機中: {socket_path} ({state.version})", flush=True)
+    threading.Thread(target=_accept_loop, args=(server, state), daemon=True).start()
+    try:
+        while True:
+            job = state.jobs.get()
+            if job is None:
+                break
+            request, done, slot = job
+            state.busy = True
+            try:
+                slot["response"] = handle_request(request)
+            finally:
+                state.busy = False
+                done.set()
+    finally:
+        server.close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+        # ロックはソケットを消した後に外す（次のワーカーが作ったソケットを消さないように）
+        lock_file.close()
+    print("🛑 Blenderワーカー停止", flush=True)
+
+# ---------------------------------------------------------------------------
+# Blender外から使うクライアント側
+# ---------------------------------------------------------------------------
+
+def send_job(job, socket_path=DEFAULT_SOCKET, timeout=None):
+    """ジョブを送ってレスポンスを待つ（timeout=Noneなら完了まで待つ）"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(str(socket_path))
+        with conn.makefile("rwb") as stream:
+            stream.write((json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8"))
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ConnectionError("Blenderワーカーから応答がありません")
+    return json.loads(line)
+
+def ping(socket_path=DEFAULT_SOCKET, timeout=0.5):
+    """ワーカーが起動していればpingレスポンス、いなければNone"""
+    try:
+        return send_job({"type": "ping"}, socket_path, timeout)
+    except (OSError, ValueError):
+        return None
+
+def is_running(socket_path=DEFAULT_SOCKET):
+    """ワーカーがロックファイルを握っていれば、ロックファイルの内容（pid・version）"""
+    try:
+        lock_file = open(_lock_path(socket_path), "r", encoding="utf-8")
+    except FileNotFoundError:
+        return None
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            try:
+                return json.loads(lock_file.read() or "{}")
+            except ValueError:
+                return {}
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+    return None
+
+def status(socket_path=DEFAULT_SOCKET, timeout=0.5):
+    """
+    ワーカーの状態（起動していなければ None）
+
+    ping が返らなくてもロックを握っていれば稼働中（重いジョブでプロセスが応答できない間など）とみなす
+    """
+    response = ping(socket_path, timeout)
+    if response:
+        return response
+    info = is_running(socket_path)
+    if info is None:
+        return None
+    return {"ok": True, "version": info.get("version"), "pid": info.get("pid"), "busy": True, "queued": None}
+
+def start_worker(blender_path, socket_path=DEFAULT_SOCKET, wait=60):
+    """ヘッドレスBlenderでワーカーを起動し、待ち受け開始まで待つ"""
+    cmd = [
+        str(blender_path),
+        "--background",
+        "--python", str(Path(__file__).resolve()),
+        "--", "--socket", str(socket_path)
+    ]
+    process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, start_new_session=True)
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return None
+        response = ping(socket_path)
+        if response:
+            return response
+        time.sleep(0.2)
+    return None
+
+def _blender_args():
+    """Blenderに渡された '--' 以降の引数からソケットのパスを取り出す"""
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    socket_path = DEFAULT_SOCKET
+    if "--socket" in args:
+        socket_path = args[args.index("--socket") + 1]
+    return socket_path
+
+if __name__ == "__main__" and bpy is not None:
+    serve(_blender_args())
+
+elif __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == "start":
+        if status():
+            print("♨️  Blenderワーカーは既に起動しています")
+            sys.exit(0)
+        from export_project import find_blender
+        blender_path = find_blender()
+        if not blender_path:
+            print("❌ Blenderが見つかりません")
+            sys.exit(1)
+        response = start_worker(blender_path)
+        if response:
+            print(f"✅ Blenderワーカー起動: {DEFAULT_SOCKET} ({response['version']}, pid {response['pid']})")
+        else:
+            print("❌ Blenderワーカーの起動に失敗しました")
+            sys.exit(1)
+
+    elif command == "stop":
+        if status():
+            send_job({"type": "shutdown"})
+            print("🛑 Blenderワーカーを停止しました（受け付け済みのジョブは最後まで実行）")
+        else:
+            print("Blenderワーカーは起動していません")
+
+    elif command == "status":
+        response = status()
+        if response:
+            busy = f"、実行中（待ち {response['queued']}件）" if response['queued'] else "、実行中" if response['busy'] else ""
+            print(f"♨️  稼働中: {DEFAULT_SOCKET} ({response['version']}, pid {response['pid']}{busy})")
+        else:
+            print("Blenderワーカーは起動していません")
+            sys.exit(1)
+
+    elif command == "run" and len(sys.argv) > 2:
+        job = {
+            "type": "script",
+            "path": str(Path(sys.argv[2]).resolve()),
+            "blend_file": str(Path(sys.argv[3]).resolve()) if len(sys.argv) > 3 else None,
+            "cwd": os.getcwd(),
+        }
+        try:
+            response = send_job(job)
+        except OSError:
+            print("❌ Blenderワーカーが起動していません（python3 blender_worker.py start）")
+            sys.exit(1)
+        print(response.get("output", ""), end="")
+        if response["ok"]:
+            print(f"✅ 完了 ({response['seconds']:.2f}s)")
+        else:
+            print(f"❌ エラー: {response['error']}")
+            sys.exit(1)
+
+    else:
+        print(__doc__)
@@ -1,7 +1,10 @@
 import bpy
-import subprocess
-import json
 import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from mcp_client import threejs_client, tool_text, MCPError
 
 def bridge_to_threejs(asset_name="original_unicorn.glb", threejs_config=None):
     """
@@ -26,109 +29,117 @@ def bridge_to_threejs(asset_name="original_unicorn.glb", threejs_config=None):
         print(f"エラー: アセットが見つかりません: {asset_path}")
         return False
     
-    # Three.js MCPへのブリッジコマンドを作成
-    bridge_command = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "bridgeFromBlender",
-            "arguments": {
-                "blenderAssetPath": assets_dir,
-                "targetGLB": asset_name
-            }
-        }
-    }
-    
     print(f"Blender → Three.js ブリッジを実行中...")
     print(f"アセット: {asset_name}")
     print(f"パス: {assets_dir}")
     
     try:
-        # Three.js MCPサーバーへの接続コマンド
-        cmd = ["node", threejs_config]
-        
-        # MCPサーバーにコマンドを送信
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # JSONコマンドを送信
-        command_json = json.dumps(bridge_command)
-        stdout, stderr = process.communicate(input=command_json)
+        # 起動済みのThree.js MCPサーバーに送る（初回だけ起動とinitialize）
+        result = threejs_client(threejs_config).call_tool("bridgeFromBlender", {
+            "blenderAssetPath": assets_dir,
+            "targetGLB": asset_name
+        })
         
         print("=== Three.js MCP レスポンス ===")
-        print(stdout)
-        if stderr:
-            print("=== エラー ===")
-            print(stderr)
+        print(tool_text(result))
         
-        return True
+        return not result.get("isError")
         
-    except Exception as e:
+    except MCPError as e:
         print(f"ブリッジエラー: {e}")
         return False
 
-def create_threejs_viewer(glb_file="original_unicorn.glb", output_file="unicorn_viewer.html"):
+def create_threejs_viewer(glb_file="original_unicorn.glb", output_file="unicorn_viewer.html", threejs_config=None):
     """
     Three.js MCPを使ってHTMLビューワーを作成
     """
     
     blender_dir = "/Users/nukuiyuki/Dev/mcp-tools/Blender"
     assets_dir = os.path.join(blender_dir, "assets")
-    threejs_config = "/Users/nukuiyuki/Dev/mcp-tools/Threejs/build/main.js"
+    if not threejs_config:
+        threejs_config = "/Users/nukuiyuki/Dev/mcp-tools/Threejs/build/main.js"
     
     glb_path = os.path.join(assets_dir, glb_file)
     output_path = os.path.join(blender_dir, "projects", output_file)
     
-    # HTMLビューワー作成コマンド
-    viewer_command = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {
-            "name": "createViewer",
-            "arguments": {
-                "glbPath": glb_path,
-                "outputPath": output_path,
-                "title": f"Blender → Three.js: {glb_file}"
-            }
-        }
-    }
-    
     print(f"HTMLビューワーを作成中...")
     print(f"GLB: {glb_path}")
     print(f"出力: {output_path}")
     
     try:
-        cmd = ["node", threejs_config]
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        command_json = json.dumps(viewer_command)
-        stdout, stderr = process.communicate(input=command_json)
+        # bridge_to_threejs と同じサーバープロセスを使い回す
+        result = threejs_client(threejs_config).call_tool("createViewer", {
+            "glbPath": glb_path,
+            "outputPath": output_path,
+            "title": f"Blender → Three.js: {glb_file}"
+        })
         
         print("=== ビューワー作成結果 ===")
-        print(stdout)
-        if stderr:
-            print("=== エラー ===")
-            print(stderr)
+        print(tool_text(result))
         
-        return output_path
+        return None if result.get("isError") else output_path
         
-    except Exception as e:
+    except MCPError as e:
         print(f"ビューワー作成エラー: {e}")
         return None
 
+def bridge_assets(asset_names, threejs_config=None, create_viewers=True, timeout=None):
+    """
+    複数のアセットのブリッジとビューワー作成をまとめて実行
+    
+    すべての tools/call を応答を待たずに続けて送る（JSON-RPCパイプライン）ので、
+    20個のGLBでもおよそ1往復分の待ち時間で済む
+    
+    Returns:
+        呼び出しごとの結果（mcp_client.MCPStdioClient.call_tools の戻り値）
+    """
+    
+    blender_dir = "/Users/nukuiyuki/Dev/mcp-tools/Blender"
+    assets_dir = os.path.join(blender_dir, "assets")
+    if not threejs_config:
+        threejs_config = "/Users/nukuiyuki/Dev/mcp-tools/Threejs/build/main.js"
+    
+    calls = []
+    for asset_name in asset_names:
+        calls.append(("bridgeFromBlender", {
+            "blenderAssetPath": assets_dir,
+            "targetGLB": asset_name
+        }))
+        if create_viewers:
+            stem = os.path.splitext(asset_name)[0]
+            calls.append(("createViewer", {
+                "glbPath": os.path.join(assets_dir, asset_name),
+                "outputPath": os.path.join(blender_dir, "projects", f"{stem}_viewer.html"),
+                "title": f"Blender → Three.js: {asset_name}"
+            }))
+    
+    print(f"Blender → Three.js 一括ブリッジ: {len(asset_names)}アセット / {len(calls)}リクエスト")
+    
+    try:
+        client = threejs_client(threejs_config)
+        client.start()
+    except MCPError as e:
+        print(f"ブリッジエラー: {e}")
+        return []
+    
+    started = time.perf_counter()
+    results = client.call_tools(calls, timeout)
+    elapsed = (time.perf_counter() - started) * 1000
+    
+    for entry in results:
+        if entry["error"]:
+            print(f"❌ {entry['name']}: {entry['error']}")
+            continue
+        text = tool_text(entry["result"])
+        if entry["result"].get("isError"):
+            print(f"❌ {entry['name']} ({entry['latency_ms']}ms): {text}")
+        else:
+            print(f"✅ {entry['name']} ({entry['latency_ms']}ms): {text.splitlines()[0] if text else ''}")
+    
+    succeeded = sum(1 for entry in results if entry["result"] and not entry["result"].get("isError"))
+    print(f"完了: {succeeded}/{len(results)} 成功, 合計 {elapsed:.0f}ms")
+    return results
+
 # Blender内から実行する場合
 if __name__ == "__main__":
     print("=== Blender → Three.js ブリッジテスト ===")
@@ -0,0 +1,130 @@
+"""
+ポリゴン数の上限に合わせた自動間引き（Blender内で実行）
+全メッシュの三角形数を数え、品質ティアの polygon_count_max に収まるよう
+各オブジェクトに同じ比率のDecimateモディファイアを適用し、前後の数をJSONで報告する
+
+単体実行:
+  blender scene.blend --background --python decimate_to_budget.py -- --budget 10000 [--report report.json] [--save out.blend]
+"""
+
+import sys
+import json
+
+import bpy
+import numpy as np
+
+# Decimate(Collapse)は目標比率ちょうどにはならないので、超過分を見て数回やり直す
+MAX_PASSES = 3
+
+def triangle_count(obj, depsgraph):
+    """モディファイア適用後の三角形数"""
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        return int(np.sum(loop_totals - 2))
+    finally:
+        evaluated.to_mesh_clear()
+
+def mesh_objects():
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+def count_triangles(objects=None):
+    """オブジェクト名 → 三角形数"""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    return {obj.name: triangle_count(obj, depsgraph) for obj in (objects or mesh_objects())}
+
+def _apply_decimate(obj, ratio):
+    """モディファイアスタックの先頭にDecimateを入れて適用（アーマチュアより前で間引く）"""
+    # 共有メッシュのままだと適用できない
+    if obj.data.users > 1:
+        obj.data = obj.data.copy()
+
+    modifier = obj.modifiers.new(name="BudgetDecimate", type='DECIMATE')
+    modifier.decimate_type = 'COLLAPSE'
+    modifier.ratio = ratio
+    modifier.use_collapse_triangulate = True
+    with bpy.context.temp_override(object=obj, active_object=obj):
+        bpy.ops.object.modifier_move_to_index(modifier=modifier.name, index=0)
+        bpy.ops.object.modifier_apply(modifier=modifier.name)
+
+def decimate_to_budget(budget):
+    """
+    シーン全体の三角形数を budget 以下にする
+
+    各オブジェクトに同じ比率を掛けるので、オブジェクト間の密度の比は保たれる。
+    シェイプキーを持つメッシュはモディファイアを適用できないため対象外
+
+    Returns:
+        前後の三角形数を含むレポート（辞書）
+    """
+    objects = mesh_objects()
+    before = count_triangles(objects)
+    total_before = sum(before.values())
+
+    skipped = {obj.name: "shape_keys" for obj in objects if obj.data.shape_keys}
+    targets = [obj for obj in objects if obj.name not in skipped and before[obj.name] > 0]
+    fixed = sum(before[name] for name in skipped)
+
+    current = dict(before)
+    ratio = 1.0
+    for _ in range(MAX_PASSES):
+        total = sum(current.values())
+        adjustable = total - fixed
+        if total <= budget or adjustable <= 0:
+            break
+
+        # 間引けない分を差し引いた残りで比率を決める
+        pass_ratio = max(0.0, min(1.0, (budget - fixed) / adjustable))
+        for obj in targets:
+            _apply_decimate(obj, pass_ratio)
+        ratio *= pass_ratio
+        current.update(count_triangles(targets))
+
+    after = count_triangles(objects)
+    return {
+        "budget": budget,
+        "before": total_before,
+        "after": sum(after.values()),
+        "ratio": ratio,
+        "within_budget": sum(after.values()) <= budget,
+        "objects": [
+            {
+                "name": obj.name,
+                "before": before[obj.name],
+                "after": after[obj.name],
+                "skipped": skipped.get(obj.name),
+            }
+            for obj in objects
+        ],
+    }
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def print_report(report):
+    print(f"🔺 三角形数: {report['before']:,} → {report['after']:,} (上限 {report['budget']:,}, 比率 {report['ratio']:.3f})")
+    for entry in report['objects']:
+        note = f" ※{entry['skipped']}のため対象外" if entry['skipped'] else ""
+        print(f"   - {entry['name']}: {entry['before']:,} → {entry['after']:,}{note}")
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    if option("--budget") is None:
+        print(__doc__)
+        sys.exit(1)
+
+    report = decimate_to_budget(int(option("--budget")))
+    print_report(report)
+    if option("--report"):
+        write_report(report, option("--report"))
+        print(f"📄 レポート: {option('--report')}")
+    if option("--save"):
+        bpy.ops.wm.save_as_mainfile(filepath=option("--save"))
+        print(f"💾 保存: {option('--save')}")
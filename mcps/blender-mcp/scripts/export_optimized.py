@@ -1,4 +1,10 @@
 import bpy
+import os
+import sys
+
+# 品質ティア別のエクスポート設定（export_project.py と共通）
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_profiles import gltf_export_settings
 
 # すべてのオブジェクトを選択
 bpy.ops.object.select_all(action='SELECT')
@@ -16,7 +22,6 @@ bpy.ops.export_scene.gltf(
     # マテリアル・テクスチャ設定
     export_materials='EXPORT',
     export_images=True,
-    export_jpeg_quality=75,  # JPEG品質（軽量化）
     
     # アニメーション設定
     export_animations=True,
@@ -28,20 +33,16 @@ bpy.ops.export_scene.gltf(
     export_cameras=True,
     export_lights=True,
     
-    # 圧縮設定（重要！）
-    export_draco_mesh_compression_enable=True,  # Draco圧縮
-    export_draco_mesh_compression_level=6,  # 圧縮レベル（0-10）
-    export_draco_position_quantization=14,  # 位置量子化
-    export_draco_normal_quantization=10,  # 法線量子化
-    export_draco_texcoord_quantization=12,  # UV量子化
-    
     # 最適化設定
     export_optimize_animation_size=True,
     export_extras=False,  # 余分なデータを除外
     export_vertex_color='MATERIAL',  # 頂点色設定
     
     # デバッグ用
-    export_copyright=''
+    export_copyright='',
+    
+    # 圧縮設定（重要！）Draco圧縮・量子化・JPEG品質は standard ティアの値
+    **gltf_export_settings('standard')
 )
 
 print("最適化されたglTF/GLBエクスポートが完了しました: test_scene_optimized.glb")
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+エクスポートプロファイル
+configs/quality-criteria.yaml の品質ティア（draft/standard/high）ごとに
+Draco圧縮・画像品質・テクスチャ解像度・ポリゴン数の目標をまとめる
+
+glTFエクスポーター設定（gltf_export_settings）はBlender内からも使えるよう
+標準ライブラリだけで完結させ、YAMLはティアの上限値を読むときだけ使う
+"""
+
+from pathlib import Path
+
+QUALITY_CRITERIA_PATH = Path(__file__).resolve().parents[3] / "configs" / "quality-criteria.yaml"
+
+TIERS = ("draft", "standard", "high")
+DEFAULT_TIER = "standard"
+
+# export_image_format で選べる形式（WEBPはBlender 4.0以降のエクスポーター）
+IMAGE_FORMATS = ("AUTO", "JPEG", "WEBP")
+
+# Blender 4.0 のエクスポーターで WEBP が追加され、export_jpeg_quality が export_image_quality に改名された
+IMAGE_QUALITY_RENAMED = (4, 0, 0)
+
+# ティアごとのglTFエクスポーター設定（画像品質は 3.x の名前、for_blender で 4.0 以降の名前にする）
+# standard は従来の export_project.py / export_optimized.py の値
+PROFILES = {
+    "draft": {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 10,
+        "export_draco_position_quantization": 11,
+        "export_draco_normal_quantization": 8,
+        "export_draco_texcoord_quantization": 10,
+        "export_draco_color_quantization": 8,
+        "export_draco_generic_quantization": 10,
+        "export_image_format": "JPEG",
+        "export_jpeg_quality": 60,
+    },
+    "standard": {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 6,
+        "export_draco_position_quantization": 14,
+        "export_draco_normal_quantization": 10,
+        "export_draco_texcoord_quantization": 12,
+        "export_draco_color_quantization": 10,
+        "export_draco_generic_quantization": 12,
+        "export_image_format": "AUTO",
+        "export_jpeg_quality": 75,
+    },
+    "high": {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 6,
+        "export_draco_position_quantization": 16,
+        "export_draco_normal_quantization": 12,
+        "export_draco_texcoord_quantization": 14,
+        "export_draco_color_quantization": 12,
+        "export_draco_generic_quantization": 14,
+        "export_image_format": "AUTO",
+        "export_jpeg_quality": 90,
+    },
+}
+
+def parse_tiers(value):
+    """"draft" / "draft,high" / "all" をティア名のリストに変換"""
+    if value == "all":
+        return list(TIERS)
+    tiers = [tier.strip() for tier in value.split(",") if tier.strip()]
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown:
+        raise ValueError(f"不明な品質ティア: {', '.join(unknown)}（{'/'.join(TIERS)}/all）")
+    return tiers
+
+def parse_image_format(value):
+    """"webp" などを export_image_format の値に変換"""
+    image_format = value.upper()
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"不明な画像形式: {value}（{'/'.join(IMAGE_FORMATS).lower()}）")
+    return image_format
+
+def for_blender(settings, version):
+    """
+    エクスポーター設定を Blender のバージョン（bpy.app.version）に合わせる
+
+    Raises:
+        ValueError: 4.0 より前の Blender で WEBP を指定した
+    """
+    settings = dict(settings)
+    if tuple(version) >= IMAGE_QUALITY_RENAMED:
+        if "export_jpeg_quality" in settings:
+            settings["export_image_quality"] = settings.pop("export_jpeg_quality")
+    elif settings.get("export_image_format") == "WEBP":
+        raise ValueError(f"WEBPは Blender {'.'.join(map(str, IMAGE_QUALITY_RENAMED[:2]))} 以降のエクスポーターが必要です")
+    return settings
+
+def gltf_export_settings(tier=DEFAULT_TIER, image_format=None, blender_version=None):
+    """
+    bpy.ops.export_scene.gltf に渡すティア別の設定（image_format でティアの画像形式を上書き）
+
+    Blender内では bpy.app.version に合わせた名前にする。Blenderの外では
+    blender_version を渡さない限り 3.x の名前のまま（Blender内で for_blender を通す）
+    """
+    settings = dict(PROFILES[tier])
+    if image_format is not None:
+        settings["export_image_format"] = image_format
+    if blender_version is None:
+        try:
+            import bpy
+        except ImportError:
+            return settings
+        blender_version = bpy.app.version
+    return for_blender(settings, blender_version)
+
+def load_quality_tiers(path=QUALITY_CRITERIA_PATH):
+    """quality-criteria.yaml の quality_levels を読み込む"""
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)["quality_levels"]
+
+def load_profile(tier=DEFAULT_TIER, path=QUALITY_CRITERIA_PATH):
+    """
+    ティアのプロファイル全体
+
+    Returns:
+        tier, gltf（エクスポーター設定）, texture_resolution（テクスチャ最大辺）,
+        texture_count_max, polygon_count_max（間引き目標）, load_time_max を持つ辞書
+    """
+    level = load_quality_tiers(path)[tier]
+    return {
+        "tier": tier,
+        "gltf": gltf_export_settings(tier),
+        "texture_resolution": level["rendering"]["texture_resolution"],
+        "texture_count_max": level["model"]["texture_count_max"],
+        "polygon_count_max": level["model"]["polygon_count_max"],
+        "load_time_max": level["rendering"]["load_time_max"],
+    }
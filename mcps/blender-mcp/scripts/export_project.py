@@ -5,12 +5,44 @@ Blenderプロジェクト自動エクスポートスクリプト
 """
 
 import os
+import re
 import sys
 import subprocess
 import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 
+import blender_worker
+from glb_inspect import load_stats, check_quality
+from glb_optimize import optimize_glb, format_report, UnsupportedGLB
+from publish import publish_file, detach, PUBLISH_LABELS
+from export_profiles import TIERS, DEFAULT_TIER, IMAGE_FORMATS, gltf_export_settings, load_profile, parse_tiers, parse_image_format
+
+BLENDER_DIR = Path("/Users/nukuiyuki/Dev/mcp-tools/Blender")
+PROJECTS_DIR = BLENDER_DIR / "projects"
+
+# エクスポート済みGLBの入力・設定を記録するファイル（exports/内）
+MANIFEST_NAME = "build_manifest.json"
+
+# エクスポート結果を左右するスクリプト（中身が変わったら再エクスポートする）
+EXPORT_DEPENDENCIES = ("export_profiles.py", "decimate_to_budget.py", "texture_budget.py", "glb_optimize.py")
+
+# 同じプロジェクトの複数ティアを並列に書き込んでもマニフェストが壊れないようにする
+_manifest_lock = threading.Lock()
+
+# 並列エクスポート時の出力が行の途中で混ざらないようにする
+_print_lock = threading.Lock()
+
+def _log(message, prefix=""):
+    with _print_lock:
+        print(f"{prefix}{message}", flush=True)
+
 def find_blender():
     """Blenderの実行可能ファイルを見つける"""
     possible_paths = [
@@ -26,36 +58,70 @@ def find_blender():
     
     return None
 
-def create_export_script(project_name, blend_file, output_path):
-    """Blender用エクスポートスクリプトを生成"""
+def create_export_script(project_name, blend_file, output_path, tier=None, image_format=None):
+    """
+    Blender用エクスポートスクリプトを生成
+    
+    tier を指定した場合は、エクスポート前にティアのポリゴン上限まで間引き、
+    テクスチャをティアの解像度・枚数に収めて、レポートを
+    <出力>.decimate.json / <出力>.textures.json に書き出す
+    image_format（AUTO/JPEG/WEBP）を指定するとティアの画像形式を上書きする
+    """
+    settings = {
+        'filepath': str(output_path),
+        'export_format': 'GLB',
+        'use_selection': False,
+        'export_materials': 'EXPORT',
+        'export_cameras': True,
+        'export_lights': True,
+        'export_animations': True,
+        **gltf_export_settings(tier or DEFAULT_TIER, image_format)
+    }
+    settings_lines = ",\n".join(f"    {key!r}: {value!r}" for key, value in settings.items())
+    
+    pre_export = ""
+    if tier is not None:
+        profile = load_profile(tier)
+        budget = profile['polygon_count_max']
+        max_resolution = profile['texture_resolution']
+        max_count = profile['texture_count_max']
+        report_path = f"{output_path}.decimate.json"
+        texture_report_path = f"{output_path}.textures.json"
+        pre_export = f'''
+# ポリゴン数の上限に合わせて間引き（品質ティア: {tier}、上限 {budget}）
+import decimate_to_budget
+import texture_budget
+
+decimate_report = decimate_to_budget.decimate_to_budget({budget})
+decimate_report['tier'] = {tier!r}
+decimate_to_budget.print_report(decimate_report)
+decimate_to_budget.write_report(decimate_report, {report_path!r})
+
+# テクスチャを最大 {max_resolution}px・{max_count}枚に収める
+texture_report = texture_budget.fit_textures({max_resolution}, {max_count})
+texture_report['tier'] = {tier!r}
+texture_budget.print_report(texture_report)
+texture_budget.write_report(texture_report, {texture_report_path!r})
+'''
+    
     script_content = f'''
 import bpy
 import os
-
+import sys
+sys.path.insert(0, {str(Path(__file__).resolve().parent)!r})
+from export_profiles import for_blender
+{pre_export}
 # すべてのオブジェクトを選択
 bpy.ops.object.select_all(action='SELECT')
 
-# GLBエクスポート設定
+# GLBエクスポート設定（品質ティア: {tier or DEFAULT_TIER}）
 export_settings = {{
-    'filepath': "{output_path}",
-    'export_format': 'GLB',
-    'use_selection': False,
-    'export_materials': 'EXPORT',
-    'export_cameras': True,
-    'export_lights': True,
-    'export_animations': True,
-    'export_draco_mesh_compression_enable': True,
-    'export_draco_mesh_compression_level': 6,
-    'export_draco_position_quantization': 14,
-    'export_draco_normal_quantization': 10,
-    'export_draco_texcoord_quantization': 12,
-    'export_draco_color_quantization': 10,
-    'export_draco_generic_quantization': 12
+{settings_lines}
 }}
 
-# エクスポート実行
+# エクスポート実行（画像品質のオプション名などを実行中のBlenderに合わせる）
 try:
-    bpy.ops.export_scene.gltf(**export_settings)
+    bpy.ops.export_scene.gltf(**for_blender(export_settings, bpy.app.version))
     print(f"✅ エクスポート成功: {output_path}")
 except Exception as e:
     print(f"❌ エクスポートエラー: {{e}}")
@@ -71,103 +137,370 @@ else:
 '''
     return script_content
 
-def export_project(project_name):
-    """プロジェクトをエクスポート"""
+@lru_cache(maxsize=None)
+def get_blender_version(blender_path):
+    """Blenderのバージョン文字列（例: "Blender 4.1.0"）"""
+    try:
+        result = subprocess.run([str(blender_path), "--version"], capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    for line in result.stdout.splitlines():
+        if line.startswith("Blender"):
+            return line.strip()
+    return None
+
+def parse_blender_version(version):
+    """"Blender 4.1.0" / "4.1.0" を (4, 1, 0) にする（読めなければ None）"""
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", version or "")
+    if not match:
+        return None
+    return tuple(int(part or 0) for part in match.groups())
+
+def settings_fingerprint(project_name, tier=None, image_format=None, optimize=True):
+    """エクスポートスクリプト（設定値を含む）・Blender内/後処理のスクリプトの中身・ポスト処理の有無のハッシュ"""
+    script = create_export_script(project_name, "<blend_file>", "<output_path>", tier, image_format)
+    if not optimize:
+        script += "\n# no-optimize"
+    script_dir = Path(__file__).resolve().parent
+    for name in EXPORT_DEPENDENCIES:
+        script += f"\n# {name} {file_sha256(script_dir / name)}"
+    return hashlib.sha256(script.encode('utf-8')).hexdigest()
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest(exports_dir):
+    """exports/のビルドマニフェストを読み込む"""
+    manifest_path = Path(exports_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(exports_dir, manifest):
+    """ビルドマニフェストを書き込む（一時ファイル経由で置き換え）"""
+    manifest_path = Path(exports_dir) / MANIFEST_NAME
+    temp_path = manifest_path.with_suffix(".json.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, manifest_path)
+
+def is_up_to_date(entry, blend_file, output_path, blender_version, fingerprint):
+    """
+    前回のエクスポートから入力・Blender・設定が変わっていないか
+    
+    mtimeとサイズが一致すればハッシュ計算を省略する
+    """
+    if not entry or not output_path.exists():
+        return False
+    if output_path.stat().st_size != entry.get('output_size'):
+        return False
+    if entry.get('source') != str(blend_file):
+        return False
+    if entry.get('blender_version') != blender_version:
+        return False
+    if entry.get('settings_fingerprint') != fingerprint:
+        return False
+    
+    stat = blend_file.stat()
+    if stat.st_mtime == entry.get('source_mtime') and stat.st_size == entry.get('source_size'):
+        return True
+    # 保存し直しただけ（内容は同じ）ならハッシュで判定
+    return file_sha256(blend_file) == entry.get('source_sha256')
+
+def record_export(exports_dir, output_path, blend_file, blender_version, fingerprint):
+    """エクスポート結果をマニフェストに記録"""
+    stat = blend_file.stat()
+    entry = {
+        'source': str(blend_file),
+        'source_sha256': file_sha256(blend_file),
+        'source_mtime': stat.st_mtime,
+        'source_size': stat.st_size,
+        'blender_version': blender_version,
+        'settings_fingerprint': fingerprint,
+        'output_size': output_path.stat().st_size,
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    with _manifest_lock:
+        manifest = load_manifest(exports_dir)
+        manifest[output_path.name] = entry
+        save_manifest(exports_dir, manifest)
+
+def export_project(project_name, prefix="", force=False, tier=None, image_format=None, optimize=True):
+    """
+    プロジェクトをエクスポート（スキップした場合も成功扱い）
+    """
+    return export_project_status(project_name, prefix, force, tier, image_format, optimize) != "failed"
+
+def output_filename_for(project_name, tier=None):
+    """ティア指定なしは従来どおり <プロジェクト名>.glb、指定時は <プロジェクト名>_<ティア>.glb"""
+    return f"{project_name}.glb" if tier is None else f"{project_name}_{tier}.glb"
+
+def export_project_status(project_name, prefix="", force=False, tier=None, image_format=None, optimize=True):
+    """
+    プロジェクトをエクスポート
+
+    Args:
+        project_name: プロジェクト名
+        prefix: 出力行の先頭に付ける文字列（並列実行時のプロジェクト識別用）
+        force: Trueなら最新でも再エクスポートする
+        tier: 品質ティア（draft/standard/high、Noneならstandard設定で従来のファイル名）
+        image_format: テクスチャの画像形式（AUTO/JPEG/WEBP、Noneならティアの設定）
+        optimize: Trueならエクスポート後にGLBを最適化する（glb_optimize.py）
+    
+    Returns:
+        "exported" / "skipped" / "failed"
+    """
+    def log(message):
+        _log(message, prefix)
+
     # パス設定
-    blender_dir = Path("/Users/nukuiyuki/Dev/mcp-tools/Blender")
-    projects_dir = blender_dir / "projects"
+    blender_dir = BLENDER_DIR
+    projects_dir = PROJECTS_DIR
     project_dir = projects_dir / project_name
     assets_dir = blender_dir / "assets"
     
     # プロジェクトディレクトリの確認
     if not project_dir.exists():
-        print(f"❌ プロジェクト '{project_name}' が見つかりません")
-        print(f"📁 場所: {project_dir}")
-        return False
+        log(f"❌ プロジェクト '{project_name}' が見つかりません")
+        log(f"📁 場所: {project_dir}")
+        return "failed"
     
     # .blendファイルを探す
     blend_files = list(project_dir.glob("**/*.blend"))
     if not blend_files:
-        print(f"❌ .blendファイルが見つかりません: {project_dir}")
-        return False
+        log(f"❌ .blendファイルが見つかりません: {project_dir}")
+        return "failed"
     
     # 最新の.blendファイルを選択
     blend_file = max(blend_files, key=os.path.getmtime)
-    print(f"📁 .blendファイル: {blend_file}")
+    log(f"📁 .blendファイル: {blend_file}")
     
-    # Blenderを見つける
-    blender_path = find_blender()
-    if not blender_path:
-        print("❌ Blenderが見つかりません")
-        print("Blenderがインストールされていることを確認してください")
-        return False
+    # 起動済みのBlenderワーカーがあれば、そちらを使って起動時間を省く（実行中なら順番待ちする）
+    worker = blender_worker.status()
+    if worker:
+        blender_path = None
+        blender_version = worker['version']
+        busy = "、実行中のジョブの後に実行" if worker['busy'] else ""
+        log(f"♨️  Blenderワーカー: {worker['version']} (pid {worker['pid']}{busy})")
+    else:
+        # Blenderを見つける
+        blender_path = find_blender()
+        if not blender_path:
+            log("❌ Blenderが見つかりません")
+            log("Blenderがインストールされていることを確認してください")
+            return "failed"
+        
+        log(f"🎨 Blender: {blender_path}")
+        blender_version = get_blender_version(blender_path)
     
-    print(f"🎨 Blender: {blender_path}")
+    # WEBPなど、このBlenderのエクスポーターが受け付けない設定は起動前に止める
+    version_tuple = parse_blender_version(blender_version)
+    if version_tuple is not None:
+        try:
+            gltf_export_settings(tier or DEFAULT_TIER, image_format, version_tuple)
+        except ValueError as e:
+            log(f"❌ {e}（{blender_version}）")
+            return "failed"
     
     # エクスポート設定
     exports_dir = project_dir / "exports"
     exports_dir.mkdir(exist_ok=True)
     
-    output_filename = f"{project_name}.glb"
+    output_filename = output_filename_for(project_name, tier)
     output_path = exports_dir / output_filename
     assets_output_path = assets_dir / output_filename
     
-    # Blenderスクリプトを作成
-    export_script = create_export_script(project_name, str(blend_file), str(output_path))
-    temp_script = project_dir / "temp_export.py"
+    # 前回から変更がなければスキップ
+    fingerprint = settings_fingerprint(project_name, tier, image_format, optimize)
+    manifest = load_manifest(exports_dir)
+    
+    if not force and is_up_to_date(manifest.get(output_filename), blend_file, output_path, blender_version, fingerprint):
+        log(f"⏭️  最新のためスキップ: {output_path}")
+        # 内容が同じで保存時刻だけ変わった場合は、次回ハッシュ計算を省けるよう記録し直す
+        source_mtime = blend_file.stat().st_mtime
+        if manifest[output_filename].get('source_mtime') != source_mtime:
+            with _manifest_lock:
+                manifest = load_manifest(exports_dir)
+                manifest[output_filename]['source_mtime'] = source_mtime
+                save_manifest(exports_dir, manifest)
+        method = publish_file(output_path, assets_output_path)
+        if method != "skipped":
+            log(f"{PUBLISH_LABELS[method]}: {assets_output_path}")
+        return "skipped"
     
-    with open(temp_script, 'w', encoding='utf-8') as f:
-        f.write(export_script)
+    # Blenderスクリプトを作成
+    export_script = create_export_script(project_name, str(blend_file), str(output_path), tier, image_format)
+    # 同じプロジェクトの別ティアと並列実行しても衝突しないファイル名にする
+    temp_script = project_dir / (f"temp_export_{tier}.py" if tier else "temp_export.py")
     
     try:
-        print(f"🚀 エクスポート開始...")
-        print(f"   入力: {blend_file}")
-        print(f"   出力: {output_path}")
-        
-        # Blenderでエクスポートを実行
-        cmd = [
-            str(blender_path),
-            str(blend_file),
-            "--background",
-            "--python", str(temp_script)
-        ]
+        log(f"🚀 エクスポート開始...")
+        log(f"   入力: {blend_file}")
+        log(f"   出力: {output_path}")
         
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        # 前回の出力が assets/ 等とハードリンクされていれば、上書きで公開中のファイルを壊さないよう切り離す
+        detach(output_path)
         
-        if result.returncode != 0:
-            print(f"❌ Blenderエクスポートエラー:")
-            print(result.stderr)
-            return False
+        if worker:
+            # ワーカーに同じスクリプトを渡して実行
+            response = blender_worker.send_job({
+                'type': 'script',
+                'code': export_script,
+                'blend_file': str(blend_file),
+            })
+            for line in response.get('output', '').splitlines():
+                log(f"   | {line}")
+            if not response['ok']:
+                log(f"❌ Blenderエクスポートエラー: {response['error']}")
+                return "failed"
+        else:
+            with open(temp_script, 'w', encoding='utf-8') as f:
+                f.write(export_script)
+            
+            # Blenderでエクスポートを実行
+            cmd = [
+                str(blender_path),
+                str(blend_file),
+                "--background",
+                "--python", str(temp_script)
+            ]
+            
+            # Blenderの出力を1行ずつ流す
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1
+            )
+            for line in process.stdout:
+                log(f"   | {line.rstrip()}")
+            returncode = process.wait()
+            
+            if returncode != 0:
+                log(f"❌ Blenderエクスポートエラー (終了コード {returncode})")
+                return "failed"
         
         # 成功確認
         if output_path.exists():
+            if optimize:
+                # 未使用削除・重複統合・メッシュ統合・量子化（Blender不要のポスト処理）
+                try:
+                    for line in format_report(optimize_glb(output_path)).splitlines():
+                        log(line)
+                except UnsupportedGLB as e:
+                    log(f"⏭️  最適化をスキップ: {e}")
+            
             file_size = output_path.stat().st_size / (1024 * 1024)  # MB
-            print(f"✅ エクスポート成功!")
-            print(f"📦 ファイルサイズ: {file_size:.2f}MB")
-            print(f"📁 保存場所: {output_path}")
+            log(f"✅ エクスポート成功!")
+            log(f"📦 ファイルサイズ: {file_size:.2f}MB")
+            log(f"📁 保存場所: {output_path}")
+            
+            # 統計をサイドカー（<GLB>.stats.json）に記録し、ティアの上限と照合
+            try:
+                stats = load_stats(output_path)
+            except ValueError as e:
+                log(f"⚠️  GLBの統計を取得できません: {e}")
+            else:
+                log(f"🔺 三角形: {stats['triangles']:,} / 🖼️  テクスチャ: {stats['texture_count']}枚 (最大 {stats['max_texture_resolution']}px)")
+                if tier is not None:
+                    for problem in check_quality(stats, tier):
+                        log(f"⚠️  品質チェック（{tier}）: {problem}")
+            
+            record_export(exports_dir, output_path, blend_file, blender_version, fingerprint)
             
-            # assetsディレクトリにもコピー
-            assets_dir.mkdir(exist_ok=True)
-            shutil.copy2(output_path, assets_output_path)
-            print(f"📋 アセットにコピー: {assets_output_path}")
+            # assetsディレクトリにも配置（同じファイルシステムならリンク、違えばコピー）
+            method = publish_file(output_path, assets_output_path)
+            log(f"{PUBLISH_LABELS[method]}: {assets_output_path}")
             
-            return True
+            return "exported"
         else:
-            print("❌ エクスポートファイルが生成されませんでした")
-            return False
+            log("❌ エクスポートファイルが生成されませんでした")
+            return "failed"
             
     except Exception as e:
-        print(f"❌ エクスポートエラー: {e}")
-        return False
+        log(f"❌ エクスポートエラー: {e}")
+        return "failed"
     
     finally:
         # 一時ファイルを削除
         if temp_script.exists():
             temp_script.unlink()
 
+def find_exportable_projects():
+    """.blendファイルを含むプロジェクト名の一覧"""
+    if not PROJECTS_DIR.exists():
+        return []
+    
+    return sorted(
+        item.name for item in PROJECTS_DIR.iterdir()
+        if item.is_dir() and not item.name.startswith('.') and any(item.glob("**/*.blend"))
+    )
+
+def export_projects(project_names, max_workers=None, force=False, tiers=None, image_format=None, optimize=True):
+    """
+    複数プロジェクトを並列にエクスポート
+    
+    Args:
+        project_names: プロジェクト名のリスト
+        max_workers: 同時に起動するBlenderの上限（既定: CPUコア数の半分）
+        force: Trueなら最新のプロジェクトも再エクスポートする
+        tiers: 品質ティアのリスト（プロジェクト×ティアごとに1回エクスポート、Noneなら従来どおり）
+        image_format: テクスチャの画像形式（AUTO/JPEG/WEBP、Noneならティアの設定）
+        optimize: Trueならエクスポート後にGLBを最適化する
+    
+    Returns:
+        エクスポートごとの結果（name, status, success, seconds, size）のリスト
+    """
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 2) // 2)
+    jobs = [(name, tier) for name in project_names for tier in (tiers or [None])]
+    labels = {job: job[0] if job[1] is None else f"{job[0]}:{job[1]}" for job in jobs}
+    width = max(len(label) for label in labels.values())
+    
+    def run(job):
+        project_name, tier = job
+        label = labels[job]
+        start = time.perf_counter()
+        status = export_project_status(project_name, prefix=f"[{label:<{width}}] ", force=force, tier=tier, image_format=image_format, optimize=optimize)
+        elapsed = time.perf_counter() - start
+        success = status != "failed"
+        
+        output_path = PROJECTS_DIR / project_name / "exports" / output_filename_for(project_name, tier)
+        size = output_path.stat().st_size if success and output_path.exists() else None
+        return {'name': label, 'status': status, 'success': success, 'seconds': elapsed, 'size': size}
+    
+    # Blenderは別プロセスなので、待ち受けはスレッドで十分
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run, jobs))
+
+def print_export_summary(results, wall_time):
+    """プロジェクトごとの実時間・サイズ・結果を表形式で表示"""
+    width = max([len(r['name']) for r in results] + [len("Project")])
+    print()
+    print("📊 エクスポート結果")
+    print("=" * (width + 36))
+    print(f"{'Project':<{width}}  {'Time':>8}  {'Size':>10}  Status")
+    print("-" * (width + 36))
+    for r in results:
+        size = f"{r['size'] / (1024 * 1024):.2f}MB" if r['size'] is not None else "-"
+        status = {"exported": "✅ 成功", "skipped": "⏭️  スキップ"}.get(r['status'], "❌ 失敗")
+        print(f"{r['name']:<{width}}  {r['seconds']:>7.1f}s  {size:>10}  {status}")
+    print("=" * (width + 36))
+    succeeded = sum(1 for r in results if r['success'])
+    skipped = sum(1 for r in results if r['status'] == "skipped")
+    print(f"成功: {succeeded}/{len(results)}（うちスキップ {skipped}）  実時間: {wall_time:.1f}s")
+
 def list_exportable_projects():
     """エクスポート可能なプロジェクトをリスト表示"""
-    projects_dir = Path("/Users/nukuiyuki/Dev/mcp-tools/Blender/projects")
+    projects_dir = PROJECTS_DIR
     
     if not projects_dir.exists():
         print("❌ projectsディレクトリが見つかりません")
@@ -206,37 +539,104 @@ def list_exportable_projects():
             print(f"   GLBファイル: {', '.join(project['exported_files'])}")
         print()
 
+def parse_options(args):
+    """引数から -j/--jobs N、--force、--tier T、--image-format F、--no-optimize を取り出す"""
+    jobs = None
+    force = False
+    tiers = None
+    image_format = None
+    optimize = True
+    remaining = []
+    i = 0
+    while i < len(args):
+        if args[i] == "--force":
+            force = True
+            i += 1
+            continue
+        if args[i] == "--no-optimize":
+            optimize = False
+            i += 1
+            continue
+        if args[i] in ("-j", "--jobs") and i + 1 < len(args):
+            jobs = int(args[i + 1])
+            i += 2
+            continue
+        if args[i] == "--tier" and i + 1 < len(args):
+            tiers = parse_tiers(args[i + 1])
+            i += 2
+            continue
+        if args[i] == "--image-format" and i + 1 < len(args):
+            image_format = parse_image_format(args[i + 1])
+            i += 2
+            continue
+        remaining.append(args[i])
+        i += 1
+    return jobs, force, tiers, image_format, optimize, remaining
+
 if __name__ == "__main__":
     print("🎨 Blenderプロジェクト自動エクスポートツール")
     print("=" * 50)
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "list":
-            list_exportable_projects()
+    try:
+        jobs, force, tiers, image_format, optimize, args = parse_options(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    if args and args[0] == "list":
+        list_exportable_projects()
+    elif args and (args[0] == "all" or len(args) > 1 or (tiers and len(tiers) > 1)):
+        project_names = find_exportable_projects() if args[0] == "all" else args
+        if not project_names:
+            print("📁 エクスポート可能なプロジェクトが見つかりません")
+            sys.exit(1)
+        
+        tier_note = f"（ティア: {', '.join(tiers)}）" if tiers else ""
+        print(f"📦 {len(project_names)}個のプロジェクトを並列エクスポート中...{tier_note}")
+        print()
+        
+        start = time.perf_counter()
+        results = export_projects(project_names, jobs, force, tiers, image_format, optimize)
+        print_export_summary(results, time.perf_counter() - start)
+        
+        sys.exit(0 if all(r['success'] for r in results) else 1)
+    elif args:
+        project_name = args[0]
+        tier = tiers[0] if tiers else None
+        print(f"📦 プロジェクト '{project_name}' をエクスポート中..." + (f"（ティア: {tier}）" if tier else ""))
+        print()
+        
+        success = export_project(project_name, force=force, tier=tier, image_format=image_format, optimize=optimize)
+        
+        if success:
+            print()
+            print("🎉 エクスポート完了!")
+            print("🚀 次のステップ:")
+            print(f"   python3 integrate_to_threejs.py {project_name}")
         else:
-            project_name = sys.argv[1]
-            print(f"📦 プロジェクト '{project_name}' をエクスポート中...")
             print()
-            
-            success = export_project(project_name)
-            
-            if success:
-                print()
-                print("🎉 エクスポート完了!")
-                print("🚀 次のステップ:")
-                print(f"   python3 integrate_to_threejs.py {project_name}")
-            else:
-                print()
-                print("💡 トラブルシューティング:")
-                print("   1. .blendファイルが存在することを確認")
-                print("   2. Blenderが正しくインストールされていることを確認")
-                print("   3. プロジェクト名が正しいことを確認")
+            print("💡 トラブルシューティング:")
+            print("   1. .blendファイルが存在することを確認")
+            print("   2. Blenderが正しくインストールされていることを確認")
+            print("   3. プロジェクト名が正しいことを確認")
+        
+        sys.exit(0 if success else 1)
     else:
         print("使用方法:")
         print("  エクスポート: python3 export_project.py <プロジェクト名>")
+        print("  複数エクスポート: python3 export_project.py <プロジェクト名> <プロジェクト名> ... [-j 並列数]")
+        print("  全エクスポート: python3 export_project.py all [-j 並列数]")
+        print(f"  品質ティア指定: --tier {'|'.join(TIERS)}|all （カンマ区切りで複数可、<名前>_<ティア>.glb を出力）")
+        print(f"  画像形式指定: --image-format {'|'.join(IMAGE_FORMATS).lower()} （webpはBlender 4.0以降）")
+        print("  ※ エクスポート後にGLBを最適化（未使用削除・重複統合・メッシュ統合・量子化、--no-optimize で無効）")
         print("  一覧表示: python3 export_project.py list")
+        print("  ※ .blendと設定が前回から変わっていなければスキップ（--force で強制再エクスポート）")
         print()
         print("例:")
         print("  python3 export_project.py unicorn_project")
         print("  python3 export_project.py dragon_model")
-        print("  python3 export_project.py list")
\ No newline at end of file
+        print("  python3 export_project.py unicorn_project dragon_model -j 2")
+        print("  python3 export_project.py unicorn_project --tier all")
+        print("  python3 export_project.py unicorn_project --tier draft --image-format webp")
+        print("  python3 export_project.py all -j 4")
+        print("  python3 export_project.py list")
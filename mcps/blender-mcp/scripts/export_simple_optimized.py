@@ -1,4 +1,10 @@
 import bpy
+import os
+import sys
+
+# 品質ティア別のエクスポート設定（export_project.py と共通）
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_profiles import gltf_export_settings
 
 # すべてのオブジェクトを選択
 bpy.ops.object.select_all(action='SELECT')
@@ -21,12 +27,8 @@ bpy.ops.export_scene.gltf(
     export_cameras=True,
     export_lights=True,
     
-    # 圧縮設定（最重要）
-    export_draco_mesh_compression_enable=True,
-    export_draco_mesh_compression_level=6,
-    export_draco_position_quantization=14,
-    export_draco_normal_quantization=10,
-    export_draco_texcoord_quantization=12
+    # 圧縮設定（最重要）standard ティアの値
+    **gltf_export_settings('standard')
 )
 
 print("最適化されたglTF/GLBエクスポートが完了しました: test_scene_optimized.glb")
\ No newline at end of file
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+GLBインスペクター（Blender不要）
+GLBのヘッダーとJSONチャンクを直接読み、BINチャンクはmmapで必要な部分だけ参照して
+メッシュ/プリミティブ数・三角形数・アクセサーのサイズ・テクスチャ解像度・
+Draco使用有無・アニメーションの長さ(ms)を集計する
+
+集計結果は <GLB>.stats.json（サイドカー）に保存し、GLBのサイズと更新時刻が
+変わらない限り再利用する（ビューワー生成や品質チェックは load_stats を使う）
+
+使用方法:
+  python3 glb_inspect.py <file.glb> [...]              # 集計を表示
+  python3 glb_inspect.py <file.glb> --json             # JSONで出力
+  python3 glb_inspect.py <file.glb> --check standard   # 品質ティアの上限と照合
+"""
+
+import os
+import sys
+import json
+import mmap
+import base64
+import struct
+from pathlib import Path
+
+GLB_MAGIC = b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# サイドカーの形式を変えたら上げる
+STATS_VERSION = 1
+
+COMPONENT_BYTES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+MODE_TRIANGLES, MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN = 4, 5, 6
+
+def read_chunks(data):
+    """
+    GLBのヘッダーを検証し、JSONとBINチャンクを返す
+
+    Args:
+        data: GLB全体（bytes / mmap）
+
+    Returns:
+        (glTF JSON辞書, BINチャンクのmemoryview または None)
+    """
+    if len(data) < 20:
+        raise ValueError("GLBとして短すぎます")
+    magic, version, length = struct.unpack_from("<4sII", data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError("GLBファイルではありません（マジックナンバー不一致）")
+    if version != 2:
+        raise ValueError(f"未対応のGLBバージョン: {version}")
+    if length > len(data):
+        raise ValueError(f"ファイルが途中で切れています（ヘッダー {length} バイト / 実際 {len(data)} バイト）")
+
+    gltf = None
+    binary = None
+    offset = 12
+    while offset + 8 <= length:
+        chunk_length, chunk_type = struct.unpack_from("<II", data, offset)
+        start = offset + 8
+        if chunk_type == CHUNK_JSON and gltf is None:
+            gltf = json.loads(bytes(data[start:start + chunk_length]).decode("utf-8"))
+        elif chunk_type == CHUNK_BIN and binary is None:
+            binary = memoryview(data)[start:start + chunk_length]
+        # チャンクは4バイト境界に揃っている
+        offset = start + ((chunk_length + 3) & ~3)
+
+    if gltf is None:
+        raise ValueError("JSONチャンクがありません")
+    return gltf, binary
+
+def accessor_bytes(accessor):
+    """アクセサーの展開後サイズ（Draco圧縮時もGPUに載るのはこのサイズ）"""
+    return accessor.get("count", 0) * TYPE_COMPONENTS[accessor["type"]] * COMPONENT_BYTES[accessor["componentType"]]
+
+def _primitive_triangles(gltf, primitive):
+    accessors = gltf.get("accessors", [])
+    if "indices" in primitive:
+        count = accessors[primitive["indices"]]["count"]
+    elif "POSITION" in primitive.get("attributes", {}):
+        count = accessors[primitive["attributes"]["POSITION"]]["count"]
+    else:
+        return 0
+    mode = primitive.get("mode", MODE_TRIANGLES)
+    if mode == MODE_TRIANGLES:
+        return count // 3
+    if mode in (MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+        return max(0, count - 2)
+    return 0
+
+def image_size(data):
+    """PNG/JPEG/WebP/KTX2の先頭バイトから (幅, 高さ)、判別できなければ None"""
+    data = bytes(data[:64 * 1024]) if len(data) > 64 * 1024 else bytes(data)
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and len(data) >= 24:
+        return struct.unpack_from(">II", data, 16)
+    if data[:12] == b"\xabKTX 20\xbb\r\n\x1a\n" and len(data) >= 28:
+        return struct.unpack_from("<II", data, 20)
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        kind = data[12:16]
+        if kind == b"VP8 " and len(data) >= 30:
+            width, height = struct.unpack_from("<HH", data, 26)
+            return width & 0x3FFF, height & 0x3FFF
+        if kind == b"VP8L" and len(data) >= 25:
+            bits = int.from_bytes(data[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if kind == b"VP8X" and len(data) >= 30:
+            return int.from_bytes(data[24:27], "little") + 1, int.from_bytes(data[27:30], "little") + 1
+        return None
+    if data[:2] == b"\xff\xd8":
+        offset = 2
+        while offset + 9 <= len(data):
+            if data[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = data[offset + 1]
+            # SOFマーカー（DHT/JPG/DACを除く）に画像サイズが入っている
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack_from(">HH", data, offset + 5)
+                return width, height
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                offset += 2
+                continue
+            offset += 2 + struct.unpack_from(">H", data, offset + 2)[0]
+    return None
+
+def _buffer_view_bytes(gltf, binary, index):
+    view = gltf["bufferViews"][index]
+    # GLB内のバッファ（buffers[0]、uriなし）だけを対象にする
+    if binary is None or view.get("buffer", 0) != 0 or "uri" in gltf["buffers"][0]:
+        return None
+    start = view.get("byteOffset", 0)
+    return binary[start:start + view["byteLength"]]
+
+def _image_bytes(gltf, binary, image, base_dir):
+    if "bufferView" in image:
+        return _buffer_view_bytes(gltf, binary, image["bufferView"])
+    uri = image.get("uri", "")
+    if uri.startswith("data:"):
+        return base64.b64decode(uri.split(",", 1)[1])
+    if uri and base_dir is not None:
+        path = Path(base_dir) / uri
+        if path.exists():
+            with open(path, "rb") as f:
+                return f.read(64 * 1024)
+    return None
+
+def _accessor_max(gltf, binary, index):
+    """アクセサーの最大値（min/maxがなければBINから読む）"""
+    accessor = gltf["accessors"][index]
+    if accessor.get("max"):
+        return accessor["max"][0]
+    if "bufferView" not in accessor or accessor["componentType"] != 5126:
+        return None
+    view = _buffer_view_bytes(gltf, binary, accessor["bufferView"])
+    if view is None:
+        return None
+    start = accessor.get("byteOffset", 0)
+    stride = gltf["bufferViews"][accessor["bufferView"]].get("byteStride", 4)
+    return max(
+        (struct.unpack_from("<f", view, start + i * stride)[0] for i in range(accessor["count"])),
+        default=None,
+    )
+
+def inspect_gltf(gltf, binary=None, base_dir=None):
+    """パース済みのglTF JSONとBINチャンクから統計を作る"""
+    accessors = gltf.get("accessors", [])
+    extensions = set(gltf.get("extensionsUsed", []))
+
+    meshes = []
+    draco_primitives = 0
+    for index, mesh in enumerate(gltf.get("meshes", [])):
+        primitives = mesh.get("primitives", [])
+        vertices = sum(
+            accessors[p["attributes"]["POSITION"]]["count"]
+            for p in primitives if "POSITION" in p.get("attributes", {})
+        )
+        draco = sum(1 for p in primitives if "KHR_draco_mesh_compression" in p.get("extensions", {}))
+        draco_primitives += draco
+        meshes.append({
+            "name": mesh.get("name", f"mesh_{index}"),
+            "primitives": len(primitives),
+            "vertices": vertices,
+            "triangles": sum(_primitive_triangles(gltf, p) for p in primitives),
+            "draco_primitives": draco,
+        })
+
+    accessor_sizes = [
+        {
+            "index": index,
+            "type": accessor["type"],
+            "component_type": accessor["componentType"],
+            "count": accessor.get("count", 0),
+            "bytes": accessor_bytes(accessor),
+        }
+        for index, accessor in enumerate(accessors)
+    ]
+
+    images = gltf.get("images", [])
+    textures = []
+    for index, image in enumerate(images):
+        data = _image_bytes(gltf, binary, image, base_dir)
+        size = image_size(data) if data is not None else None
+        view = gltf["bufferViews"][image["bufferView"]] if "bufferView" in image else None
+        textures.append({
+            "name": image.get("name", f"image_{index}"),
+            "mime_type": image.get("mimeType"),
+            "width": size[0] if size else None,
+            "height": size[1] if size else None,
+            "bytes": view["byteLength"] if view else None,
+        })
+
+    animations = []
+    for index, animation in enumerate(gltf.get("animations", [])):
+        inputs = {sampler["input"] for sampler in animation.get("samplers", [])}
+        times = [t for t in (_accessor_max(gltf, binary, i) for i in inputs) if t is not None]
+        animations.append({
+            "name": animation.get("name", f"animation_{index}"),
+            "channels": len(animation.get("channels", [])),
+            "duration_ms": round(max(times, default=0.0) * 1000),
+        })
+
+    return {
+        "meshes": len(meshes),
+        "primitives": sum(m["primitives"] for m in meshes),
+        "vertices": sum(m["vertices"] for m in meshes),
+        "triangles": sum(m["triangles"] for m in meshes),
+        "nodes": len(gltf.get("nodes", [])),
+        "materials": len(gltf.get("materials", [])),
+        "accessor_bytes": sum(a["bytes"] for a in accessor_sizes),
+        "texture_count": len(textures),
+        "max_texture_resolution": max((max(t["width"], t["height"]) for t in textures if t["width"]), default=0),
+        "draco": "KHR_draco_mesh_compression" in extensions,
+        "draco_primitives": draco_primitives,
+        "extensions_used": sorted(extensions),
+        "animation_count": len(animations),
+        "mesh_details": meshes,
+        "accessors": accessor_sizes,
+        "textures": textures,
+        "animations": animations,
+    }
+
+def inspect_glb(path):
+    """
+    GLBファイルを読み込んで統計を返す（BINチャンクはmmapで必要な所だけ読む）
+
+    中身が壊れている・glTFとして不正なものは ValueError にまとめる
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 20:
+            raise ValueError(f"GLBとして短すぎます: {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                gltf, binary = read_chunks(data)
+                try:
+                    stats = inspect_gltf(gltf, binary, base_dir=path.parent)
+                finally:
+                    # mmapを閉じる前にビューを解放する
+                    if binary is not None:
+                        binary.release()
+            except (KeyError, IndexError, TypeError, AttributeError, struct.error) as e:
+                raise ValueError(f"GLBの内容が不正です: {path}: {e!r}") from e
+    stats["file_bytes"] = path.stat().st_size
+    return stats
+
+def stats_path_for(glb_path):
+    """サイドカーのパス（<GLB>.stats.json）"""
+    return Path(f"{glb_path}.stats.json")
+
+def load_stats(glb_path, refresh=False):
+    """
+    サイドカーから統計を読む。GLBのサイズ・更新時刻が違えば集計し直して保存する
+
+    Returns:
+        inspect_glb と同じ形式の辞書
+    """
+    glb_path = Path(glb_path)
+    sidecar = stats_path_for(glb_path)
+    stat = glb_path.stat()
+    source = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    if not refresh:
+        try:
+            with open(sidecar, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("version") == STATS_VERSION and cached.get("source") == source:
+                return cached["stats"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    stats = inspect_glb(glb_path)
+    temp_path = sidecar.with_name(sidecar.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATS_VERSION, "source": source, "stats": stats}, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, sidecar)
+    return stats
+
+def check_quality(stats, tier):
+    """
+    品質ティア（configs/quality-criteria.yaml）の上限と照合
+
+    Returns:
+        上限を超えた項目のメッセージのリスト（空なら合格）
+    """
+    from export_profiles import load_profile
+
+    profile = load_profile(tier)
+    problems = []
+    if stats["triangles"] > profile["polygon_count_max"]:
+        problems.append(f"三角形数 {stats['triangles']:,} > 上限 {profile['polygon_count_max']:,}")
+    if stats["texture_count"] > profile["texture_count_max"]:
+        problems.append(f"テクスチャ {stats['texture_count']}枚 > 上限 {profile['texture_count_max']}枚")
+    if stats["max_texture_resolution"] > profile["texture_resolution"]:
+        problems.append(f"テクスチャ解像度 {stats['max_texture_resolution']}px > 上限 {profile['texture_resolution']}px")
+    return problems
+
+def print_stats(path, stats):
+    print(f"📦 {path} ({stats['file_bytes'] / (1024 * 1024):.2f}MB)")
+    print(f"   メッシュ: {stats['meshes']}個 / プリミティブ: {stats['primitives']}個 / ノード: {stats['nodes']}個 / マテリアル: {stats['materials']}個")
+    print(f"   頂点: {stats['vertices']:,} / 三角形: {stats['triangles']:,} / アクセサー展開後: {stats['accessor_bytes'] / (1024 * 1024):.2f}MB")
+    print(f"   Draco: {'あり' if stats['draco'] else 'なし'}" + (f"（{stats['draco_primitives']}プリミティブ）" if stats['draco'] else ""))
+    print(f"   テクスチャ: {stats['texture_count']}枚")
+    for texture in stats["textures"]:
+        size = f"{texture['width']}x{texture['height']}" if texture["width"] else "サイズ不明"
+        print(f"     - {texture['name']}: {size} {texture['mime_type'] or ''}")
+    print(f"   アニメーション: {stats['animation_count']}個")
+    for animation in stats["animations"]:
+        print(f"     - {animation['name']}: {animation['duration_ms']:,}ms ({animation['channels']}チャンネル)")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    as_json = "--json" in args
+    tier = None
+    if "--check" in args:
+        index = args.index("--check")
+        tier = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    files = [arg for arg in args if not arg.startswith("--")]
+
+    if not files:
+        print(__doc__)
+        sys.exit(1)
+
+    failed = False
+    results = {}
+    for file in files:
+        try:
+            stats = load_stats(file)
+        except (OSError, ValueError) as e:
+            print(f"❌ {file}: {e}")
+            failed = True
+            continue
+        results[file] = stats
+        if not as_json:
+            print_stats(file, stats)
+        if tier:
+            problems = check_quality(stats, tier)
+            if problems:
+                failed = True
+                if not as_json:
+                    print(f"   ❌ 品質チェック（{tier}）不合格:")
+                    for problem in problems:
+                        print(f"     - {problem}")
+            elif not as_json:
+                print(f"   ✅ 品質チェック（{tier}）合格")
+        if not as_json:
+            print()
+
+    if as_json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,884 @@
+#!/usr/bin/env python3
+"""
+GLBポスト処理オプティマイザー（Blender不要）
+Blenderが書き出したGLBのJSONとBINバッファを直接書き換える
+
+  1. 未使用の削除: シーンから辿れないノード、使われていないメッシュ・マテリアル・
+     テクスチャ・画像・アクセサー
+  2. 重複の統合: 同じ内容の画像・サンプラー・テクスチャ・アクセサー
+  3. メッシュの統合: 同じマテリアルのプリミティブを1つにまとめる
+     （メッシュ内、および動かない単独ノード同士はワールド座標に焼き込んで統合）
+  4. 量子化（KHR_mesh_quantization）: 法線・接線をint8、0-1のUVをuint16、
+     スキンなしメッシュの頂点座標をuint16＋子ノードの移動・拡大で復元
+
+Draco圧縮されたプリミティブは中身を触らず（1・2のみ）、未対応の拡張を使うGLBは
+そのまま残す。前後のファイルサイズと読み込み時間の目安を表示する
+
+使用方法:
+  python3 glb_optimize.py <file.glb> [...]          # その場で最適化
+  python3 glb_optimize.py <file.glb> -o <out.glb>   # 別ファイルに書き出し
+  オプション: --no-merge（メッシュ統合なし） --no-quantize（量子化なし）
+"""
+
+import os
+import sys
+import json
+import struct
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from glb_inspect import read_chunks, inspect_gltf, accessor_bytes, COMPONENT_BYTES, TYPE_COMPONENTS, CHUNK_JSON, CHUNK_BIN
+
+# 中身を解釈できないとバッファを組み直せない拡張
+UNSUPPORTED_EXTENSIONS = {"EXT_meshopt_compression", "KHR_materials_variants"}
+
+# ノードのインスタンス描画（Blenderの export_gpu_instances）。attributes にアクセサーを持つ
+GPU_INSTANCING = "EXT_mesh_gpu_instancing"
+
+def _instancing_attributes(gltf):
+    """EXT_mesh_gpu_instancing の attributes（TRANSLATION などの名前 → アクセサー）の一覧"""
+    return [node["extensions"][GPU_INSTANCING].get("attributes", {})
+            for node in gltf.get("nodes", []) if GPU_INSTANCING in node.get("extensions", {})]
+
+DTYPES = {5120: "<i1", 5121: "<u1", 5122: "<i2", 5123: "<u2", 5125: "<u4", 5126: "<f4"}
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+# 読み込み時間の目安（ブラウザでの大まかな処理速度）
+JSON_BYTES_PER_MS = 100_000      # JSON.parse
+BIN_BYTES_PER_MS = 1_000_000     # バッファのコピー・GPU転送
+DRACO_BYTES_PER_MS = 20_000      # Dracoデコード後のバイト数
+PIXELS_PER_MS = 50_000           # 画像デコード
+
+class UnsupportedGLB(ValueError):
+    """このGLBは最適化の対象外"""
+
+# ---------------------------------------------------------------------------
+# 読み込み・書き出し
+# ---------------------------------------------------------------------------
+
+def _referenced_buffer_views(value, found):
+    """拡張などから参照されているbufferViewを集める"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "bufferView" and isinstance(item, int):
+                found.add(item)
+            else:
+                _referenced_buffer_views(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _referenced_buffer_views(item, found)
+
+def unpack(gltf, binary):
+    """
+    bufferViewを解いて、アクセサー・画像・その他のデータを個別に取り出す
+
+    Returns:
+        {"accessors": [ndarray|None], "images": [bytes|None], "opaque": {bufferView: bytes}}
+        opaqueはDracoなど拡張が参照するbufferView（番号は pack で振り直す）
+    """
+    unsupported = UNSUPPORTED_EXTENSIONS & set(gltf.get("extensionsUsed", []))
+    if unsupported:
+        raise UnsupportedGLB(f"未対応の拡張: {', '.join(sorted(unsupported))}")
+    buffers = gltf.get("buffers", [])
+    if len(buffers) > 1 or any("uri" in buffer for buffer in buffers):
+        raise UnsupportedGLB("外部バッファを参照しています")
+
+    views = gltf.get("bufferViews", [])
+
+    def view_bytes(index):
+        view = views[index]
+        start = view.get("byteOffset", 0)
+        return bytes(binary[start:start + view["byteLength"]])
+
+    accessors = []
+    for accessor in gltf.get("accessors", []):
+        if "sparse" in accessor:
+            raise UnsupportedGLB("スパースアクセサーは未対応です")
+        if "bufferView" not in accessor:
+            accessors.append(None)
+            continue
+        components = TYPE_COMPONENTS[accessor["type"]]
+        component_bytes = COMPONENT_BYTES[accessor["componentType"]]
+        if accessor["type"].startswith("MAT") and component_bytes < 4:
+            raise UnsupportedGLB("列パディング付きの行列アクセサーは未対応です")
+        view = views[accessor["bufferView"]]
+        data = view_bytes(accessor["bufferView"])
+        stride = view.get("byteStride", components * component_bytes)
+        array = np.ndarray(
+            shape=(accessor["count"], components),
+            dtype=DTYPES[accessor["componentType"]],
+            buffer=data,
+            offset=accessor.get("byteOffset", 0),
+            strides=(stride, component_bytes),
+        ).copy()
+        accessors.append(array)
+        del accessor["bufferView"]
+        accessor.pop("byteOffset", None)
+
+    images = []
+    for image in gltf.get("images", []):
+        if "bufferView" in image:
+            images.append(view_bytes(image.pop("bufferView")))
+        else:
+            images.append(None)
+
+    # 残りの参照（Draco等）は中身をそのまま持ち回る
+    others = {key: value for key, value in gltf.items() if key not in ("accessors", "images", "bufferViews", "buffers")}
+    referenced = set()
+    _referenced_buffer_views(others, referenced)
+    opaque = {index: view_bytes(index) for index in referenced}
+
+    gltf.pop("bufferViews", None)
+    gltf.pop("buffers", None)
+    return {"accessors": accessors, "images": images, "opaque": opaque}
+
+def _accessor_targets(gltf):
+    """アクセサー番号 → bufferViewのtarget（頂点属性 / インデックス）"""
+    targets = {}
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            for index in primitive.get("attributes", {}).values():
+                targets[index] = ARRAY_BUFFER
+            for target in primitive.get("targets", []):
+                for index in target.values():
+                    targets[index] = ARRAY_BUFFER
+            if "indices" in primitive:
+                targets[primitive["indices"]] = ELEMENT_ARRAY_BUFFER
+    return targets
+
+def pack(gltf, data):
+    """unpack したデータからBINバッファとbufferViewを組み直してGLBのバイト列を返す"""
+    binary = bytearray()
+    views = []
+
+    def add_view(payload, target=None, stride=None):
+        # bufferViewは4バイト境界から始める（頂点属性の要素境界も兼ねる）
+        binary.extend(b"\x00" * (-len(binary) % 4))
+        view = {"buffer": 0, "byteOffset": len(binary), "byteLength": len(payload)}
+        if stride is not None:
+            view["byteStride"] = stride
+        if target is not None:
+            view["target"] = target
+        binary.extend(payload)
+        views.append(view)
+        return len(views) - 1
+
+    # 拡張が参照するbufferViewを新しい番号に振り直す
+    opaque_map = {old: add_view(payload) for old, payload in sorted(data["opaque"].items())}
+    if opaque_map:
+        _renumber_buffer_views(
+            {key: value for key, value in gltf.items() if key not in ("accessors", "images")},
+            opaque_map,
+        )
+
+    targets = _accessor_targets(gltf)
+    for index, (accessor, array) in enumerate(zip(gltf.get("accessors", []), data["accessors"])):
+        if array is None:
+            continue
+        target = targets.get(index)
+        element_bytes = array.shape[1] * array.dtype.itemsize
+        stride = None
+        payload = np.ascontiguousarray(array)
+        if target == ARRAY_BUFFER and element_bytes % 4:
+            # 頂点属性の要素は4バイト境界に揃える必要がある（int8 VEC3 → 4バイトなど）
+            stride = element_bytes + (-element_bytes % 4)
+            padded = np.zeros((len(array), stride), dtype=np.uint8)
+            padded[:, :element_bytes] = payload.view(np.uint8).reshape(len(array), element_bytes)
+            payload = padded
+        accessor["bufferView"] = add_view(payload.tobytes(), target, stride)
+
+    for image, payload in zip(gltf.get("images", []), data["images"]):
+        if payload is not None:
+            image["bufferView"] = add_view(payload)
+
+    if binary:
+        binary.extend(b"\x00" * (-len(binary) % 4))
+        gltf["buffers"] = [{"byteLength": len(binary)}]
+        gltf["bufferViews"] = views
+
+    json_bytes = json.dumps(gltf, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    json_bytes += b" " * (-len(json_bytes) % 4)
+    length = 12 + 8 + len(json_bytes) + (8 + len(binary) if binary else 0)
+
+    output = bytearray(struct.pack("<4sII", b"glTF", 2, length))
+    output += struct.pack("<II", len(json_bytes), CHUNK_JSON) + json_bytes
+    if binary:
+        output += struct.pack("<II", len(binary), CHUNK_BIN) + binary
+    return bytes(output)
+
+def _renumber_buffer_views(value, mapping):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "bufferView" and isinstance(item, int):
+                value[key] = mapping[item]
+            else:
+                _renumber_buffer_views(item, mapping)
+    elif isinstance(value, list):
+        for item in value:
+            _renumber_buffer_views(item, mapping)
+
+# ---------------------------------------------------------------------------
+# 参照の付け替え
+# ---------------------------------------------------------------------------
+
+def _texture_infos(value):
+    """マテリアル内の textureInfo（"...Texture": {"index": n}）"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith("Texture") and isinstance(item, dict) and "index" in item:
+                yield item
+            else:
+                yield from _texture_infos(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _texture_infos(item)
+
+def _references(gltf, kind):
+    """kind（"accessors" など）を参照している (辞書, キー) の一覧"""
+    refs = []
+
+    def add(container, key):
+        if isinstance(container, dict) and key in container:
+            refs.append((container, key))
+
+    primitives = [p for mesh in gltf.get("meshes", []) for p in mesh.get("primitives", [])]
+    if kind == "accessors":
+        for primitive in primitives:
+            attributes = primitive.get("attributes", {})
+            refs.extend((attributes, key) for key in attributes)
+            add(primitive, "indices")
+            for target in primitive.get("targets", []):
+                refs.extend((target, key) for key in target)
+        for skin in gltf.get("skins", []):
+            add(skin, "inverseBindMatrices")
+        for animation in gltf.get("animations", []):
+            for sampler in animation.get("samplers", []):
+                add(sampler, "input")
+                add(sampler, "output")
+        for attributes in _instancing_attributes(gltf):
+            refs.extend((attributes, key) for key in attributes)
+    elif kind == "nodes":
+        for scene in gltf.get("scenes", []):
+            add(scene, "nodes")
+        for node in gltf.get("nodes", []):
+            add(node, "children")
+        for skin in gltf.get("skins", []):
+            add(skin, "joints")
+            add(skin, "skeleton")
+        for animation in gltf.get("animations", []):
+            for channel in animation.get("channels", []):
+                add(channel.get("target"), "node")
+    elif kind in ("meshes", "skins", "cameras"):
+        key = {"meshes": "mesh", "skins": "skin", "cameras": "camera"}[kind]
+        for node in gltf.get("nodes", []):
+            add(node, key)
+    elif kind == "materials":
+        for primitive in primitives:
+            add(primitive, "material")
+    elif kind == "textures":
+        for info in _texture_infos(gltf.get("materials", [])):
+            add(info, "index")
+    elif kind == "images":
+        for texture in gltf.get("textures", []):
+            add(texture, "source")
+            for extension in texture.get("extensions", {}).values():
+                add(extension, "source")
+    elif kind == "samplers":
+        for texture in gltf.get("textures", []):
+            add(texture, "sampler")
+    return refs
+
+def _used(gltf, kind):
+    used = set()
+    for container, key in _references(gltf, kind):
+        value = container[key]
+        used.update(value if isinstance(value, list) else [value])
+    return used
+
+def reindex(gltf, kind, redirect, side=None):
+    """
+    kind の要素を並べ直す
+
+    Args:
+        redirect: 旧番号 → 残す要素の旧番号（自分なら残す、他なら統合、Noneなら削除）
+        side: 要素と並行に持っているリスト（アクセサーのデータなど）
+
+    Returns:
+        削除・統合した要素数
+    """
+    items = gltf.get(kind, [])
+    kept = [i for i in range(len(items)) if redirect.get(i) == i]
+    if len(kept) == len(items):
+        return 0
+    new_index = {old: new for new, old in enumerate(kept)}
+    mapping = {old: new_index[target] for old, target in redirect.items() if target is not None}
+
+    for container, key in _references(gltf, kind):
+        value = container[key]
+        if isinstance(value, list):
+            container[key] = [mapping[i] for i in value if i in mapping]
+        elif value in mapping:
+            container[key] = mapping[value]
+        else:
+            del container[key]
+
+    gltf[kind] = [items[i] for i in kept]
+    if not gltf[kind]:
+        del gltf[kind]
+    if side is not None:
+        side[:] = [side[i] for i in kept]
+    return len(items) - len(kept)
+
+# ---------------------------------------------------------------------------
+# 未使用の削除・重複の統合
+# ---------------------------------------------------------------------------
+
+def _scene_nodes(gltf):
+    """シーンから辿れるノードと、使われているスキンのジョイント"""
+    nodes = gltf.get("nodes", [])
+    if not gltf.get("scenes"):
+        return set(range(len(nodes)))
+    reachable = set()
+    stack = [i for scene in gltf["scenes"] for i in scene.get("nodes", [])]
+    while stack:
+        index = stack.pop()
+        if index in reachable:
+            continue
+        reachable.add(index)
+        stack.extend(nodes[index].get("children", []))
+        if "skin" in nodes[index]:
+            skin = gltf["skins"][nodes[index]["skin"]]
+            stack.extend(skin.get("joints", []))
+            if "skeleton" in skin:
+                stack.append(skin["skeleton"])
+    return reachable
+
+def _prune_animations(gltf, nodes):
+    """削除するノードを対象にしたチャンネルを外し、空のアニメーションを削除"""
+    animations = []
+    for animation in gltf.get("animations", []):
+        channels = [c for c in animation.get("channels", []) if c.get("target", {}).get("node") in nodes]
+        if not channels:
+            continue
+        samplers = sorted({c["sampler"] for c in channels})
+        remap = {old: new for new, old in enumerate(samplers)}
+        for channel in channels:
+            channel["sampler"] = remap[channel["sampler"]]
+        animation["channels"] = channels
+        animation["samplers"] = [animation["samplers"][i] for i in samplers]
+        animations.append(animation)
+    if animations:
+        gltf["animations"] = animations
+    else:
+        gltf.pop("animations", None)
+
+def prune(gltf, data):
+    """シーンから使われていない要素を削除し、種類ごとの削除数を返す"""
+    removed = {}
+    nodes = _scene_nodes(gltf)
+    _prune_animations(gltf, nodes)
+    removed["nodes"] = reindex(gltf, "nodes", {i: (i if i in nodes else None) for i in range(len(gltf.get("nodes", [])))})
+
+    for kind in ("meshes", "skins", "cameras", "materials", "textures", "images", "samplers", "accessors"):
+        used = _used(gltf, kind)
+        side = data["images"] if kind == "images" else data["accessors"] if kind == "accessors" else None
+        removed[kind] = reindex(gltf, kind, {i: (i if i in used else None) for i in range(len(gltf.get(kind, [])))}, side)
+    return {kind: count for kind, count in removed.items() if count}
+
+def _dedupe(gltf, kind, key_of, side=None):
+    seen = {}
+    redirect = {}
+    for index, item in enumerate(gltf.get(kind, [])):
+        key = key_of(index, item)
+        redirect[index] = index if key is None else seen.setdefault(key, index)
+    return reindex(gltf, kind, redirect, side)
+
+def _json_key(item, ignore=("name",)):
+    return json.dumps({k: v for k, v in item.items() if k not in ignore}, sort_keys=True)
+
+def dedupe(gltf, data):
+    """同じ内容の画像・サンプラー・テクスチャ・アクセサーを1つにまとめ、種類ごとの統合数を返す"""
+    images = data["images"]
+    accessors = data["accessors"]
+
+    def image_key(index, image):
+        if images[index] is not None:
+            return (image.get("mimeType"), hashlib.sha256(images[index]).hexdigest())
+        return ("uri", image.get("uri"))
+
+    def accessor_key(index, accessor):
+        array = accessors[index]
+        if array is None:
+            # Draco等でデータを持たないアクセサーは統合しない
+            return None
+        return (_json_key(accessor, ("name", "min", "max")), hashlib.sha256(array.tobytes()).hexdigest())
+
+    merged = {
+        "images": _dedupe(gltf, "images", image_key, images),
+        "samplers": _dedupe(gltf, "samplers", lambda i, s: _json_key(s)),
+        "textures": _dedupe(gltf, "textures", lambda i, t: _json_key(t)),
+        "accessors": _dedupe(gltf, "accessors", accessor_key, accessors),
+    }
+    return {kind: count for kind, count in merged.items() if count}
+
+# ---------------------------------------------------------------------------
+# メッシュの統合
+# ---------------------------------------------------------------------------
+
+def _node_matrix(node):
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", [0.0, 0.0, 0.0, 1.0])
+    rotation = np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", [1.0, 1.0, 1.0]))
+    matrix[:3, 3] = node.get("translation", [0.0, 0.0, 0.0])
+    return matrix
+
+def _parents(gltf):
+    return {child: index for index, node in enumerate(gltf.get("nodes", [])) for child in node.get("children", [])}
+
+def _world_matrix(gltf, index, parents):
+    matrix = _node_matrix(gltf["nodes"][index])
+    while index in parents:
+        index = parents[index]
+        matrix = _node_matrix(gltf["nodes"][index]) @ matrix
+    return matrix
+
+def _mergeable(primitive, accessors):
+    """統合できるプリミティブか（三角形・モーフなし・Dracoなし・データあり）"""
+    if primitive.get("mode", 4) != 4 or primitive.get("targets") or primitive.get("extensions"):
+        return False
+    indices = list(primitive.get("attributes", {}).values()) + ([primitive["indices"]] if "indices" in primitive else [])
+    return bool(primitive.get("attributes")) and all(accessors[i] is not None for i in indices)
+
+def _signature(gltf, primitive):
+    """同じマテリアル・同じ属性構成のプリミティブだけを統合する"""
+    attributes = tuple(sorted(
+        (name, gltf["accessors"][index]["type"], gltf["accessors"][index]["componentType"], gltf["accessors"][index].get("normalized", False))
+        for name, index in primitive["attributes"].items()
+    ))
+    return (primitive.get("material"), attributes)
+
+def _add_accessor(gltf, data, array, template):
+    accessor = {key: template[key] for key in ("type", "componentType", "normalized") if key in template}
+    accessor["count"] = len(array)
+    gltf["accessors"].append(accessor)
+    data["accessors"].append(array)
+    return len(gltf["accessors"]) - 1
+
+def _set_bounds(accessor, array):
+    accessor["min"] = array.min(axis=0).tolist()
+    accessor["max"] = array.max(axis=0).tolist()
+
+def _concat_primitives(gltf, data, parts):
+    """
+    プリミティブを1つに連結する
+
+    Args:
+        parts: (プリミティブ, 変換行列 または None) のリスト
+    """
+    accessors = gltf["accessors"]
+    first = parts[0][0]
+    attributes = {}
+    for name, index in first["attributes"].items():
+        arrays = []
+        for primitive, matrix in parts:
+            array = data["accessors"][primitive["attributes"][name]]
+            if matrix is not None and name in ("POSITION", "NORMAL", "TANGENT"):
+                array = _transform(array, name, matrix)
+            arrays.append(array)
+        merged = np.concatenate(arrays)
+        attributes[name] = _add_accessor(gltf, data, merged, accessors[index])
+        if name == "POSITION":
+            _set_bounds(accessors[attributes[name]], merged)
+
+    indices = []
+    offset = 0
+    for primitive, _ in parts:
+        count = len(data["accessors"][primitive["attributes"]["POSITION"]]) if "POSITION" in primitive["attributes"] \
+            else len(data["accessors"][next(iter(primitive["attributes"].values()))])
+        if "indices" in primitive:
+            indices.append(data["accessors"][primitive["indices"]].astype(np.uint32).ravel() + offset)
+        else:
+            indices.append(np.arange(offset, offset + count, dtype=np.uint32))
+        offset += count
+    merged_indices = np.concatenate(indices)
+    # 65535 は uint16 のプリミティブリスタート値なので、インデックスに使えるのは 65534 まで
+    component_type = 5123 if offset <= 65535 else 5125
+    index_array = merged_indices.astype(DTYPES[component_type]).reshape(-1, 1)
+
+    primitive = {key: value for key, value in first.items() if key not in ("attributes", "indices")}
+    primitive["attributes"] = attributes
+    primitive["indices"] = _add_accessor(gltf, data, index_array, {"type": "SCALAR", "componentType": component_type})
+    return primitive
+
+def _transform(array, name, matrix):
+    """ワールド行列を頂点座標・法線・接線に焼き込む"""
+    linear = matrix[:3, :3]
+    if name == "POSITION":
+        return (array.astype(np.float64) @ linear.T + matrix[:3, 3]).astype(np.float32)
+    if name == "NORMAL":
+        normals = array.astype(np.float64) @ np.linalg.inv(linear)
+        return (normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)).astype(np.float32)
+    tangents = array.astype(np.float64).copy()
+    xyz = tangents[:, :3] @ linear.T
+    tangents[:, :3] = xyz / np.maximum(np.linalg.norm(xyz, axis=1, keepdims=True), 1e-12)
+    return tangents.astype(np.float32)
+
+def merge_meshes(gltf, data):
+    """
+    同じマテリアルのプリミティブを統合し、減ったプリミティブ数を返す
+
+    - 各メッシュ内: 同じマテリアル・属性構成のプリミティブを連結
+    - 動かない単独ノード（アニメーション・スキン・子ノード・カメラなし、メッシュを共有していない）
+      のメッシュは、ワールド座標に焼き込んでシーン直下の1ノードにまとめる
+    """
+    accessors = data["accessors"]
+    before = sum(len(mesh.get("primitives", [])) for mesh in gltf.get("meshes", []))
+
+    for mesh in gltf.get("meshes", []):
+        groups = {}
+        order = []
+        for primitive in mesh.get("primitives", []):
+            if _mergeable(primitive, accessors):
+                key = _signature(gltf, primitive)
+                if key not in groups:
+                    order.append(key)
+                groups.setdefault(key, []).append(primitive)
+            else:
+                order.append(id(primitive))
+                groups[id(primitive)] = [primitive]
+        mesh["primitives"] = [
+            groups[key][0] if len(groups[key]) == 1 else _concat_primitives(gltf, data, [(p, None) for p in groups[key]])
+            for key in order
+        ]
+
+    scenes = gltf.get("scenes", [])
+    if len(scenes) == 1:
+        _merge_static_nodes(gltf, data, scenes[0])
+
+    after = sum(len(mesh.get("primitives", [])) for mesh in gltf.get("meshes", []))
+    return before - after
+
+def _merge_static_nodes(gltf, data, scene):
+    nodes = gltf.get("nodes", [])
+    parents = _parents(gltf)
+    animated = {c["target"]["node"] for a in gltf.get("animations", []) for c in a.get("channels", []) if "node" in c.get("target", {})}
+    joints = {joint for skin in gltf.get("skins", []) for joint in skin.get("joints", [])}
+    mesh_users = {}
+    for index, node in enumerate(nodes):
+        if "mesh" in node:
+            mesh_users.setdefault(node["mesh"], []).append(index)
+
+    def is_static(index):
+        node = nodes[index]
+        if node.get("skin") is not None or node.get("children") or "camera" in node or "weights" in node or index in joints:
+            return False
+        # インスタンス描画のノードは1つに焼き込むとインスタンスが消える
+        if GPU_INSTANCING in node.get("extensions", {}):
+            return False
+        if len(mesh_users.get(node["mesh"], [])) != 1 or gltf["meshes"][node["mesh"]].get("weights"):
+            return False
+        while True:
+            if index in animated:
+                return False
+            if index not in parents:
+                return True
+            index = parents[index]
+
+    groups = {}
+    for index, node in enumerate(nodes):
+        if "mesh" not in node or not is_static(index):
+            continue
+        matrix = _world_matrix(gltf, index, parents)
+        if np.linalg.det(matrix[:3, :3]) <= 0:
+            # 反転スケールは面の向きが変わるので統合しない
+            continue
+        for primitive in gltf["meshes"][node["mesh"]]["primitives"]:
+            if not _mergeable(primitive, data["accessors"]):
+                continue
+            if any(gltf["accessors"][primitive["attributes"][name]]["componentType"] != 5126
+                   for name in ("POSITION", "NORMAL", "TANGENT") if name in primitive["attributes"]):
+                continue
+            groups.setdefault(_signature(gltf, primitive), []).append((index, primitive, matrix))
+
+    merged_primitives = []
+    for members in groups.values():
+        if len({index for index, _, _ in members}) < 2:
+            continue
+        merged_primitives.append(_concat_primitives(gltf, data, [(primitive, matrix) for _, primitive, matrix in members]))
+        for index, primitive, _ in members:
+            mesh = gltf["meshes"][nodes[index]["mesh"]]
+            mesh["primitives"] = [p for p in mesh["primitives"] if p is not primitive]
+
+    if not merged_primitives:
+        return
+    for node in nodes:
+        if "mesh" in node and not gltf["meshes"][node["mesh"]]["primitives"]:
+            del node["mesh"]
+    gltf["meshes"].append({"name": "MergedStatic", "primitives": merged_primitives})
+    nodes.append({"name": "MergedStatic", "mesh": len(gltf["meshes"]) - 1})
+    scene.setdefault("nodes", []).append(len(nodes) - 1)
+
+# ---------------------------------------------------------------------------
+# 量子化
+# ---------------------------------------------------------------------------
+
+def _accessor_uses(gltf):
+    """アクセサー番号 → 使われ方（属性名や "indices" など）の集合"""
+    uses = {}
+    for mesh_index, mesh in enumerate(gltf.get("meshes", [])):
+        for primitive in mesh.get("primitives", []):
+            draco = "KHR_draco_mesh_compression" in primitive.get("extensions", {})
+            for name, index in primitive.get("attributes", {}).items():
+                uses.setdefault(index, set()).add(("draco" if draco else name, mesh_index))
+            if "indices" in primitive:
+                uses.setdefault(primitive["indices"], set()).add(("indices", mesh_index))
+            for target in primitive.get("targets", []):
+                for name, index in target.items():
+                    uses.setdefault(index, set()).add(("target", mesh_index))
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            uses.setdefault(skin["inverseBindMatrices"], set()).add(("skin", None))
+    for animation in gltf.get("animations", []):
+        for sampler in animation.get("samplers", []):
+            for key in ("input", "output"):
+                uses.setdefault(sampler[key], set()).add(("animation", None))
+    for attributes in _instancing_attributes(gltf):
+        for index in attributes.values():
+            uses.setdefault(index, set()).add(("instancing", None))
+    return uses
+
+def _quantize_accessor(gltf, data, index, component_type, values, normalized=True):
+    accessor = gltf["accessors"][index]
+    accessor["componentType"] = component_type
+    accessor["normalized"] = normalized
+    accessor.pop("min", None)
+    accessor.pop("max", None)
+    data["accessors"][index] = values.astype(DTYPES[component_type])
+
+def quantize(gltf, data):
+    """
+    頂点属性を量子化し、量子化したアクセサー数を返す
+
+    - NORMAL / TANGENT: int8 正規化
+    - TEXCOORD_n: 0-1に収まっていれば uint16 正規化
+    - POSITION: スキン・モーフのないメッシュだけ uint16 正規化にし、
+      メッシュを子ノードに移して translation/scale（等倍）で元の座標に戻す
+    """
+    accessors = data["accessors"]
+    uses = _accessor_uses(gltf)
+    count = 0
+    needs_extension = False
+
+    def sole_use(index, name):
+        names = {use for use, _ in uses.get(index, set())}
+        return names == {name} and accessors[index] is not None and gltf["accessors"][index]["componentType"] == 5126
+
+    for index in range(len(gltf.get("accessors", []))):
+        names = {use for use, _ in uses.get(index, set())}
+        if len(names) != 1:
+            continue
+        name = next(iter(names))
+        if name in ("NORMAL", "TANGENT") and sole_use(index, name):
+            values = np.round(np.clip(accessors[index], -1.0, 1.0) * 127.0)
+            _quantize_accessor(gltf, data, index, 5120, values)
+            needs_extension = True
+            count += 1
+        elif name.startswith("TEXCOORD_") and sole_use(index, name):
+            array = accessors[index]
+            if array.size and array.min() >= 0.0 and array.max() <= 1.0:
+                _quantize_accessor(gltf, data, index, 5123, np.round(array * 65535.0))
+                count += 1
+
+    skinned_meshes = {node["mesh"] for node in gltf.get("nodes", []) if "mesh" in node and "skin" in node}
+    # 子ノードへ移すとインスタンス描画の拡張がメッシュから外れる
+    instanced_meshes = {node["mesh"] for node in gltf.get("nodes", [])
+                        if "mesh" in node and GPU_INSTANCING in node.get("extensions", {})}
+    for mesh_index, mesh in enumerate(gltf.get("meshes", [])):
+        if mesh_index in skinned_meshes or mesh_index in instanced_meshes or mesh.get("weights"):
+            continue
+        positions = []
+        for primitive in mesh.get("primitives", []):
+            index = primitive.get("attributes", {}).get("POSITION")
+            if primitive.get("targets") or index is None or not sole_use(index, "POSITION") \
+                    or {m for _, m in uses[index]} != {mesh_index}:
+                positions = None
+                break
+            positions.append(index)
+        if not positions:
+            continue
+
+        unique = sorted(set(positions))
+        stacked = np.concatenate([accessors[i] for i in unique]).astype(np.float64)
+        offset = stacked.min(axis=0)
+        # 法線が歪まないよう3軸共通の倍率にする
+        scale = float((stacked.max(axis=0) - offset).max()) or 1.0
+        for index in unique:
+            values = np.round((accessors[index] - offset) / scale * 65535.0)
+            _quantize_accessor(gltf, data, index, 5123, values)
+            _set_bounds(gltf["accessors"][index], data["accessors"][index])
+            count += 1
+        _wrap_mesh_nodes(gltf, mesh_index, offset.tolist(), scale)
+        needs_extension = True
+
+    if needs_extension:
+        for key in ("extensionsUsed", "extensionsRequired"):
+            extensions = gltf.setdefault(key, [])
+            if "KHR_mesh_quantization" not in extensions:
+                extensions.append("KHR_mesh_quantization")
+    return count
+
+def _wrap_mesh_nodes(gltf, mesh_index, translation, scale):
+    """メッシュを使うノードごとに、量子化を戻す変換を持つ子ノードを作ってメッシュを移す"""
+    nodes = gltf["nodes"]
+    for node in list(nodes):
+        if node.get("mesh") != mesh_index:
+            continue
+        del node["mesh"]
+        nodes.append({
+            "name": f"{node.get('name', 'node')}_quantized",
+            "mesh": mesh_index,
+            "translation": translation,
+            "scale": [scale, scale, scale],
+        })
+        node.setdefault("children", []).append(len(nodes) - 1)
+
+# ---------------------------------------------------------------------------
+# 実行
+# ---------------------------------------------------------------------------
+
+def estimate_parse_ms(glb_bytes):
+    """
+    ブラウザでの読み込み時間の目安(ms)
+    JSONの解析 + バッファ転送 + Dracoデコード + 画像デコードを速度の目安で足し合わせる
+    """
+    gltf, binary = read_chunks(glb_bytes)
+    json_bytes = struct.unpack_from("<I", glb_bytes, 12)[0]
+    stats = inspect_gltf(gltf, binary)
+    draco_bytes = sum(
+        accessor_bytes(gltf["accessors"][index])
+        for mesh in gltf.get("meshes", [])
+        for primitive in mesh.get("primitives", [])
+        if "KHR_draco_mesh_compression" in primitive.get("extensions", {})
+        for index in list(primitive.get("attributes", {}).values()) + ([primitive["indices"]] if "indices" in primitive else [])
+    )
+    pixels = sum((t["width"] or 0) * (t["height"] or 0) for t in stats["textures"])
+    binary_bytes = len(binary) if binary is not None else 0
+    if binary is not None:
+        binary.release()
+    return (
+        json_bytes / JSON_BYTES_PER_MS
+        + binary_bytes / BIN_BYTES_PER_MS
+        + draco_bytes / DRACO_BYTES_PER_MS
+        + pixels / PIXELS_PER_MS
+    )
+
+def optimize_bytes(glb_bytes, merge=True, quantize_attributes=True):
+    """
+    GLBのバイト列を最適化する
+
+    Returns:
+        (最適化後のバイト列, 実施内容のレポート辞書)
+    """
+    gltf, binary = read_chunks(glb_bytes)
+    try:
+        data = unpack(gltf, binary)
+    finally:
+        if binary is not None:
+            binary.release()
+
+    report = {"pruned": prune(gltf, data), "deduplicated": dedupe(gltf, data)}
+    if merge:
+        report["merged_primitives"] = merge_meshes(gltf, data)
+        # 統合で使われなくなった元のアクセサー等を削除
+        for kind, count in prune(gltf, data).items():
+            report["pruned"][kind] = report["pruned"].get(kind, 0) + count
+    if quantize_attributes:
+        report["quantized_accessors"] = quantize(gltf, data)
+        for kind, count in dedupe(gltf, data).items():
+            report["deduplicated"][kind] = report["deduplicated"].get(kind, 0) + count
+    return pack(gltf, data), report
+
+def optimize_glb(input_path, output_path=None, merge=True, quantize_attributes=True):
+    """
+    GLBファイルを最適化して書き出す（output_path省略時はその場で置き換え）
+
+    Returns:
+        前後のサイズ・読み込み時間の目安・実施内容を含むレポート（辞書）
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path else input_path
+    original = input_path.read_bytes()
+    optimized, report = optimize_bytes(original, merge, quantize_attributes)
+
+    report.update({
+        "file": str(output_path),
+        "before_bytes": len(original),
+        "after_bytes": len(optimized),
+        "before_parse_ms": estimate_parse_ms(original),
+        "after_parse_ms": estimate_parse_ms(optimized),
+    })
+
+    if output_path != input_path or optimized != original:
+        temp_path = output_path.with_name(output_path.name + ".tmp")
+        temp_path.write_bytes(optimized)
+        os.replace(temp_path, output_path)
+    return report
+
+def format_report(report):
+    """1ファイル分の結果を数行の文字列にする"""
+    before, after = report["before_bytes"], report["after_bytes"]
+    change = (after - before) / before * 100 if before else 0.0
+    lines = [
+        f"🗜️  {Path(report['file']).name}: {before / (1024 * 1024):.2f}MB → {after / (1024 * 1024):.2f}MB ({change:+.1f}%)"
+        f" / 読み込み目安 {report['before_parse_ms']:.0f}ms → {report['after_parse_ms']:.0f}ms"
+    ]
+    details = []
+    if report["pruned"]:
+        details.append("削除 " + ", ".join(f"{kind} {count}" for kind, count in report["pruned"].items()))
+    if report["deduplicated"]:
+        details.append("重複統合 " + ", ".join(f"{kind} {count}" for kind, count in report["deduplicated"].items()))
+    if report.get("merged_primitives"):
+        details.append(f"プリミティブ統合 -{report['merged_primitives']}")
+    if report.get("quantized_accessors"):
+        details.append(f"量子化 {report['quantized_accessors']}アクセサー")
+    if details:
+        lines.append("   " + " / ".join(details))
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    merge = "--no-merge" not in args
+    quantize_attributes = "--no-quantize" not in args
+    output = None
+    if "-o" in args:
+        index = args.index("-o")
+        output = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    files = [arg for arg in args if not arg.startswith("--")]
+
+    if not files or (output and len(files) > 1):
+        print(__doc__)
+        sys.exit(1)
+
+    failed = False
+    for file in files:
+        try:
+            report = optimize_glb(file, output, merge, quantize_attributes)
+        except UnsupportedGLB as e:
+            print(f"⏭️  {file}: {e}（そのまま残します）")
+            continue
+        except (OSError, ValueError) as e:
+            print(f"❌ {file}: {e}")
+            failed = True
+            continue
+        print(format_report(report))
+    sys.exit(1 if failed else 0)
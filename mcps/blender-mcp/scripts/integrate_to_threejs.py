@@ -6,11 +6,44 @@ Blender → Three.js 自動統合スクリプト
 
 import os
 import sys
-import shutil
 import json
 from pathlib import Path
 from datetime import datetime
 
+from glb_inspect import load_stats
+from publish import publish_file, publish_hashed, write_precompressed, PUBLISH_LABELS, ASSET_MANIFEST_NAME
+
+def describe_model(glb_file):
+    """セレクタに表示するモデルの概要（サイズ・三角形数・テクスチャ・アニメーション）"""
+    file_path = Path(glb_file)
+    file_size = file_path.stat().st_size / (1024 * 1024)  # MB
+    try:
+        stats = load_stats(file_path)
+    except (OSError, ValueError):
+        return f"{file_size:.1f}MB"
+    details = [f"{file_size:.1f}MB", f"{stats['triangles']:,} tris", f"{stats['texture_count']} tex"]
+    if stats['animations']:
+        longest = max(animation['duration_ms'] for animation in stats['animations'])
+        details.append(f"🎬 {longest / 1000:.1f}s")
+    return ", ".join(details)
+
+def precompress(paths, aliases=None):
+    """
+    公開したファイルの .br / .gz を作り、縮んだ分を表示
+
+    aliases: {パス: 同じ内容で先に圧縮するパス}（ハッシュ付きの名前はそちらの圧縮結果を使い回す）
+    """
+    aliases = aliases or {}
+    print(f"🗜️  圧縮済みファイルを作成中...")
+    for path in paths:
+        variants = write_precompressed(path, same_as=aliases.get(path))
+        if not variants:
+            print(f"   ⏭️  {Path(path).name}: 圧縮効果が小さいためスキップ")
+            continue
+        original = Path(path).stat().st_size
+        sizes = ", ".join(f"{encoding} {size / original:.0%}" for encoding, size in variants.items())
+        print(f"   ✅ {Path(path).name}: {sizes}")
+
 def create_project_viewer(project_name, glb_files):
     """プロジェクト専用ビューワーを作成"""
     
@@ -18,8 +51,7 @@ def create_project_viewer(project_name, glb_files):
     model_options = []
     for i, glb_file in enumerate(glb_files):
         file_path = Path(glb_file)
-        file_size = file_path.stat().st_size / (1024 * 1024)  # MB
-        model_options.append(f'<option value="{file_path.name}">{file_path.stem} ({file_size:.1f}MB)</option>')
+        model_options.append(f'<option value="{file_path.name}">{file_path.stem} ({describe_model(file_path)})</option>')
     
     options_html = '\n                '.join(model_options)
     
@@ -193,6 +225,19 @@ def create_project_viewer(project_name, glb_files):
             updateStatus('Scene initialized', 'success');
         }}
 
+        // 論理名 → ハッシュ付きファイル名（ハッシュ付きはブラウザに長期キャッシュされる）
+        let assetManifest = {{}};
+        async function loadAssetManifest() {{
+            try {{
+                const response = await fetch('../blender-assets/{ASSET_MANIFEST_NAME}', {{ cache: 'no-cache' }});
+                if (response.ok) {{
+                    assetManifest = await response.json();
+                }}
+            }} catch (error) {{
+                console.warn('Asset manifest unavailable, using plain names:', error);
+            }}
+        }}
+
         function loadModel(modelName) {{
             // Remove current model
             if (currentModel) {{
@@ -204,7 +249,7 @@ def create_project_viewer(project_name, glb_files):
             updateStatus(`Loading ${{modelName}}...`, 'warning');
 
             const loader = new GLTFLoader();
-            const modelPath = `../blender-assets/${{modelName}}`;
+            const modelPath = `../blender-assets/${{assetManifest[modelName] || modelName}}`;
 
             loader.load(modelPath, 
                 (gltf) => {{
@@ -292,7 +337,7 @@ def create_project_viewer(project_name, glb_files):
         initScene();
         
         // Load default model
-        loadModel(modelSelector.value);
+        loadAssetManifest().then(() => loadModel(modelSelector.value));
         
         // Start animation loop
         animate();
@@ -349,15 +394,23 @@ def integrate_to_threejs(project_name):
     # blender-assetsディレクトリを作成
     blender_assets_dir.mkdir(parents=True, exist_ok=True)
     
-    # GLBファイルをコピー
-    print(f"📋 GLBファイルをコピー中...")
+    # GLBファイルを配置（同じファイルシステムならリンク、違えばコピー、同じ内容ならスキップ）
+    print(f"📋 GLBファイルを配置中...")
     copied_files = []
+    published_files = []
+    aliases = {}
     
     for glb_file in glb_files:
+        # 従来の名前（既存ビューワー用）とハッシュ付きの名前（長期キャッシュ用）の両方で公開
         target_path = blender_assets_dir / glb_file.name
-        shutil.copy2(glb_file, target_path)
+        method = publish_file(glb_file, target_path)
         copied_files.append(target_path)
-        print(f"   ✅ {glb_file.name} → {target_path}")
+        print(f"   {PUBLISH_LABELS[method]}: {glb_file.name} → {target_path}")
+        hashed, method = publish_hashed(glb_file, blender_assets_dir)
+        print(f"   {PUBLISH_LABELS[method]}: {glb_file.name} → {hashed}")
+        published_files += [target_path, blender_assets_dir / hashed]
+        aliases[blender_assets_dir / hashed] = target_path
+    print(f"   🗂️  アセットマニフェスト: {blender_assets_dir / ASSET_MANIFEST_NAME}")
     
     # プロジェクト専用ビューワーを作成
     project_viewer_dir = threejs_projects_dir / f"blender-{project_name}"
@@ -370,6 +423,7 @@ def integrate_to_threejs(project_name):
         f.write(viewer_html)
     
     print(f"📄 プロジェクトビューワー作成: {viewer_path}")
+    published_files += [viewer_path, blender_assets_dir / ASSET_MANIFEST_NAME]
     
     # メインのblender-unicornビューワーを更新（既存の統合ビューワー）
     main_viewer_path = threejs_projects_dir / "blender-unicorn" / "index.html"
@@ -383,8 +437,7 @@ def integrate_to_threejs(project_name):
             
             # 新しいオプションを追加
             for glb_file in copied_files:
-                file_size = glb_file.stat().st_size / (1024 * 1024)
-                option_line = f'                <option value="{glb_file.name}">{project_name} - {glb_file.stem} ({file_size:.1f}MB)</option>'
+                option_line = f'                <option value="{glb_file.name}">{project_name} - {glb_file.stem} ({describe_model(glb_file)})</option>'
                 
                 # セレクタの最後に追加
                 if option_line not in content:
@@ -396,10 +449,14 @@ def integrate_to_threejs(project_name):
                 f.write(content)
             
             print(f"   ✅ メインビューワー更新完了")
+            published_files.append(main_viewer_path)
             
         except Exception as e:
             print(f"   ⚠️  メインビューワー更新でエラー: {e}")
     
+    # Accept-Encoding に応じて static_server.py が返す圧縮版
+    precompress(published_files, aliases)
+    
     # サーバー設定を更新
     server_script_path = threejs_dir / "start_integrated_server.py"
     if server_script_path.exists():
@@ -408,15 +465,15 @@ def integrate_to_threejs(project_name):
                 server_content = f.read()
             
             # 新しいプロジェクトのURLを追加
-            project_url_line = f'        print(f"  🎨 {project_name}: http://localhost:{{PORT}}/projects/blender-{project_name}/")'
+            project_url_line = f'            ("🎨 {project_name}", \'/projects/blender-{project_name}/\'),'
             
             if project_url_line not in server_content:
-                # Available Projects:の後に追加
-                projects_line = '        print("🎯 Available Projects:")'
+                # Available Projects（links=[ の一覧）の先頭に追加
+                projects_line = '        links=['
                 if projects_line in server_content:
                     insert_pos = server_content.find(projects_line) + len(projects_line)
-                    next_line_pos = server_content.find('\\n', insert_pos) + 1
-                    server_content = server_content[:next_line_pos] + project_url_line + '\\n' + server_content[next_line_pos:]
+                    next_line_pos = server_content.find('\n', insert_pos) + 1
+                    server_content = server_content[:next_line_pos] + project_url_line + '\n' + server_content[next_line_pos:]
                     
                     with open(server_script_path, 'w', encoding='utf-8') as f:
                         f.write(server_content)
@@ -508,6 +565,8 @@ if __name__ == "__main__":
                 print("   2. 先にエクスポートを実行")
                 print(f"      python3 export_project.py {project_name}")
                 print("   3. Three.jsディレクトリが存在することを確認")
+            
+            sys.exit(0 if success else 1)
     else:
         print("使用方法:")
         print("  統合: python3 integrate_to_threejs.py <プロジェクト名>")
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+常駐型の MCP stdio クライアント
+MCPサーバー（Three.js MCP の node build/main.js など）を1つ起動したままにして、
+initialize は最初の1回だけ行い、以降の tools/call を id で振り分けて同じプロセスに流す
+
+- リクエストごとのタイムアウト
+- サーバープロセスが落ちていたら次のリクエストで自動的に起動し直す
+- 複数スレッドから同時に呼んでもよい（応答は id で対応付ける）
+- call_tools: 複数の tools/call を応答を待たずに続けて送る（パイプライン）
+
+使用方法:
+  python3 mcp_client.py [--server build/main.js] [ツール名 [引数JSON]]
+  （ツール名を省略するとツール一覧を表示）
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import subprocess
+import collections
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+THREEJS_MCP_SERVER = "/Users/nukuiyuki/Dev/mcp-tools/Threejs/build/main.js"
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "blender-mcp-bridge", "version": "1.0.0"}
+
+DEFAULT_TIMEOUT = 30
+STARTUP_TIMEOUT = 15
+# 診断用に残すサーバーの stderr の行数
+STDERR_LINES = 50
+
+class MCPError(RuntimeError):
+    """JSON-RPC のエラー応答、またはサーバープロセスの異常終了"""
+
+    def __init__(self, message, code=None, data=None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+class MCPTimeout(MCPError, TimeoutError):
+    """応答がタイムアウト内に返ってこなかった"""
+
+class MCPStdioClient:
+    """1つのMCPサーバープロセスに対する常駐クライアント"""
+
+    def __init__(self, command, cwd=None, env=None, timeout=DEFAULT_TIMEOUT):
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.server_info = None
+        self.restarts = 0
+        self._process = None
+        self._ready = False
+        self._pending = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stderr = collections.deque(maxlen=STDERR_LINES)
+
+    # ------------------------------------------------------------------
+    # プロセス管理
+    # ------------------------------------------------------------------
+
+    @property
+    def alive(self):
+        process = self._process
+        return process is not None and process.poll() is None
+
+    def start(self):
+        """サーバーを起動して initialize する（既に動いていれば何もしない）"""
+        with self._start_lock:
+            if self._ready and self.alive:
+                return
+            with self._lock:
+                old_process = self._process
+                if old_process is not None:
+                    self.restarts += 1
+                stale, self._pending = self._pending, {}
+                self._ready = False
+                try:
+                    self._process = subprocess.Popen(
+                        self.command,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        cwd=self.cwd,
+                        env=self.env,
+                    )
+                    launch_error = None
+                except OSError as e:
+                    # node が見つからない・cwd がないなど
+                    self._process = None
+                    launch_error = MCPError(f"MCPサーバーを起動できませんでした（{self.command[0]}）: {e}")
+                process = self._process
+            if old_process is not None and old_process.poll() is None:
+                old_process.kill()
+            for future in stale.values():
+                if not future.done():
+                    future.set_exception(launch_error or MCPError("MCPサーバーを起動し直しました"))
+            if launch_error is not None:
+                raise launch_error
+            threading.Thread(target=self._read_stdout, args=(process,), daemon=True).start()
+            threading.Thread(target=self._read_stderr, args=(process,), daemon=True).start()
+
+            try:
+                result = self._request("initialize", {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {},
+                    "clientInfo": CLIENT_INFO,
+                }, STARTUP_TIMEOUT)
+                self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+            except MCPError:
+                process.kill()
+                raise
+            self.server_info = result.get("serverInfo")
+            self._ready = True
+
+    def close(self, timeout=5):
+        """stdin を閉じて終了を待ち、終わらなければ kill する"""
+        with self._lock:
+            process, self._process = self._process, None
+            self._ready = False
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        self._fail_pending(MCPError("MCPクライアントを終了しました"))
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def stderr_tail(self):
+        """サーバーの stderr の最後の数行"""
+        return "\n".join(self._stderr)
+
+    def _read_stdout(self, process):
+        try:
+            for line in process.stdout:
+                self._handle_line(line)
+        except Exception as e:
+            # 読み込みスレッドが止まると応答を受け取れないので、プロセスごと捨てる（次のリクエストで起動し直す）
+            process.kill()
+            process.wait()
+            self._fail_pending(MCPError(f"MCPサーバーの応答を読めませんでした: {e!r}"), process)
+            return
+        # stdout が閉じた = プロセスが終了した
+        process.wait()
+        detail = self.stderr_tail()
+        self._fail_pending(MCPError(f"MCPサーバーが終了しました（code {process.returncode}）\n{detail}".rstrip()),
+                           process)
+
+    def _handle_line(self, line):
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            message = None
+        if not isinstance(message, dict):
+            # stdout にログを出すサーバー向け（数字だけの行なども JSON としては読めてしまう）
+            self._stderr.append(line.decode("utf-8", "replace").rstrip())
+            return
+        if "method" in message:
+            self._handle_server_message(message)
+            return
+        with self._lock:
+            future = self._pending.pop(message.get("id"), None)
+        if future is None:
+            # タイムアウト済みのリクエストへの遅れた応答
+            return
+        if "error" in message:
+            error = message["error"]
+            if not isinstance(error, dict):
+                error = {"message": str(error)}
+            future.set_exception(MCPError(error.get("message", "MCP error"), error.get("code"), error.get("data")))
+        else:
+            future.set_result(message.get("result", {}))
+
+    def _read_stderr(self, process):
+        for line in process.stderr:
+            self._stderr.append(line.decode("utf-8", "replace").rstrip())
+
+    def _handle_server_message(self, message):
+        """サーバーからのリクエスト・通知（ping にだけ応答する）"""
+        if message.get("method") == "ping" and "id" in message:
+            self._send({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+
+    def _fail_pending(self, error, process=None):
+        with self._lock:
+            # 既に新しいプロセスに切り替わっていれば、そちらのリクエストは残す
+            if process is not None and process is not self._process:
+                return
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+
+    def _send(self, message):
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._write_lock:
+            process = self._process
+            if process is None or process.poll() is not None:
+                raise MCPError("MCPサーバーが起動していません")
+            try:
+                process.stdin.write(data)
+                process.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                raise MCPError(f"MCPサーバーへの送信に失敗しました: {e}") from e
+
+    def submit(self, method, params=None):
+        """
+        リクエストを送って応答を待たずに Future を返す（パイプライン用）
+
+        Returns:
+            (id, Future)
+        """
+        if not (self._ready and self.alive):
+            self.start()
+        return self._submit(method, params)
+
+    def _submit(self, method, params):
+        future = Future()
+        with self._lock:
+            request_id = self._next_id
+            self._next_id += 1
+            self._pending[request_id] = future
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        try:
+            self._send(message)
+        except MCPError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id, future
+
+    def wait(self, request_id, future, timeout=None):
+        """submit の応答を待つ（タイムアウトしたら MCPTimeout）"""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise MCPTimeout(f"MCPサーバーが {timeout:.1f} 秒以内に応答しませんでした（id {request_id}）") from None
+
+    def _request(self, method, params, timeout):
+        request_id, future = self._submit(method, params)
+        return self.wait(request_id, future, timeout)
+
+    def request(self, method, params=None, timeout=None):
+        """リクエストを送って結果を返す（サーバーが落ちていれば起動し直す）"""
+        request_id, future = self.submit(method, params)
+        return self.wait(request_id, future, timeout)
+
+    def list_tools(self, timeout=None):
+        return self.request("tools/list", {}, timeout).get("tools", [])
+
+    def call_tool(self, name, arguments=None, timeout=None):
+        """tools/call の結果（content / isError）を返す"""
+        return self.request("tools/call", {"name": name, "arguments": arguments or {}}, timeout)
+
+    def call_tools(self, calls, timeout=None):
+        """
+        複数の tools/call をまとめて送り、全部の応答を待つ
+
+        前の応答を待たずに送るので、N件でもおよそ1往復分の待ち時間で済む。
+        失敗したものがあっても例外は投げず、結果ごとに error を入れる
+
+        Args:
+            calls: [(ツール名, 引数dict), ...]
+            timeout: 最後のリクエストを送ってからの待ち時間（秒）
+
+        Returns:
+            [{"name", "id", "result", "error", "latency_ms"}, ...]（calls と同じ順）
+        """
+        if not (self._ready and self.alive):
+            self.start()
+        timeout = self.timeout if timeout is None else timeout
+
+        entries = []
+        for name, arguments in calls:
+            entry = {"name": name, "id": None, "result": None, "error": None, "latency_ms": None}
+            entries.append(entry)
+            started = time.perf_counter()
+            try:
+                request_id, future = self._submit("tools/call", {"name": name, "arguments": arguments or {}})
+            except MCPError as e:
+                entry["error"] = e
+                continue
+            entry["id"] = request_id
+
+            # 応答を受け取った時点（読み込みスレッド）で計る
+            def finished(_, entry=entry, started=started):
+                entry["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+            future.add_done_callback(finished)
+            entry["future"] = future
+
+        deadline = time.monotonic() + timeout
+        for entry in entries:
+            future = entry.pop("future", None)
+            if future is None:
+                continue
+            try:
+                entry["result"] = self.wait(entry["id"], future, max(0, deadline - time.monotonic()))
+            except MCPError as e:
+                entry["error"] = e
+        return entries
+
+def tool_text(result):
+    """tools/call の結果から text コンテンツを取り出す"""
+    return "\n".join(item.get("text", "") for item in result.get("content", []) if item.get("type") == "text")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+def threejs_client(server_script=THREEJS_MCP_SERVER):
+    """
+    Three.js MCP サーバーの共有クライアント（プロセスごとに1つ、終了時に閉じる）
+    """
+    with _clients_lock:
+        client = _clients.get(server_script)
+        if client is None:
+            client = MCPStdioClient(["node", server_script], cwd=os.path.dirname(os.path.dirname(server_script)))
+            _clients[server_script] = client
+        return client
+
+@atexit.register
+def _close_clients():
+    for client in list(_clients.values()):
+        client.close()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    server_script = THREEJS_MCP_SERVER
+    if "--server" in args:
+        index = args.index("--server")
+        server_script = os.path.abspath(args[index + 1])
+        del args[index:index + 2]
+
+    client = threejs_client(server_script)
+    started = time.perf_counter()
+    client.start()
+    print(f"🔌 接続: {client.server_info}（{(time.perf_counter() - started) * 1000:.0f}ms）")
+
+    if not args:
+        for tool in client.list_tools():
+            print(f"  🔧 {tool['name']}: {tool.get('description', '')}")
+    else:
+        arguments = json.loads(args[1]) if len(args) > 1 else {}
+        started = time.perf_counter()
+        result = client.call_tool(args[0], arguments)
+        print(f"{'❌' if result.get('isError') else '✅'} {args[0]}（{(time.perf_counter() - started) * 1000:.0f}ms）")
+        print(tool_text(result))
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+アセットの配置（コピーせずにリンクで公開）
+exports/ のGLBを assets/ や Three.js の blender-assets/ に置くとき、
+同じファイルシステムならリフリンク（CoW複製）かハードリンク、
+できなければ通常のコピーにフォールバックする。
+配置先が既に同じ内容なら何もしない
+テキスト系のアセットには .gz / .br の圧縮済みファイルも並べて置ける
+（static_server.py が Accept-Encoding を見てそちらを返す）
+"""
+
+import os
+import sys
+import gzip
+import json
+import errno
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Linux の FICLONE ioctl（btrfs / XFS などでリフリンク）
+FICLONE = 0x40049409
+
+# 論理名 → ハッシュ付きファイル名 の対応表（公開先ディレクトリ内）
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+HASH_LENGTH = 12
+
+# Content-Encoding → 圧縮済みファイルの拡張子（優先順）
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+# 圧縮済みファイルを作る対象（GLBはJSONチャンクや頂点データが縮む）
+COMPRESSIBLE_SUFFIXES = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".gltf", ".glb", ".bin", ".wasm"}
+
+# これより縮まなければ作らない（JPEG/PNGのテクスチャばかりのGLBなど）
+MIN_COMPRESSION_SAVING = 0.05
+
+# brotli の品質（11 が最小サイズだが遅い。大きなバイナリは 9 でも大きさがほぼ変わらず何倍も速い）
+BROTLI_QUALITY = 11
+BROTLI_LARGE_QUALITY = 9
+BROTLI_LARGE_BYTES = 1024 * 1024
+
+_asset_manifest_lock = threading.Lock()
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def same_content(source, destination):
+    """同じinode、または同じサイズかつ同じハッシュならTrue"""
+    try:
+        dest_stat = os.stat(destination)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source)
+    if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if source_stat.st_size != dest_stat.st_size:
+        return False
+    return file_sha256(source) == file_sha256(destination)
+
+def _reflink(source, destination):
+    """リフリンクを試す（対応していなければOSError）"""
+    if sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(destination), 0) != 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        return
+    import fcntl
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(destination)
+            raise
+
+def _link_or_copy(source, temp_path):
+    """temp_path にリフリンク → ハードリンク → コピーの順で作り、使った方法を返す"""
+    try:
+        _reflink(source, temp_path)
+        return "reflink"
+    except (OSError, AttributeError):
+        pass
+    try:
+        os.link(source, temp_path)
+        return "hardlink"
+    except OSError as e:
+        # 別ファイルシステム（EXDEV）やリンク非対応ならコピー
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+            raise
+    shutil.copy2(source, temp_path)
+    return "copy"
+
+def publish_file(source, destination):
+    """
+    source を destination に配置
+
+    Returns:
+        "skipped"（既に同じ内容）/ "reflink" / "hardlink" / "copy"
+    """
+    source = Path(source)
+    destination = Path(destination)
+    if same_content(source, destination):
+        return "skipped"
+
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    try:
+        method = _link_or_copy(source, temp_path)
+        # 置き換えは一度に行う（読み込み中のビューワーに途中のファイルを見せない）
+        os.replace(temp_path, destination)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return method
+
+def detach(path):
+    """
+    ハードリンクを切る
+
+    公開先とinodeを共有しているファイルをその場で書き換えると公開先も変わるので、
+    書き換える前に呼ぶ（リンク数が1なら何もしない）
+    """
+    path = Path(path)
+    try:
+        if path.stat().st_nlink > 1:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+PUBLISH_LABELS = {
+    "skipped": "⏭️  同じ内容のためスキップ",
+    "reflink": "🔗 リフリンク",
+    "hardlink": "🔗 ハードリンク",
+    "copy": "📋 コピー",
+}
+
+def _compress(data, encoding, brotli_quality=None):
+    if encoding == "br":
+        if brotli_quality is None:
+            brotli_quality = BROTLI_LARGE_QUALITY if len(data) > BROTLI_LARGE_BYTES else BROTLI_QUALITY
+        return brotli.compress(data, quality=brotli_quality)
+    # mtime=0 で同じ内容なら同じバイト列にする
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def remove_precompressed(path):
+    """path の .gz / .br を削除"""
+    for _, suffix in PRECOMPRESSED:
+        try:
+            os.unlink(f"{path}{suffix}")
+        except FileNotFoundError:
+            pass
+
+def _link_precompressed(source, path):
+    """source の .br / .gz を path の名前でも公開する（同じ内容のファイルを圧縮し直さない）"""
+    source_stat = source.stat()
+    written = {}
+    for encoding, suffix in PRECOMPRESSED:
+        variant = Path(f"{source}{suffix}")
+        target = Path(f"{path}{suffix}")
+        try:
+            variant_stat = variant.stat()
+        except FileNotFoundError:
+            variant_stat = None
+        if variant_stat is None or variant_stat.st_mtime_ns < source_stat.st_mtime_ns:
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+            continue
+        publish_file(variant, target)
+        written[encoding] = variant_stat.st_size
+    return written
+
+def write_precompressed(path, brotli_quality=None, same_as=None):
+    """
+    path の隣に .br / .gz を作る（brotli モジュールがなければ .gz だけ）
+
+    元ファイルより新しい圧縮済みファイルがあればそのまま使い、
+    十分に縮まない形式は作らない（古いものは削除）
+
+    Args:
+        brotli_quality: 省略時は BROTLI_QUALITY（BROTLI_LARGE_BYTES を超えるものは BROTLI_LARGE_QUALITY）
+        same_as: 先に圧縮済みの、path と同じ内容のファイル（その .br / .gz をリンク・コピーする）
+
+    Returns:
+        作成・維持した {Content-Encoding: 圧縮後のバイト数}
+    """
+    path = Path(path)
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return {}
+    if same_as is not None and same_content(same_as, path):
+        return _link_precompressed(Path(same_as), path)
+    source_stat = path.stat()
+    data = None
+    written = {}
+    for encoding, suffix in PRECOMPRESSED:
+        target = Path(f"{path}{suffix}")
+        if encoding == "br" and brotli is None:
+            continue
+        try:
+            target_stat = target.stat()
+            if target_stat.st_mtime_ns >= source_stat.st_mtime_ns:
+                written[encoding] = target_stat.st_size
+                continue
+        except FileNotFoundError:
+            pass
+
+        if data is None:
+            data = path.read_bytes()
+        compressed = _compress(data, encoding, brotli_quality)
+        if len(compressed) > len(data) * (1 - MIN_COMPRESSION_SAVING):
+            try:
+                target.unlink()
+            except FileNotFoundError:
+                pass
+            continue
+        temp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(compressed)
+        os.replace(temp_path, target)
+        written[encoding] = len(compressed)
+    return written
+
+def hashed_name(path, digest=None):
+    """内容のハッシュを入れたファイル名（unicorn.glb → unicorn.3f2a9c1b7d4e.glb）"""
+    path = Path(path)
+    digest = digest or file_sha256(path)
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+def load_asset_manifest(assets_dir):
+    try:
+        with open(Path(assets_dir) / ASSET_MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def publish_hashed(source, assets_dir, logical_name=None):
+    """
+    source をハッシュ付きの名前で assets_dir に配置し、アセットマニフェストを更新する
+
+    名前が内容で決まるので、ブラウザに無期限キャッシュ（immutable）させられる。
+    同じ論理名の古いハッシュ付きファイルは削除する
+
+    Returns:
+        (ハッシュ付きファイル名, 配置方法)
+    """
+    source = Path(source)
+    assets_dir = Path(assets_dir)
+    logical_name = logical_name or source.name
+    name = hashed_name(source)
+    method = publish_file(source, assets_dir / name)
+
+    with _asset_manifest_lock:
+        manifest = load_asset_manifest(assets_dir)
+        previous = manifest.get(logical_name)
+        manifest[logical_name] = name
+        manifest_path = assets_dir / ASSET_MANIFEST_NAME
+        temp_path = manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temp_path, manifest_path)
+
+        if previous and previous != name and previous not in manifest.values():
+            try:
+                (assets_dir / previous).unlink()
+            except FileNotFoundError:
+                pass
+            remove_precompressed(assets_dir / previous)
+    return name, method
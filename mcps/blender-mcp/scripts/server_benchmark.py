@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+静的ファイルサーバーの負荷テスト
+従来の socketserver.TCPServer・static_server.py（スレッド）・async_static_server.py（asyncio）を
+同じディレクトリ・同じ同時接続数で叩き、リクエスト/秒とレイテンシ（p50 / p99）を比べる
+
+各サーバーは別プロセスで起動し、クライアントも複数プロセスに分けて動かす
+（クライアント側のGILが計測を頭打ちにしないように）
+
+使用方法:
+  python3 server_benchmark.py [--root ディレクトリ] [--clients 50] [--duration 10]
+                              [--path /projects/blender-unicorn/ ...] [--servers tcpserver,threaded,async]
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import asyncio
+import subprocess
+import multiprocessing
+from pathlib import Path
+
+SERVERS = ("tcpserver", "threaded", "async")
+SERVER_LABELS = {
+    "tcpserver": "TCPServer (legacy)",
+    "threaded": "ThreadingHTTPServer",
+    "async": "asyncio",
+}
+
+DEFAULT_CLIENTS = 50
+DEFAULT_DURATION = 10
+REQUEST_TIMEOUT = 30
+
+def run_server(kind, root, port):
+    """ベンチマーク対象のサーバーを起動（--serve で呼ばれる子プロセス側）"""
+    if kind == "tcpserver":
+        # start_integrated_server.py がもともと使っていた構成（シングルスレッド・HTTP/1.0）
+        import socketserver
+        from functools import partial
+        from http.server import SimpleHTTPRequestHandler
+
+        class QuietHandler(SimpleHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        socketserver.TCPServer.allow_reuse_address = True
+        with socketserver.TCPServer(("127.0.0.1", port), partial(QuietHandler, directory=root)) as httpd:
+            httpd.serve_forever()
+    elif kind == "threaded":
+        from static_server import make_server, StaticRequestHandler
+        StaticRequestHandler.log_message = lambda self, format, *args: None
+        with make_server(root, port, host="127.0.0.1") as httpd:
+            httpd.serve_forever()
+    elif kind == "async":
+        from async_static_server import AsyncStaticServer
+
+        async def main():
+            server = AsyncStaticServer(root, quiet=True)
+            await server.start("127.0.0.1", port)
+            await asyncio.Event().wait()
+
+        asyncio.run(main())
+    else:
+        raise ValueError(f"unknown server: {kind}")
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for_port(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+async def fetch(port, path, connection):
+    """
+    1リクエスト送って本文まで読む（keep-alive できれば接続を使い回す）
+
+    Returns:
+        (ステータス, 次に使う接続 か None)
+    """
+    if connection is None:
+        connection = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = connection
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nAccept-Encoding: identity\r\n\r\n".encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("iso-8859-1").split("\r\n")
+    version, status = lines[0].split()[:2]
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining:
+            chunk = await reader.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise ConnectionError("connection closed mid-body")
+            remaining -= len(chunk)
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    else:
+        while await reader.read(1024 * 1024):
+            pass
+        keep_alive = False
+
+    if not keep_alive:
+        writer.close()
+        return int(status), None
+    return int(status), connection
+
+async def client_loop(port, paths, deadline, offset, latencies, errors):
+    connection = None
+    index = offset
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            status, connection = await asyncio.wait_for(fetch(port, path, connection), REQUEST_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+            errors.append(path)
+            connection = None
+            continue
+        if status >= 400:
+            errors.append(path)
+        else:
+            latencies.append(time.perf_counter() - started)
+    if connection:
+        connection[1].close()
+
+def client_worker(port, paths, clients, duration, first_client):
+    """クライアントプロセス: clients 本の接続で duration 秒リクエストし続ける"""
+    latencies = []
+    errors = []
+
+    async def main():
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(client_loop(port, paths, deadline, first_client + i, latencies, errors)
+                               for i in range(clients)))
+
+    asyncio.run(main())
+    return latencies, len(errors)
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def benchmark(kind, root, paths, clients=DEFAULT_CLIENTS, duration=DEFAULT_DURATION, processes=None):
+    """
+    1種類のサーバーを起動して負荷をかける
+
+    Returns:
+        {"server", "requests", "errors", "requests_per_sec", "p50_ms", "p99_ms"}
+    """
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, __file__, "--serve", kind, str(root), str(port)],
+        cwd=Path(__file__).resolve().parent,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError(f"{kind} サーバーが起動しませんでした")
+        processes = max(1, min(processes or os.cpu_count() or 1, clients))
+        shares = [clients // processes + (1 if i < clients % processes else 0) for i in range(processes)]
+        starts = [sum(shares[:i]) for i in range(processes)]
+        started = time.monotonic()
+        with multiprocessing.Pool(processes) as pool:
+            results = pool.starmap(client_worker, [(port, paths, share, duration, start)
+                                                   for share, start in zip(shares, starts)])
+        elapsed = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for result, _ in results for latency in result)
+    errors = sum(error_count for _, error_count in results)
+    return {
+        "server": kind,
+        "requests": len(latencies),
+        "errors": errors,
+        # 失敗したリクエストは件数・req/s・レイテンシのどれにも入れない（速く失敗すると数字が良く見える）
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+def default_paths(root):
+    """ルートの index.html と一番大きなGLB（あるものだけ）"""
+    root = Path(root)
+    # index.html がなければ "/" はディレクトリ一覧か 404 になり、静的ファイルの計測にならない
+    paths = ["/"] if (root / "index.html").is_file() else []
+    glbs = sorted(root.rglob("*.glb"), key=lambda p: p.stat().st_size, reverse=True)
+    if glbs:
+        paths.append("/" + glbs[0].relative_to(root).as_posix())
+    return paths
+
+def print_results(results, clients, paths):
+    print()
+    print(f"📊 同時接続 {clients} ・ パス: {', '.join(paths)}")
+    print(f"{'server':<22}{'req/s':>10}{'p50(ms)':>10}{'p99(ms)':>10}{'errors':>8}")
+    print("-" * 60)
+    for result in results:
+        label = SERVER_LABELS[result["server"]]
+        print(f"{label:<22}{result['requests_per_sec']:>10.1f}{result['p50_ms']:>10.1f}"
+              f"{result['p99_ms']:>10.1f}{result['errors']:>8}")
+
+def option(args, name, default):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args[:1] == ["--serve"]:
+        run_server(args[1], args[2], int(args[3]))
+        sys.exit(0)
+
+    root = os.path.abspath(option(args, "--root", os.getcwd()))
+    clients = int(option(args, "--clients", DEFAULT_CLIENTS))
+    duration = float(option(args, "--duration", DEFAULT_DURATION))
+    servers = option(args, "--servers", ",".join(SERVERS)).split(",")
+    paths = [args[i + 1] for i, arg in enumerate(args) if arg == "--path"] or default_paths(root)
+    if not paths:
+        print(f"❌ {root} に index.html もGLBもありません（--path で指定してください）")
+        sys.exit(1)
+
+    print("🏁 静的ファイルサーバー負荷テスト")
+    print(f"📁 {root}")
+    results = []
+    for kind in servers:
+        print(f"⏱️  {SERVER_LABELS[kind]}: {duration:g}秒...")
+        results.append(benchmark(kind, root, paths, clients, duration))
+    print_results(results, clients, paths)
+
+    if "--json" in args:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+開発用静的ファイルサーバー（各 start_*server.py 共通）
+- ThreadingHTTPServer: 大きなGLBのダウンロード中も他のリクエストを並行して返す
+- HTTP/1.1 keep-alive: HTML・importmapのモジュール・GLBを同じ接続で取得
+- sendfile(): ファイル本体はカーネル内で直接ソケットへ転送
+- ハッシュ付きアセット（unicorn.3f2a9c1b7d4e.glb）は Cache-Control: immutable
+- Range（206、ダウンロード再開）、ETag / Last-Modified による 304
+- 圧縮済みの .br / .gz があれば Accept-Encoding に応じてそちらを返す
+- --cache MB: よく使うファイルをメモリに置く（LRU、更新日時が変われば読み直す）
+  ヒット率などは /__stats で確認できる
+
+使用方法:
+  python3 static_server.py [--root ディレクトリ] [--port 番号] [--open パス] [--cache MB]
+"""
+
+import io
+import os
+import re
+import sys
+import time
+import socket
+import datetime
+import threading
+import webbrowser
+import json
+import email.utils
+import urllib.parse
+import collections
+from functools import partial
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from publish import PRECOMPRESSED
+
+# publish.py の hashed_name で作られる名前。内容が変われば名前も変わるので無期限キャッシュできる
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+# 開いたままの接続を閉じるまでの秒数（スレッドが残り続けないように）
+KEEP_ALIVE_TIMEOUT = 30
+
+# "bytes=0-1023" / "bytes=1024-" / "bytes=-500"（複数範囲は全体を返す）
+SINGLE_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# メモリキャッシュの統計を返すパス（キャッシュ有効時のみ）
+STATS_PATH = "/__stats"
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': '*',
+}
+
+CROSS_ORIGIN_ISOLATION_HEADERS = {
+    'Cross-Origin-Embedder-Policy': 'require-corp',
+    'Cross-Origin-Opener-Policy': 'same-origin',
+}
+
+def make_etag(path, stat, encoding=None):
+    """強いETag（ハッシュ付きの名前ならそのハッシュ、それ以外はサイズ＋更新時刻。圧縮版は別のETag）"""
+    match = HASHED_ASSET.search(path)
+    if match:
+        tag = match.group(0).split(".")[1]
+    else:
+        tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    if encoding:
+        tag = f"{tag}-{encoding}"
+    return f'"{tag}"'
+
+def accepted_encodings(header):
+    """Accept-Encoding から受け入れ可能な（q>0の）エンコーディングの集合"""
+    accepted = set()
+    rejected = set()
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        (accepted if q > 0 else rejected).add(name)
+    if "*" in accepted:
+        accepted |= {encoding for encoding, _ in PRECOMPRESSED} - rejected
+    return accepted
+
+def parse_range(header, size):
+    """
+    Rangeヘッダーを (開始, 長さ) にする
+
+    Returns:
+        範囲が使えなければ None（全体を返す）、満たせない範囲なら "unsatisfiable"
+    """
+    match = SINGLE_RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # 末尾 n バイト
+        length = min(int(last), size)
+        if length == 0:
+            return "unsatisfiable"
+        return size - length, length
+    start = int(first)
+    if start >= size:
+        return "unsatisfiable"
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end - start + 1
+
+# 長期キャッシュしてよい応答（エラーを1年キャッシュさせない）
+CACHEABLE_STATUSES = (200, 206, 304)
+
+def cache_control(url_path, status=200):
+    """
+    ハッシュ付きアセットの正常な応答は無期限、それ以外は毎回再検証
+
+    エラーは保存させない（再公開中に一瞬だけ無いハッシュ付きファイルの 404 が残らないように）
+    """
+    if status not in CACHEABLE_STATUSES:
+        return 'no-store'
+    if HASHED_ASSET.search(url_path.split('?', 1)[0]):
+        return 'public, max-age=31536000, immutable'
+    return 'no-cache'
+
+def find_precompressed(path, stat, accept_encoding):
+    """
+    path の圧縮済みファイルを探す
+
+    Returns:
+        (開くパス, Content-Encoding か None, 圧縮済みファイルがあるか)
+    """
+    accepted = accepted_encodings(accept_encoding)
+    available = False
+    for encoding, suffix in PRECOMPRESSED:
+        try:
+            variant_stat = os.stat(path + suffix)
+        except OSError:
+            continue
+        # 元ファイルより古いものは使わない（再エクスポート後の取り残し）
+        if variant_stat.st_mtime_ns < stat.st_mtime_ns:
+            continue
+        available = True
+        if encoding in accepted:
+            return path + suffix, encoding, True
+    return path, None, available
+
+def not_modified(headers, etag, stat):
+    """If-None-Match / If-Modified-Since を満たしていれば True"""
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        modified = datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc).replace(microsecond=0)
+        return modified <= since
+    return False
+
+def range_applies(headers, etag, last_modified):
+    """If-Range があれば、ETagか更新日時が一致する場合だけ範囲リクエストに応じる"""
+    if_range = headers.get("If-Range")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return if_range == last_modified
+
+class CachedFile:
+    """メモリキャッシュから返すファイル本体（send_head が返すファイルの代わり）"""
+
+    def __init__(self, data):
+        self.data = data
+        self.size = len(data)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+class HotFileCache:
+    """
+    ファイル内容を保持するバイト数上限付きのLRUキャッシュ（スレッドセーフ）
+
+    毎回 stat して更新日時・サイズが変わっていれば読み直す。
+    max_file_bytes を超えるファイルはキャッシュせずに通常どおり開く（bypasses に数え、ヒット率には入れない）
+    """
+
+    def __init__(self, max_bytes, max_file_bytes=None):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes or max_bytes // 4
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+        self.bytes_from_cache = 0
+        self.bytes_from_disk = 0
+
+    def open(self, path):
+        """path を CachedFile か通常のファイルオブジェクトとして開く"""
+        cached = self.lookup(path)
+        return cached if cached is not None else self.load(path)
+
+    def lookup(self, path):
+        """キャッシュ済みで最新なら CachedFile、なければ None（ファイルの中身は読まない）"""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stat.st_size > self.max_file_bytes:
+                self.bypasses += 1
+                return None
+            entry = self._entries.get(path)
+            if entry and entry[0] == key:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return CachedFile(entry[1])
+            self.misses += 1
+            return None
+
+    def load(self, path):
+        """lookup で見つからなかった path をディスクから読んでキャッシュする（大きいファイルは開くだけ）"""
+        f = open(path, 'rb')
+        stat = os.fstat(f.fileno())
+        if stat.st_size > self.max_file_bytes:
+            return f
+        with f:
+            data = f.read()
+        self._store(path, (stat.st_mtime_ns, stat.st_size), data)
+        return CachedFile(data)
+
+    def _store(self, path, key, data):
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous:
+                self._size -= len(previous[1])
+            self._entries[path] = (key, data)
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def record(self, nbytes, cached):
+        """実際に送ったバイト数を記録"""
+        with self._lock:
+            if cached:
+                self.bytes_from_cache += nbytes
+            else:
+                self.bytes_from_disk += nbytes
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            served = self.bytes_from_cache + self.bytes_from_disk
+            return {
+                "entries": len(self._entries),
+                "cached_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "max_file_bytes": self.max_file_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bytes_from_cache": self.bytes_from_cache,
+                "bytes_from_disk": self.bytes_from_disk,
+                "byte_hit_ratio": round(self.bytes_from_cache / served, 4) if served else 0.0,
+            }
+
+    def stats_json(self):
+        return json.dumps(self.stats(), indent=2).encode("utf-8")
+
+class StaticRequestHandler(SimpleHTTPRequestHandler):
+    """keep-alive・sendfile・キャッシュヘッダー・Range・条件付きリクエスト対応のハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # 全レスポンスに付けるヘッダー（make_server で差し替える）
+    extra_headers = {}
+    # copyfile で送る範囲（send_head で設定、None なら全体）
+    send_range = None
+    # HotFileCache（make_server の cache_bytes で有効になる）
+    hot_cache = None
+    # send_response で送ったステータス（Cache-Control の判定用）
+    response_status = None
+
+    def send_response(self, code, message=None):
+        self.response_status = int(code)
+        super().send_response(code, message)
+
+    def end_headers(self):
+        self.send_header('Cache-Control', cache_control(self.path, self.response_status))
+        for name, value in self.extra_headers.items():
+            self.send_header(name, value)
+        super().end_headers()
+
+    def copyfile(self, source, outputfile):
+        if isinstance(source, CachedFile):
+            offset, count = self.send_range or (0, source.size)
+            outputfile.write(memoryview(source.data)[offset:offset + count])
+            self.hot_cache.record(count, cached=True)
+            return
+        # ヘッダーは end_headers で送信済みなので、本体はソケットに直接流す
+        offset, count = self.send_range or (0, None)
+        try:
+            sent = self.connection.sendfile(source, offset, count)
+        except (AttributeError, OSError, ValueError):
+            # ファイル以外（ディレクトリ一覧のBytesIO等）は通常のコピー
+            super().copyfile(source, outputfile)
+            return
+        if self.hot_cache:
+            self.hot_cache.record(sent, cached=False)
+
+    def _send_stats(self):
+        body = self.hot_cache.stats_json()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def _resolve_path(self):
+        """
+        リクエストパスを配信するファイルのパスにする
+
+        ディレクトリへのリダイレクトや一覧表示は SimpleHTTPRequestHandler に任せ、
+        その場合は (None, レスポンス) を返す
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+                return None, super().send_head()
+            for index in ("index.html", "index.htm"):
+                if os.path.isfile(os.path.join(path, index)):
+                    return os.path.join(path, index), None
+            return None, self.list_directory(path)
+        if path.endswith("/"):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None, None
+        return path, None
+
+    def send_head(self):
+        self.send_range = None
+        if self.hot_cache and urllib.parse.urlsplit(self.path).path == STATS_PATH:
+            return self._send_stats()
+        path, response = self._resolve_path()
+        if path is None:
+            return response
+
+        try:
+            stat = os.stat(path)
+            served_path, encoding, vary = find_precompressed(path, stat, self.headers.get("Accept-Encoding"))
+            f = self.hot_cache.open(served_path) if self.hot_cache else open(served_path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            etag = make_etag(path, stat, encoding)
+            last_modified = self.date_time_string(stat.st_mtime)
+
+            if not_modified(self.headers, etag, stat):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                if vary:
+                    self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                f.close()
+                return None
+
+            # 圧縮版なら圧縮後のサイズ（範囲もそのバイト列に対して）
+            size = f.size if isinstance(f, CachedFile) else os.fstat(f.fileno()).st_size
+            byte_range = None
+            if "Range" in self.headers and range_applies(self.headers, etag, last_modified):
+                byte_range = parse_range(self.headers["Range"], size)
+            if byte_range == "unsatisfiable":
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                f.close()
+                return None
+
+            if byte_range:
+                start, length = byte_range
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header("Content-Range", f"bytes {start}-{start + length - 1}/{size}")
+                self.send_range = byte_range
+            else:
+                self.send_response(HTTPStatus.OK)
+                length = size
+            self.send_header("Content-type", self.guess_type(path))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            if vary:
+                self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Content-Length", str(length))
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+    def log_message(self, format, *args):
+        sys.stderr.write(f"[{self.log_date_time_string()}] {self.address_string()} {format % args}\n")
+
+def find_free_port(start, end=8200):
+    """start から順に使用可能なポートを探す"""
+    for port in range(start, end):
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.bind(('localhost', port))
+                return port
+        except OSError:
+            continue
+    return None
+
+def make_server(root, port, headers=None, host="", cache_bytes=None):
+    """
+    root を配信するサーバーを作る（port=0 なら空きポートを自動で選ぶ）
+
+    cache_bytes を指定するとその容量までファイルをメモリに置く
+    """
+    hot_cache = HotFileCache(cache_bytes) if cache_bytes else None
+    handler_class = type("Handler", (StaticRequestHandler,),
+                         {"extra_headers": dict(headers or {}), "hot_cache": hot_cache})
+    server = ThreadingHTTPServer((host, port), partial(handler_class, directory=str(root)))
+    server.daemon_threads = True
+    return server
+
+def serve(root, port, headers=None, open_path=None, links=(), title="🌐 Server", open_delay=1, cache_bytes=None):
+    """
+    サーバーを起動して Ctrl+C まで配信する
+
+    Args:
+        root: 配信するディレクトリ
+        port: ポート番号
+        headers: 全レスポンスに付ける追加ヘッダー
+        open_path: 起動後にブラウザで開くパス（例: "/projects/blender-unicorn/"）
+        links: 起動時に表示する (ラベル, パス) の一覧
+        cache_bytes: メモリキャッシュの容量（None なら使わない）
+    """
+    with make_server(root, port, headers, cache_bytes=cache_bytes) as httpd:
+        print(f"{title} running at http://localhost:{port}")
+        print(f"📁 Serving from: {root}")
+        for label, path in links:
+            print(f"  {label}: http://localhost:{port}{path}")
+        if cache_bytes:
+            print(f"🧠 メモリキャッシュ: {cache_bytes / (1024 * 1024):.0f}MB（統計: http://localhost:{port}{STATS_PATH}）")
+        print("Press Ctrl+C to stop")
+
+        if open_path:
+            def open_browser():
+                time.sleep(open_delay)
+                url = f'http://localhost:{port}{open_path}'
+                print(f"🚀 Opening browser: {url}")
+                webbrowser.open(url)
+
+            threading.Thread(target=open_browser, daemon=True).start()
+
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Server stopped")
+
+def parse_args(args, root, port):
+    """--root / --port / --open を取り出す（指定がなければ各スクリプトの既定値）"""
+    open_path = None
+    if "--root" in args:
+        root = args[args.index("--root") + 1]
+    if "--port" in args:
+        port = int(args[args.index("--port") + 1])
+    if "--open" in args:
+        open_path = args[args.index("--open") + 1]
+    return root, port, open_path
+
+def parse_cache_size(args):
+    """--cache MB をバイト数にする（指定がなければ None）"""
+    if "--cache" in args:
+        return int(float(args[args.index("--cache") + 1]) * 1024 * 1024)
+    return None
+
+if __name__ == "__main__":
+    root, port, open_path = parse_args(sys.argv[1:], os.getcwd(), 8000)
+    serve(os.path.abspath(root), port, CORS_HEADERS, open_path, cache_bytes=parse_cache_size(sys.argv[1:]))
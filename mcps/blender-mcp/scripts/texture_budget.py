@@ -0,0 +1,337 @@
+"""
+テクスチャの解像度・枚数を品質ティアの上限に合わせる（Blender内で実行）
+- texture_resolution を超える画像を縦横比を保って縮小
+- texture_count_max を超える場合は小さいテクスチャからアトラスにまとめ、UVを書き換える
+
+単体実行:
+  blender scene.blend --background --python texture_budget.py -- --max-resolution 1024 --max-count 4 [--report report.json] [--save out.blend]
+"""
+
+import sys
+import json
+
+import bpy
+import numpy as np
+
+# アトラス内のタイル間の余白（ミップマップでのにじみ防止、端のピクセルで埋める）
+ATLAS_PADDING = 4
+
+def material_image_nodes():
+    """マテリアルで使われている画像テクスチャノードを 画像 → [(マテリアル, ノード)] でまとめる"""
+    usage = {}
+    for material in bpy.data.materials:
+        if not material.use_nodes or not material.node_tree or material.users == 0:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None:
+                usage.setdefault(node.image, []).append((material, node))
+    return usage
+
+def _read_pixels(image):
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+# 縮小・アトラス化した画像をそのまま格納できる形式（それ以外はPNGにする）
+KEEP_FORMATS = ('PNG', 'JPEG', 'WEBP')
+
+def _pack_modified(image, file_format=None):
+    """
+    変更した画素をエクスポーターが確実に使うよう、blend内に格納
+
+    形式は元の画像のまま（export_image_format AUTO では格納した形式でGLBに入るので、
+    JPEGをPNGにするとかえって大きくなる）
+    """
+    file_format = file_format or image.file_format
+    image.file_format = file_format if file_format in KEEP_FORMATS else 'PNG'
+    image.pack()
+
+def downscale_images(images, max_resolution):
+    """長辺が max_resolution を超える画像を縮小し、変更内容を返す"""
+    changes = []
+    for image in images:
+        width, height = image.size
+        longest = max(width, height)
+        if longest <= max_resolution or width == 0 or height == 0:
+            continue
+        scale = max_resolution / longest
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image.scale(*new_size)
+        _pack_modified(image)
+        changes.append({"image": image.name, "before": [width, height], "after": list(new_size)})
+    return changes
+
+def _uv_layer_for(node, mesh):
+    """ノードが参照するUVマップ（UV Mapノード経由なら指定名、未接続ならアクティブ）"""
+    vector_input = node.inputs.get('Vector')
+    if vector_input is None or not vector_input.is_linked:
+        return mesh.uv_layers.active
+    source = vector_input.links[0].from_node
+    if source.type == 'UVMAP':
+        return mesh.uv_layers.get(source.uv_map) if source.uv_map else mesh.uv_layers.active
+    # テクスチャ座標の加工やマッピングがある場合はUVの書き換えで再現できない
+    return None
+
+def _material_faces(mesh, material):
+    """メッシュ内で material を使う面のループインデックス"""
+    indices = [i for i, slot_material in enumerate(mesh.materials) if slot_material == material]
+    if not indices:
+        return None
+    material_index = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    loop_start = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_start", loop_start)
+    loop_total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+
+    selected = np.isin(material_index, indices)
+    if not selected.any():
+        return None
+    starts, totals = loop_start[selected], loop_total[selected]
+    return np.repeat(starts, totals) + (np.arange(totals.sum()) - np.repeat(np.cumsum(totals) - totals, totals))
+
+def _image_targets(usage):
+    """
+    画像ごとのUVの参照先 [(メッシュ, UVレイヤー, ループ)]
+
+    UVレイヤーが None のものは座標を加工していて、どのUVを使うか特定できない
+    """
+    meshes = {obj.data for obj in bpy.context.scene.objects if obj.type == 'MESH'}
+    targets = {}
+    for image, users in usage.items():
+        for material, node in users:
+            for mesh in meshes:
+                loops = _material_faces(mesh, material)
+                if loops is not None:
+                    targets.setdefault(image, []).append((mesh, _uv_layer_for(node, mesh), loops))
+    return targets
+
+def _shares_loops(targets, image):
+    """image が書き換えるループを、別の画像も参照しているか（書き換えるとそちらがずれる）"""
+    for other, other_targets in targets.items():
+        if other is image:
+            continue
+        for mesh, uv_layer, loops in targets.get(image, []):
+            for other_mesh, other_layer, other_loops in other_targets:
+                if other_mesh != mesh:
+                    continue
+                if other_layer is not None and other_layer.name != uv_layer.name:
+                    continue
+                if np.intersect1d(loops, other_loops).size:
+                    return True
+    return False
+
+def _atlas_candidates(usage):
+    """UVの書き換えでアトラス化できる画像と、その書き換え対象 [(メッシュ, UVレイヤー, ループ)]"""
+    targets = _image_targets(usage)
+    candidates = {}
+    for image in usage:
+        image_targets = targets.get(image, [])
+        ok = True
+        for mesh, uv_layer, loops in image_targets:
+            if uv_layer is None:
+                ok = False
+                break
+            uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+            uv_layer.data.foreach_get("uv", uvs)
+            uvs = uvs.reshape(-1, 2)[loops]
+            # タイリング（0-1の外側）しているUVはアトラス内では再現できない
+            if uvs.size and (uvs.min() < 0.0 or uvs.max() > 1.0):
+                ok = False
+                break
+        # 同じUVを別の画像（同じマテリアルの法線マップなど）も使っていると、書き換えられない
+        if ok and not _shares_loops(targets, image):
+            candidates[image] = image_targets
+    return candidates
+
+def _shelf_pack(sizes, atlas_size):
+    """棚詰めで (x, y) を割り当てる。入りきらなければNone"""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in order:
+        width, height = sizes[i][0] + ATLAS_PADDING * 2, sizes[i][1] + ATLAS_PADDING * 2
+        if x + width > atlas_size:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        if x + width > atlas_size or y + height > atlas_size:
+            return None
+        positions[i] = (x + ATLAS_PADDING, y + ATLAS_PADDING)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return positions
+
+def build_atlas(images, max_resolution, name="TextureAtlas"):
+    """
+    画像を max_resolution 四方のアトラスにまとめる（入りきらなければ全体を縮小）
+
+    images は同じ色空間のものだけを渡す（アトラスも同じ色空間になる）
+
+    Returns:
+        (アトラス画像, {画像: (x, y, 幅, 高さ)}, アトラス一辺)
+    """
+    sizes = [tuple(image.size) for image in images]
+    scale = 1.0
+    while True:
+        scaled = [(max(1, int(w * scale)), max(1, int(h * scale))) for w, h in sizes]
+        positions = _shelf_pack(scaled, max_resolution)
+        if positions is not None:
+            break
+        scale *= 0.9
+
+    atlas_size = max_resolution
+    pixels = np.zeros((atlas_size, atlas_size, 4), dtype=np.float32)
+    placements = {}
+    for image, (width, height), (x, y) in zip(images, scaled, positions):
+        if (width, height) != tuple(image.size):
+            image.scale(width, height)
+        tile = np.pad(_read_pixels(image), ((ATLAS_PADDING, ATLAS_PADDING), (ATLAS_PADDING, ATLAS_PADDING), (0, 0)), mode='edge')
+        # Blenderの画素は下から上に並ぶので、y はそのままUVのvと同じ向き
+        pixels[y - ATLAS_PADDING:y + height + ATLAS_PADDING, x - ATLAS_PADDING:x + width + ATLAS_PADDING] = tile
+        placements[image] = (x, y, width, height)
+
+    atlas = bpy.data.images.new(name, atlas_size, atlas_size, alpha=True)
+    atlas.colorspace_settings.name = images[0].colorspace_settings.name
+    atlas.pixels.foreach_set(pixels.ravel())
+    # 元が全部JPEGならJPEGのまま（アルファはJPEGにないので失われない）
+    formats = {image.file_format for image in images}
+    _pack_modified(atlas, 'JPEG' if formats == {'JPEG'} else 'PNG')
+    return atlas, placements, atlas_size
+
+def _rewrite_uvs(candidates, merged):
+    """
+    アトラス内の位置に合わせてUVを書き換える
+
+    (メッシュ, UVレイヤー) ごとに1回読み書きし、各ループは1回だけ変換する
+    （同じ画像を2つのマテリアルで使っていれば、両方のループを変換する）
+
+    Args:
+        merged: {画像: (x, y, 幅, 高さ, アトラス一辺)}
+    """
+    layers = {}
+    for image, rect in merged.items():
+        for mesh, uv_layer, loops in candidates[image]:
+            entry = layers.setdefault((mesh.name, uv_layer.name), (uv_layer, {}))
+            entry[1].setdefault(image, []).append(loops)
+
+    for uv_layer, image_loops in layers.values():
+        uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+        for image, loop_lists in image_loops.items():
+            x, y, width, height, atlas_size = merged[image]
+            loops = np.unique(np.concatenate(loop_lists))
+            uvs[loops, 0] = (x + uvs[loops, 0] * width) / atlas_size
+            uvs[loops, 1] = (y + uvs[loops, 1] * height) / atlas_size
+        uv_layer.data.foreach_set("uv", uvs.ravel())
+
+def atlas_textures(usage, max_count, max_resolution):
+    """
+    テクスチャ枚数が max_count を超える分を、小さい画像からアトラスにまとめる
+
+    色空間（sRGB の色・Non-Color の法線やラフネス）ごとに別のアトラスにする
+    """
+    if len(usage) <= max_count:
+        return None
+
+    candidates = _atlas_candidates(usage)
+    groups = {}
+    for image in sorted(candidates, key=lambda image: image.size[0] * image.size[1]):
+        groups.setdefault(image.colorspace_settings.name, []).append(image)
+
+    # アトラス1枚でまとめた枚数 - 1 枚減るので、候補の多い色空間から超過分を埋める
+    excess = len(usage) - max_count
+    plans = []
+    for colorspace, images in sorted(groups.items(), key=lambda item: -len(item[1])):
+        if excess <= 0:
+            break
+        take = min(len(images), excess + 1)
+        if take < 2:
+            continue
+        plans.append((colorspace, images[:take]))
+        excess -= take - 1
+    if not plans:
+        return {"merged": [], "note": "アトラス化できるテクスチャが足りません（タイリングUV・座標加工・UVの共有あり）"}
+
+    atlases = []
+    merged = {}
+    for colorspace, images in plans:
+        name = "TextureAtlas" if colorspace == 'sRGB' else f"TextureAtlas_{colorspace.replace(' ', '')}"
+        atlas, placements, atlas_size = build_atlas(images, max_resolution, name)
+        for image in images:
+            merged[image] = (*placements[image], atlas_size)
+            for material, node in usage[image]:
+                node.image = atlas
+                node.extension = 'EXTEND'
+        atlases.append({
+            "atlas": atlas.name,
+            "colorspace": colorspace,
+            "size": [atlas_size, atlas_size],
+            "merged": [{"image": image.name, "rect": list(placements[image])} for image in images],
+        })
+    _rewrite_uvs(candidates, merged)
+
+    return {
+        "atlas": ", ".join(entry["atlas"] for entry in atlases),
+        "atlases": atlases,
+        "merged": [entry for atlas in atlases for entry in atlas["merged"]],
+    }
+
+def fit_textures(max_resolution, max_count):
+    """
+    テクスチャを解像度・枚数の上限に合わせる
+
+    Returns:
+        変更内容のレポート（辞書）
+    """
+    usage = material_image_nodes()
+    before = {image.name: list(image.size) for image in usage}
+
+    atlas = atlas_textures(usage, max_count, max_resolution)
+    downscaled = downscale_images(list(material_image_nodes()), max_resolution)
+
+    after_usage = material_image_nodes()
+    return {
+        "max_resolution": max_resolution,
+        "max_count": max_count,
+        "before": {"count": len(before), "images": before},
+        "after": {"count": len(after_usage), "images": {image.name: list(image.size) for image in after_usage}},
+        "downscaled": downscaled,
+        "atlas": atlas,
+        "within_budget": len(after_usage) <= max_count,
+    }
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+def print_report(report):
+    print(f"🖼️  テクスチャ: {report['before']['count']}枚 → {report['after']['count']}枚 (上限 {report['max_count']}枚, 最大 {report['max_resolution']}px)")
+    for change in report['downscaled']:
+        print(f"   - 縮小 {change['image']}: {change['before'][0]}x{change['before'][1]} → {change['after'][0]}x{change['after'][1]}")
+    if report['atlas'] and report['atlas'].get('merged'):
+        for atlas in report['atlas']['atlases']:
+            names = ', '.join(entry['image'] for entry in atlas['merged'])
+            print(f"   - アトラス化 {atlas['atlas']}（{atlas['colorspace']}）: {names}")
+    elif report['atlas']:
+        print(f"   ⚠️  {report['atlas']['note']}")
+
+if __name__ == "__main__":
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    if option("--max-resolution") is None:
+        print(__doc__)
+        sys.exit(1)
+
+    report = fit_textures(int(option("--max-resolution")), int(option("--max-count", "8")))
+    print_report(report)
+    if option("--report"):
+        write_report(report, option("--report"))
+        print(f"📄 レポート: {option('--report')}")
+    if option("--save"):
+        bpy.ops.wm.save_as_mainfile(filepath=option("--save"))
+        print(f"💾 保存: {option('--save')}")
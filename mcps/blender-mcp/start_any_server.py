@@ -1,57 +1,23 @@
 #!/usr/bin/env python3
-import http.server
-import socketserver
-import os
-import webbrowser
-import threading
-import time
-import socket
+import sys
+from pathlib import Path
 
-def find_free_port():
-    """使用可能なポートを見つける"""
-    for port in range(8080, 8200):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
-    return None
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from static_server import serve, find_free_port, parse_args, CORS_HEADERS
 
 def start_server():
-    PORT = find_free_port()
-    if not PORT:
+    root, port, open_path = parse_args(sys.argv[1:], '/Users/nukuiyuki/Dev/mcp-tools/Blender', None)
+    port = port or find_free_port(8080)
+    if not port:
         print("❌ 使用可能なポートが見つかりません")
         return
     
-    os.chdir('/Users/nukuiyuki/Dev/mcp-tools/Blender')
-    
-    class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-        def end_headers(self):
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            super().end_headers()
-    
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
-        print(f"🌐 Server running at http://localhost:{PORT}")
-        print(f"📁 Serving from: {os.getcwd()}")
-        print(f"🦄 Unicorn viewer: http://localhost:{PORT}/projects/fixed_unicorn_viewer.html")
-        print("Press Ctrl+C to stop")
-        
-        # ブラウザを開く
-        def open_browser():
-            time.sleep(2)
-            url = f'http://localhost:{PORT}/projects/fixed_unicorn_viewer.html'
-            print(f"🚀 Opening browser: {url}")
-            webbrowser.open(url)
-        
-        threading.Thread(target=open_browser, daemon=True).start()
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Server stopped")
+    serve(
+        root, port, CORS_HEADERS,
+        open_path=open_path or '/projects/fixed_unicorn_viewer.html',
+        links=[("🦄 Unicorn viewer", '/projects/fixed_unicorn_viewer.html')],
+        open_delay=2,
+    )
 
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    start_server()
@@ -5,8 +5,12 @@ Blender → Three.js ブリッジのテストスクリプト
 """
 
 import subprocess
-import json
 import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "scripts"))
+from mcp_client import threejs_client, tool_text, MCPError, MCPTimeout
 
 def test_threejs_viewer():
     """
@@ -35,44 +39,20 @@ def test_threejs_viewer():
         print("❌ Three.js MCPサーバーが見つかりません")
         return False
     
-    # HTMLビューワー作成コマンド
-    viewer_command = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "tools/call",
-        "params": {
-            "name": "createViewer",
-            "arguments": {
-                "glbPath": glb_path,
-                "outputPath": output_path,
-                "title": f"Blender → Three.js: {glb_file}"
-            }
-        }
-    }
-    
     print("=== HTMLビューワー作成テスト ===")
     print(f"入力GLB: {glb_path}")
     print(f"出力HTML: {output_path}")
     
     try:
-        # Three.js MCPサーバーを起動してコマンド送信
-        cmd = ["node", threejs_build]
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # JSONコマンドを送信
-        command_json = json.dumps(viewer_command)
-        stdout, stderr = process.communicate(input=command_json, timeout=10)
+        # Three.js MCPサーバーに送信（両テストで同じプロセスを使う）
+        result = threejs_client(threejs_build).call_tool("createViewer", {
+            "glbPath": glb_path,
+            "outputPath": output_path,
+            "title": f"Blender → Three.js: {glb_file}"
+        }, timeout=10)
         
         print("=== Three.js MCPレスポンス ===")
-        print("STDOUT:", stdout)
-        if stderr:
-            print("STDERR:", stderr)
+        print(tool_text(result))
         
         # 出力ファイルの存在確認
         if os.path.exists(output_path):
@@ -91,11 +71,10 @@ def test_threejs_viewer():
             print("❌ HTMLファイルが作成されませんでした")
             return False
         
-    except subprocess.TimeoutExpired:
+    except MCPTimeout:
         print("❌ タイムアウト: MCPサーバーの応答が遅すぎます")
-        process.kill()
         return False
-    except Exception as e:
+    except MCPError as e:
         print(f"❌ エラー: {e}")
         return False
 
@@ -109,45 +88,22 @@ def test_bridge_function():
     assets_dir = os.path.join(blender_dir, "assets")
     threejs_build = "/Users/nukuiyuki/Dev/mcp-tools/Threejs/build/main.js"
     
-    # ブリッジコマンド
-    bridge_command = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": {
-            "name": "bridgeFromBlender",
-            "arguments": {
-                "blenderAssetPath": assets_dir,
-                "targetGLB": "original_unicorn.glb"
-            }
-        }
-    }
-    
     print("=== ブリッジ機能テスト ===")
     print(f"アセットパス: {assets_dir}")
     print(f"ターゲットGLB: original_unicorn.glb")
     
     try:
-        cmd = ["node", threejs_build]
-        process = subprocess.Popen(
-            cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        command_json = json.dumps(bridge_command)
-        stdout, stderr = process.communicate(input=command_json, timeout=10)
+        result = threejs_client(threejs_build).call_tool("bridgeFromBlender", {
+            "blenderAssetPath": assets_dir,
+            "targetGLB": "original_unicorn.glb"
+        }, timeout=10)
         
         print("=== ブリッジレスポンス ===")
-        print("STDOUT:", stdout)
-        if stderr:
-            print("STDERR:", stderr)
+        print(tool_text(result))
         
-        return True
+        return not result.get("isError")
         
-    except Exception as e:
+    except MCPError as e:
         print(f"❌ ブリッジエラー: {e}")
         return False
 
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+画像後処理バッチツール
+ディレクトリ/globで指定した画像をプロセスプールで並列に処理し、出力ディレクトリに保存
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import collections
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+
+# 変換名 → 出力ファイル名の接尾辞
+TRANSFORMS = {
+    'remove_background': '_transparent',
+    'remove_background_connected': '_transparent',
+    'red': '_red',
+    'deep_red': '_deep_red',
+}
+
+_transform_funcs = {}
+_cache = None
+
+def _init_worker(cache_dir=None, cache_max_bytes=None):
+    """ワーカー起動時に一度だけPIL/NumPyと変換関数を読み込む"""
+    global _cache
+    from recolor import recolor_file, PRESETS
+    from remove_background import remove_background_file
+    from transform_cache import TransformCache, DEFAULT_MAX_BYTES
+
+    # 変換名 → (キャッシュ上の変換名, パラメータ, 関数)
+    _transform_funcs['remove_background'] = (
+        'remove_background', {'connected': False},
+        remove_background_file
+    )
+    _transform_funcs['remove_background_connected'] = (
+        'remove_background', {'connected': True},
+        lambda input_path, output_path: remove_background_file(input_path, output_path, connected=True)
+    )
+    for preset_name, params in PRESETS.items():
+        _transform_funcs[preset_name] = (
+            'recolor', params,
+            lambda input_path, output_path, params=params: recolor_file(input_path, output_path, **params)
+        )
+
+    if cache_dir is not None:
+        _cache = TransformCache(cache_dir, cache_max_bytes or DEFAULT_MAX_BYTES)
+
+def _process_one(job):
+    """1枚の画像を処理して (入力, 出力, 秒数, エラー, キャッシュヒット) を返す"""
+    transform, input_path, output_path = job
+    cache_name, params, func = _transform_funcs[transform]
+    start = time.perf_counter()
+    hit = False
+    try:
+        if _cache is not None:
+            hit = _cache.run(cache_name, params, input_path, output_path, func)
+        else:
+            func(input_path, output_path)
+        error = None
+    except Exception as e:
+        error = str(e)
+    return input_path, output_path, time.perf_counter() - start, error, hit
+
+def collect_inputs(patterns):
+    """ディレクトリ・globパターン・ファイルパスから入力画像を集める"""
+    inputs = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(p for p in path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        else:
+            candidates = sorted(Path(p) for p in glob.glob(pattern))
+        for candidate in candidates:
+            if candidate.is_file() and candidate not in inputs:
+                inputs.append(candidate)
+    return inputs
+
+def output_paths(inputs, output_dir, suffix):
+    """
+    入力ごとの出力パス（output_dir/{stem}{suffix}.png）
+
+    別のディレクトリに同じ名前の画像があるものは、入力の共通の親からの相対ディレクトリを
+    output_dir の下に残す。同じディレクトリで拡張子だけ違うもの（a.png と a.jpg）は拡張子も名前に入れる
+    """
+    names = [f"{path.stem}{suffix}.png" for path in inputs]
+    counts = collections.Counter(name.lower() for name in names)
+    if all(count == 1 for count in counts.values()):
+        return [output_dir / name for name in names]
+
+    resolved = [path.resolve() for path in inputs]
+    root = Path(os.path.commonpath([path.parent for path in resolved]))
+    relatives = [path.parent.relative_to(root) if counts[name.lower()] > 1 else Path()
+                 for path, name in zip(resolved, names)]
+    counts = collections.Counter((relative / name).as_posix().lower() for relative, name in zip(relatives, names))
+    outputs = []
+    for path, relative, name in zip(inputs, relatives, names):
+        if counts[(relative / name).as_posix().lower()] > 1:
+            name = f"{path.stem}_{path.suffix.lstrip('.').lower()}{suffix}.png"
+        outputs.append(output_dir / relative / name)
+    return outputs
+
+def batch_process(transform, inputs, output_dir, workers=None, cache_dir=None, cache_max_bytes=None):
+    """
+    画像をプロセスプールで並列処理
+
+    Args:
+        transform: TRANSFORMSのキー
+        inputs: 入力画像パスのリスト
+        output_dir: 出力ディレクトリ
+        workers: ワーカー数（既定: CPUコア数）
+        cache_dir: 変換結果キャッシュの場所（Noneでキャッシュしない）
+        cache_max_bytes: キャッシュの容量上限
+
+    Returns:
+        (入力, 出力, 秒数, エラー, キャッシュヒット) のリスト
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    outputs = output_paths(inputs, output_dir, TRANSFORMS[transform])
+    for parent in {output.parent for output in outputs}:
+        parent.mkdir(parents=True, exist_ok=True)
+    jobs = [(transform, str(path), str(output)) for path, output in zip(inputs, outputs)]
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    # IPCの往復を減らすため、ワーカーごとにまとめて渡す
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_dir, cache_max_bytes)) as executor:
+        return list(executor.map(_process_one, jobs, chunksize=chunksize))
+
+def print_summary(results, wall_time):
+    """処理時間のサマリーを表示"""
+    print()
+    print("📊 処理時間サマリー")
+    print("=" * 60)
+    for input_path, output_path, elapsed, error, hit in results:
+        status = "✅" if error is None else "❌"
+        cached = " (cache)" if hit else ""
+        print(f"{status} {Path(input_path).name:<45} {elapsed:7.2f}s{cached}")
+        if error:
+            print(f"   エラー: {error}")
+
+    times = sorted(r[2] for r in results)
+    succeeded = sum(1 for r in results if r[3] is None)
+    print("=" * 60)
+    hits = sum(1 for r in results if r[4])
+    print(f"成功: {succeeded}/{len(results)}  キャッシュヒット: {hits}")
+    if times:
+        print(f"平均: {sum(times) / len(times):.2f}s  中央値: {times[len(times) // 2]:.2f}s  最大: {times[-1]:.2f}s")
+    print(f"合計処理時間: {sum(times):.2f}s  実時間: {wall_time:.2f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='画像後処理バッチツール')
+    parser.add_argument('transform', choices=sorted(TRANSFORMS), help='適用する変換')
+    parser.add_argument('inputs', nargs='+', help='入力ディレクトリ・globパターン・ファイル')
+    parser.add_argument('-o', '--output-dir', default='processed', help='出力ディレクトリ（既定: processed）')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='ワーカー数（既定: CPUコア数）')
+    parser.add_argument('--cache-dir', default=None, help='変換結果キャッシュの場所（既定: ~/.cache/kamui-transforms）')
+    parser.add_argument('--cache-max-mb', type=int, default=None, help='キャッシュの容量上限MB（既定: 512）')
+    parser.add_argument('--no-cache', action='store_true', help='変換結果キャッシュを使わない')
+    args = parser.parse_args(argv)
+
+    from transform_cache import DEFAULT_CACHE_DIR
+    cache_dir = None if args.no_cache else str(args.cache_dir or DEFAULT_CACHE_DIR)
+    cache_max_bytes = args.cache_max_mb * 1024 * 1024 if args.cache_max_mb else None
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("❌ 入力画像が見つかりません")
+        return 1
+
+    print(f"🖼️  {len(inputs)}枚の画像を処理中 ({args.transform})...")
+    start = time.perf_counter()
+    results = batch_process(args.transform, inputs, args.output_dir, args.workers,
+                            cache_dir, cache_max_bytes)
+    print_summary(results, time.perf_counter() - start)
+
+    return 0 if all(r[3] is None for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
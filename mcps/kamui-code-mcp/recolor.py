@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+HSV色相変換エンジン
+RGBA画像の色相帯選択・色相/彩度/明度の変換をNumPy配列演算で一括処理
+（colorsysによるピクセルごとの変換と完全に同じ結果を出力）
+"""
+
+import sys
+import argparse
+import numpy as np
+from PIL import Image
+
+# 既存スクリプト用のプリセット
+PRESETS = {
+    # change_pink_to_red.py: ピンク → 赤（0-20度）
+    'red': {
+        'hue_low': 0.17,
+        'hue_high': 0.83,
+        'low_hue_scale': 0.06,
+        'high_hue_scale': 0.24,
+        'fixed_hue': None,
+        'saturation_scale': 1.2,
+        'value_scale': 0.9,
+    },
+    # make_deeper_red.py: ピンク → 深い赤（固定色相）
+    'deep_red': {
+        'hue_low': 0.17,
+        'hue_high': 0.83,
+        'low_hue_scale': 0.06,
+        'high_hue_scale': 0.24,
+        'fixed_hue': 0.02,
+        'saturation_scale': 1.5,
+        'value_scale': 0.6,
+    },
+}
+
+def rgb_to_hsv(r, g, b):
+    """RGB配列(0-1)をHSV配列に変換（colorsys.rgb_to_hsvと同じ演算順序）"""
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    rangec = maxc - minc
+    v = maxc
+    gray = minc == maxc
+
+    # 無彩色はゼロ除算を避けてから結果を0に置き換える
+    safe_range = np.where(gray, 1.0, rangec)
+    safe_max = np.where(gray, 1.0, maxc)
+    s = rangec / safe_max
+    rc = (maxc - r) / safe_range
+    gc = (maxc - g) / safe_range
+    bc = (maxc - b) / safe_range
+
+    h = np.where(r == maxc, bc - gc,
+                 np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.mod(h / 6.0, 1.0)
+
+    h = np.where(gray, 0.0, h)
+    s = np.where(gray, 0.0, s)
+    return h, s, v
+
+def hsv_to_rgb(h, s, v):
+    """HSV配列をRGB配列(0-1)に変換（colorsys.hsv_to_rgbと同じ演算順序）"""
+    i = np.trunc(h * 6.0)
+    f = (h * 6.0) - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = np.mod(i, 6)
+
+    conditions = [i == 0, i == 1, i == 2, i == 3, i == 4, i == 5]
+    r = np.select(conditions, [v, q, p, p, t, v])
+    g = np.select(conditions, [t, v, v, q, p, p])
+    b = np.select(conditions, [p, p, t, v, v, q])
+
+    # 彩度0はそのまま明度を返す
+    achromatic = s == 0.0
+    r = np.where(achromatic, v, r)
+    g = np.where(achromatic, v, g)
+    b = np.where(achromatic, v, b)
+    return r, g, b
+
+def recolor(data, hue_low=0.17, hue_high=0.83, low_hue_scale=0.06, high_hue_scale=0.24,
+            fixed_hue=None, saturation_scale=1.2, value_scale=0.9):
+    """
+    RGBA配列の色相帯を変換（配列をその場で書き換える）
+
+    Args:
+        data: (H, W, 4) のuint8配列
+        hue_low, hue_high: 対象色相帯（h > hue_high または h < hue_low）
+        low_hue_scale: h < 0.5 側の色相倍率
+        high_hue_scale: h > 0.5 側の (h - hue_high) に掛ける倍率
+        fixed_hue: 指定時は対象ピクセルの色相をこの値に固定
+        saturation_scale: 彩度の倍率（1.0で頭打ち）
+        value_scale: 明度の倍率
+
+    Returns:
+        変換されたピクセル数
+    """
+    # 透明でない部分のみ処理
+    non_transparent = data[:, :, 3] > 0
+    pixels = data[non_transparent]
+
+    rgb = pixels[:, :3] / 255.0
+    h, s, v = rgb_to_hsv(rgb[:, 0], rgb[:, 1], rgb[:, 2])
+
+    # 対象の色相帯を選択
+    in_band = (h > hue_high) | (h < hue_low)
+    h, s, v = h[in_band], s[in_band], v[in_band]
+
+    if fixed_hue is not None:
+        h = np.full_like(h, fixed_hue)
+    else:
+        h = np.where(h < 0.5, h * low_hue_scale, (h - hue_high) * high_hue_scale)
+    s = np.minimum(1.0, s * saturation_scale)
+    v = v * value_scale
+
+    r_new, g_new, b_new = hsv_to_rgb(h, s, v)
+    new_rgb = np.stack([r_new, g_new, b_new], axis=-1) * 255
+
+    # int()と同じく切り捨て
+    band_pixels = pixels[in_band]
+    band_pixels[:, :3] = np.clip(new_rgb, 0, 255).astype(np.uint8)
+    pixels[in_band] = band_pixels
+    data[non_transparent] = pixels
+
+    return int(np.sum(in_band))
+
+def recolor_file(input_path, output_path, **params):
+    """画像ファイルを読み込んで色相変換し、保存する"""
+    img = Image.open(input_path).convert('RGBA')
+    data = np.array(img)
+
+    changed = recolor(data, **params)
+
+    result = Image.fromarray(data, 'RGBA')
+    result.save(output_path)
+    return changed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='HSV色相変換（NumPy一括処理）')
+    parser.add_argument('input', help='入力画像')
+    parser.add_argument('output', help='出力画像')
+    parser.add_argument('--preset', choices=sorted(PRESETS), help='プリセット（個別指定で上書き可能）')
+    parser.add_argument('--hue-low', type=float, help='対象色相帯の下側しきい値（既定: 0.17）')
+    parser.add_argument('--hue-high', type=float, help='対象色相帯の上側しきい値（既定: 0.83）')
+    parser.add_argument('--low-hue-scale', type=float, help='h < 0.5 側の色相倍率（既定: 0.06）')
+    parser.add_argument('--high-hue-scale', type=float, help='h > 0.5 側の色相倍率（既定: 0.24）')
+    parser.add_argument('--fixed-hue', type=float, help='色相を固定値に置き換える')
+    parser.add_argument('--saturation-scale', type=float, help='彩度の倍率（既定: 1.2）')
+    parser.add_argument('--value-scale', type=float, help='明度の倍率（既定: 0.9）')
+    args = parser.parse_args(argv)
+
+    params = dict(PRESETS[args.preset]) if args.preset else {}
+    for key in ('hue_low', 'hue_high', 'low_hue_scale', 'high_hue_scale',
+                'fixed_hue', 'saturation_scale', 'value_scale'):
+        value = getattr(args, key)
+        if value is not None:
+            params[key] = value
+
+    changed = recolor_file(args.input, args.output, **params)
+    print(f'色相を変換しました: {args.output} ({changed}ピクセル)')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,27 +1,180 @@
+import sys
+import argparse
 from PIL import Image
 import numpy as np
 
-# 画像を読み込み
-img = Image.open('imagen_imagen-3.0-generate-002_20250705_022132_0.png').convert('RGBA')
-data = np.array(img)
+# 一度に処理する行数（一時配列のサイズは 幅 × この行数 に比例）
+DEFAULT_TILE_ROWS = 256
 
-# より柔軟な背景除去
-# 白っぽい色（RGB値がすべて250以上）を透明にする
-white_mask = (data[:, :, 0] >= 250) & (data[:, :, 1] >= 250) & (data[:, :, 2] >= 250)
+def remove_background(data, tile_rows=DEFAULT_TILE_ROWS):
+    """
+    白っぽい背景を透明にする（配列をその場で書き換える）
 
-# さらに、彩度の低い（グレーっぽい）色も透明にする
-gray_mask = (np.abs(data[:, :, 0] - data[:, :, 1]) < 10) & (np.abs(data[:, :, 1] - data[:, :, 2]) < 10) & (data[:, :, 0] > 200)
+    横方向のストリップごとに処理するため、マスク等の一時配列は
+    画像全体ではなくストリップのサイズに収まる
 
-# 両方の条件を満たす部分を透明にする
-bg_mask = white_mask | gray_mask
-data[bg_mask] = [0, 0, 0, 0]  # 透明にする
+    Args:
+        data: (H, W, 4) のuint8配列
+        tile_rows: ストリップの行数（Noneで画像全体を一度に処理）
 
-# 結果を保存
-result = Image.fromarray(data, 'RGBA')
-result.save('rose_petal_fully_transparent.png')
-print('背景を完全に透明化しました: rose_petal_fully_transparent.png')
+    Returns:
+        透明化したピクセル数
+    """
+    height = data.shape[0]
+    tile_rows = tile_rows or height
 
-# 透明化された部分の割合を計算
-transparent_pixels = np.sum(bg_mask)
-total_pixels = data.shape[0] * data.shape[1]
-print(f'透明化された部分: {transparent_pixels}/{total_pixels} ({transparent_pixels/total_pixels*100:.1f}%)')
\ No newline at end of file
+    transparent_pixels = 0
+    for top in range(0, height, tile_rows):
+        # スライスはビューなので、書き込みは元の配列に反映される
+        transparent_pixels += _remove_background_strip(data[top:top + tile_rows])
+
+    return transparent_pixels
+
+def _remove_background_strip(data):
+    """1ストリップ分の背景を透明にする"""
+    bg_mask = _background_mask_strip(data)
+    data[bg_mask] = [0, 0, 0, 0]  # 透明にする
+
+    return int(np.sum(bg_mask))
+
+def _background_mask_strip(data):
+    """1ストリップ分の背景候補マスクを作る"""
+    # より柔軟な背景除去
+    # 白っぽい色（RGB値がすべて250以上）を透明にする
+    white_mask = (data[:, :, 0] >= 250) & (data[:, :, 1] >= 250) & (data[:, :, 2] >= 250)
+
+    # さらに、彩度の低い（グレーっぽい）色も透明にする
+    gray_mask = (np.abs(data[:, :, 0] - data[:, :, 1]) < 10) & (np.abs(data[:, :, 1] - data[:, :, 2]) < 10) & (data[:, :, 0] > 200)
+
+    # 両方の条件を満たす部分を背景候補とする
+    return white_mask | gray_mask
+
+def remove_connected_background(data, tile_rows=DEFAULT_TILE_ROWS):
+    """
+    画像の端とつながった白っぽい領域だけを透明にする（配列をその場で書き換える）
+
+    しきい値で背景候補を選ぶところまでは remove_background() と同じだが、
+    被写体内部の白いハイライトは端とつながっていないため残る。
+    連結判定は行ごとのランを単位にした4近傍のラベリングで行う
+
+    Returns:
+        透明化したピクセル数
+    """
+    height, width = data.shape[:2]
+    tile_rows = tile_rows or height
+
+    # 背景候補マスク（1ピクセル1バイト）
+    candidate = np.empty((height, width), dtype=bool)
+    for top in range(0, height, tile_rows):
+        candidate[top:top + tile_rows] = _background_mask_strip(data[top:top + tile_rows])
+
+    bg_mask = _border_connected(candidate)
+    for top in range(0, height, tile_rows):
+        strip = data[top:top + tile_rows]
+        strip[bg_mask[top:top + tile_rows]] = [0, 0, 0, 0]  # 透明にする
+
+    return int(np.sum(bg_mask))
+
+def _border_connected(mask):
+    """マスクのうち画像の端と4近傍でつながった部分だけを返す"""
+    height, width = mask.shape
+
+    # 各行のラン（連続したTrueの区間）を 行*幅+列 の通し番号で取り出す
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    del padded
+    start_rows, start_cols = np.nonzero(edges == 1)
+    end_rows, end_cols = np.nonzero(edges == -1)
+    del edges
+    starts = start_rows * width + start_cols
+    ends = end_rows * width + end_cols  # 終端は含まない
+    run_count = len(starts)
+
+    result = np.zeros(mask.shape, dtype=bool)
+    if run_count == 0:
+        return result
+
+    # 上の行のランと列範囲が重なるランを結ぶ
+    # 上の行へずらした区間 [start - 幅, end - 幅) と重なるランは連続した範囲になる
+    first = np.searchsorted(ends, starts - width, side='right')
+    last = np.searchsorted(starts, ends - width, side='left')
+    counts = np.maximum(last - first, 0)
+    lower = np.repeat(np.arange(run_count), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    upper = np.repeat(first, counts) + offsets
+
+    # 最小ラベルへのフック＋ポインタジャンプで連結成分を求める
+    labels = np.arange(run_count)
+    while True:
+        upper_labels, lower_labels = labels[upper], labels[lower]
+        pending = upper_labels != lower_labels
+        if not pending.any():
+            break
+        upper_labels, lower_labels = upper_labels[pending], lower_labels[pending]
+        smaller = np.minimum(upper_labels, lower_labels)
+        np.minimum.at(labels, upper_labels, smaller)
+        np.minimum.at(labels, lower_labels, smaller)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    # 端に触れるランと同じ成分のランを背景とする
+    on_border = (
+        (start_rows == 0) | (start_rows == height - 1) |
+        (start_cols == 0) | (end_cols == width)
+    )
+    border_labels = np.zeros(run_count, dtype=bool)
+    border_labels[labels[on_border]] = True
+    keep = border_labels[labels]
+
+    # ランをマスクに書き戻す
+    flat = result.reshape(-1)
+    marks = np.zeros(flat.size + 1, dtype=np.int8)
+    marks[starts[keep]] += 1
+    marks[ends[keep]] -= 1
+    np.cumsum(marks[:-1], dtype=np.int8, out=marks[:-1])
+    flat[:] = marks[:-1] > 0
+    return result
+
+def remove_background_file(input_path, output_path, tile_rows=DEFAULT_TILE_ROWS, connected=False):
+    """
+    画像ファイルの背景を透明化して保存する
+
+    Args:
+        connected: Trueなら画像の端とつながった領域だけを透明にする
+    """
+    # デコード済み画像は配列に変換したらすぐに解放
+    with Image.open(input_path) as src:
+        img = src.convert('RGBA')
+    data = np.array(img)
+    del img
+
+    if connected:
+        transparent_pixels = remove_connected_background(data, tile_rows)
+    else:
+        transparent_pixels = remove_background(data, tile_rows)
+
+    result = Image.fromarray(data, 'RGBA')
+    result.save(output_path)
+    return transparent_pixels, data.shape[0] * data.shape[1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='白っぽい背景の透明化')
+    parser.add_argument('input', nargs='?', default='imagen_imagen-3.0-generate-002_20250705_022132_0.png', help='入力画像')
+    parser.add_argument('output', nargs='?', default='rose_petal_fully_transparent.png', help='出力画像')
+    parser.add_argument('--tile-rows', type=int, default=DEFAULT_TILE_ROWS, help=f'ストリップの行数（既定: {DEFAULT_TILE_ROWS}、0で一括処理）')
+    parser.add_argument('--connected', action='store_true', help='画像の端とつながった背景だけを透明にする')
+    args = parser.parse_args(argv)
+
+    transparent_pixels, total_pixels = remove_background_file(args.input, args.output, args.tile_rows, args.connected)
+    print(f'背景を完全に透明化しました: {args.output}')
+
+    # 透明化された部分の割合を計算
+    print(f'透明化された部分: {transparent_pixels}/{total_pixels} ({transparent_pixels/total_pixels*100:.1f}%)')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
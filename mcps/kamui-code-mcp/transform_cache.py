@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+画像変換結果キャッシュ
+(入力ファイルのハッシュ, 変換名, パラメータ) をキーに変換後のPNGを保存し、
+同じ変換の再実行時は保存済みの結果を返す（容量上限付きLRU）
+"""
+
+import os
+import sys
+import json
+import fcntl
+import shutil
+import struct
+import hashlib
+import tempfile
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get('KAMUI_TRANSFORM_CACHE', Path.home() / '.cache' / 'kamui-transforms'))
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+
+# キーの形式を変えたら上げる
+CACHE_VERSION = 1
+
+# ヒット/ミス数のファイル（uint64 を2つ並べた固定16バイト、flock して書き換える）
+COUNTS_NAME = "stats.counts"
+COUNTS_FORMAT = "<QQ"
+COUNTER_NAMES = ('hits', 'misses')
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class TransformCache:
+    """変換結果のコンテンツアドレス型キャッシュ"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, input_path, transform, params=None):
+        """入力ハッシュ・変換名・パラメータからキャッシュキーを作る"""
+        payload = json.dumps({
+            'version': CACHE_VERSION,
+            'input': file_hash(input_path),
+            'transform': transform,
+            'params': params or {},
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / f"{key}.png"
+
+    def get(self, key, output_path):
+        """キャッシュにあれば output_path にコピーしてTrueを返す"""
+        entry = self._entry_path(key)
+        try:
+            shutil.copyfile(entry, output_path)
+            # LRU用に最終利用時刻を更新
+            os.utime(entry)
+        except FileNotFoundError:
+            self._count('misses')
+            return False
+        self._count('hits')
+        return True
+
+    def put(self, key, result_path):
+        """変換結果をキャッシュに保存し、上限を超えたら古いものから削除"""
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(result_path, temp_path)
+            os.replace(temp_path, self._entry_path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+        self._evict()
+
+    def run(self, transform, params, input_path, output_path, func):
+        """
+        キャッシュ経由で変換を実行
+
+        Args:
+            transform: 変換名
+            params: 結果に影響するパラメータ（JSON化できる辞書）
+            func: func(input_path, output_path) で変換を行う関数
+
+        Returns:
+            キャッシュヒットならTrue
+        """
+        key = self.key(input_path, transform, params)
+        if self.get(key, output_path):
+            return True
+
+        func(input_path, output_path)
+        self.put(key, output_path)
+        return False
+
+    def _entries(self):
+        return [p for p in self.cache_dir.glob('*.png') if p.is_file()]
+
+    def _evict(self):
+        """合計サイズが上限を超えていれば最終利用が古い順に削除"""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def _update_counts(self, name=None):
+        """
+        ヒット/ミス数を読む（name を渡すとその数を1増やす）
+
+        複数プロセスから数えられるよう、固定長のファイルを flock して書き換える
+        （件数が増えてもファイルは大きくならない）
+        """
+        fd = os.open(self.cache_dir / COUNTS_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, struct.calcsize(COUNTS_FORMAT), 0)
+            if len(data) == struct.calcsize(COUNTS_FORMAT):
+                counts = dict(zip(COUNTER_NAMES, struct.unpack(COUNTS_FORMAT, data)))
+            else:
+                counts = dict.fromkeys(COUNTER_NAMES, 0)
+            changed = self._merge_legacy_counts(counts)
+            if name is not None:
+                counts[name] += 1
+                changed = True
+            if changed:
+                os.pwrite(fd, struct.pack(COUNTS_FORMAT, *(counts[n] for n in COUNTER_NAMES)), 0)
+            return counts
+        finally:
+            os.close(fd)
+
+    def _merge_legacy_counts(self, counts):
+        """以前の形式（1件1バイト追記の <name>.count）があれば数に足して消す"""
+        merged = False
+        for name in COUNTER_NAMES:
+            legacy = self.cache_dir / f"{name}.count"
+            try:
+                counts[name] += legacy.stat().st_size
+                legacy.unlink()
+                merged = True
+            except FileNotFoundError:
+                pass
+        return merged
+
+    def _count(self, name):
+        self._update_counts(name)
+
+    def stats(self):
+        """ヒット/ミス数とキャッシュ容量"""
+        counts = self._update_counts()
+        hits = counts['hits']
+        misses = counts['misses']
+        entries = self._entries()
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': len(entries),
+            'bytes': sum(p.stat().st_size for p in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+    def purge(self):
+        """キャッシュとカウンターをすべて削除"""
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            if path.is_file() and path.suffix in ('.png', '.tmp', '.count', '.counts'):
+                path.unlink()
+                if path.suffix == '.png':
+                    removed += 1
+        return removed
+
+def print_stats(cache):
+    stats = cache.stats()
+    print(f"📁 キャッシュ: {cache.cache_dir}")
+    print(f"   エントリ: {stats['entries']}個 ({stats['bytes'] / (1024 * 1024):.1f}MB / {stats['max_bytes'] / (1024 * 1024):.0f}MB)")
+    print(f"   ヒット: {stats['hits']}  ミス: {stats['misses']}  ヒット率: {stats['hit_ratio'] * 100:.1f}%")
+
+if __name__ == "__main__":
+    cache = TransformCache()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "purge":
+        removed = cache.purge()
+        print(f"🗑️  キャッシュを削除しました: {removed}個")
+    elif len(sys.argv) > 1 and sys.argv[1] == "stats":
+        print_stats(cache)
+    else:
+        print("使用方法:")
+        print("  統計表示: python3 transform_cache.py stats")
+        print("  全削除: python3 transform_cache.py purge")
+        print()
+        print("キャッシュの場所は環境変数 KAMUI_TRANSFORM_CACHE で変更できます")
@@ -1,68 +1,47 @@
 #!/usr/bin/env python3
-import http.server
-import socketserver
-import os
-import webbrowser
-import threading
-import time
-import socket
+import sys
+from pathlib import Path
 
-def find_free_port():
-    """使用可能なポートを見つける"""
-    for port in range(8090, 8200):
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return port
-        except OSError:
-            continue
-    return None
+# 共通サーバーモジュール（Blender側の scripts/static_server.py）を探す
+for scripts_dir in (
+    Path(__file__).resolve().parent.parent / "blender-mcp" / "scripts",
+    Path('/Users/nukuiyuki/Dev/mcp-tools/Blender/scripts'),
+):
+    if (scripts_dir / "static_server.py").exists():
+        sys.path.insert(0, str(scripts_dir))
+        break
+from static_server import serve, find_free_port, parse_args, parse_cache_size, CORS_HEADERS
+
+# --async: 多数のクライアントが同時に開くデモ向けの asyncio 版
+if "--async" in sys.argv:
+    from async_static_server import serve
 
 def start_integrated_server():
-    PORT = find_free_port()
+    # Threejsフォルダーをサーバールートに設定
+    root, port, open_path = parse_args(sys.argv[1:], '/Users/nukuiyuki/Dev/mcp-tools/Threejs', None)
+    PORT = port or find_free_port(8090)
     if not PORT:
         print("❌ 使用可能なポートが見つかりません")
         return
     
-    # Threejsフォルダーをサーバールートに設定
-    os.chdir('/Users/nukuiyuki/Dev/mcp-tools/Threejs')
-    
-    class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-        def end_headers(self):
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', '*')
-            super().end_headers()
-    
-    with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
-        print(f"🌐 Three.js Integrated Server running at http://localhost:{PORT}")
-        print(f"📁 Serving from: {os.getcwd()}")
-        print("")
-        print("🎯 Available Projects:")
-        print(f"  🦄 Blender Unicorn: http://localhost:{PORT}/projects/blender-unicorn/")
-        print(f"  🌸 Lumeria: http://localhost:{PORT}/projects/Lumeria/")
-        print(f"  ✨ Lumeria × Unicorn: http://localhost:{PORT}/projects/Lumeria/unicorn/")
-        print(f"  🌺 Flower Garden: http://localhost:{PORT}/projects/flower-garden/")
-        print(f"  🏛️ Flora Cathedral: http://localhost:{PORT}/projects/micro-flora-cathedral/")
-        print("")
-        print("Press Ctrl+C to stop")
-        
-        # ブラウザを開く
-        def open_browser():
-            time.sleep(2)
-            url = f'http://localhost:{PORT}/projects/blender-unicorn/'
-            print(f"🚀 Opening Blender → Three.js integration: {url}")
-            webbrowser.open(url)
-        
-        threading.Thread(target=open_browser, daemon=True).start()
-        
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n🛑 Server stopped")
+    serve(
+        root, PORT, CORS_HEADERS,
+        open_path=open_path or '/projects/blender-unicorn/',
+        # Available Projects（integrate_to_threejs.py がこの一覧に追記する）
+        links=[
+            ("🦄 Blender Unicorn", '/projects/blender-unicorn/'),
+            ("🌸 Lumeria", '/projects/Lumeria/'),
+            ("✨ Lumeria × Unicorn", '/projects/Lumeria/unicorn/'),
+            ("🌺 Flower Garden", '/projects/flower-garden/'),
+            ("🏛️ Flora Cathedral", '/projects/micro-flora-cathedral/'),
+        ],
+        title="🌐 Three.js Integrated Server",
+        open_delay=2,
+        cache_bytes=parse_cache_size(sys.argv[1:]),
+    )
 
 if __name__ == "__main__":
     print("🎨 Three.js統合サーバー起動")
     print("Blender → Three.js プロジェクト統合版")
     print("=" * 50)
-    start_integrated_server()
\ No newline at end of file
+    start_integrated_server()
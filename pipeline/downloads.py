@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+生成素材のダウンロードマネージャー（並列・再開・チェックサム検証）
+
+- ホストごとに keep-alive の接続を使い回し、全体の同時接続数を max_connections 本までに制限
+- 途中で切れたら .<ファイル名>.part を残し、次の試行で Range: bytes=<続き>- から再開
+  （If-Range で、サーバー側のファイルが変わっていれば最初から取り直す）
+- sha256 / サイズを指定すれば検証し、合わなければ最初から取り直す
+- 完了したら fsync してから一時ファイルを rename（途中のファイルが assets/ に見えない）
+- 進捗（件数・MB・MB/s）を定期的に表示し、最後に集計を出す
+
+使用方法:
+  python3 downloads.py <URL> [<URL> ...] [-o assets/] [-j 8] [--sha256 <ハッシュ>]
+  python3 downloads.py --list downloads.json [-o assets/] [-j 8]
+    （downloads.json: [{"url": ..., "path": "相対パス", "sha256": ..., "size": ...}, ...]）
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+import http.client
+import urllib.parse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ASSETS_DIR = REPO_ROOT / "assets"
+
+DEFAULT_CONNECTIONS = 8
+DEFAULT_RETRIES = 4
+DEFAULT_TIMEOUT = 60
+RETRY_BACKOFF = 1.0
+CHUNK_SIZE = 256 * 1024
+MAX_REDIRECTS = 5
+PROGRESS_INTERVAL = 1.0
+
+USER_AGENT = "creative-workshop-downloader/1.0"
+
+class DownloadError(RuntimeError):
+    """ダウンロードの失敗（retryable なら再試行する）"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+class ChecksumMismatch(DownloadError):
+    """ダウンロードしたファイルの sha256 / サイズが指定と違う"""
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def part_paths(destination):
+    """途中のファイルと、その再開用の情報（URL・ETag・全体サイズ）のパス"""
+    part = destination.with_name(f".{destination.name}.part")
+    return part, part.with_name(part.name + ".json")
+
+class ConnectionPool:
+    """
+    ホストごとの keep-alive 接続のプール
+
+    貸し出し中と待機中を合わせて max_connections 本まで。空きがなければ返却を待つ
+    """
+
+    def __init__(self, max_connections=DEFAULT_CONNECTIONS, timeout=DEFAULT_TIMEOUT):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.opened = 0
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme, netloc, fresh=False):
+        """接続を借りる（fresh なら待機中の接続を使わず新しく作る）"""
+        self._slots.acquire()
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle and not fresh:
+                return idle.pop()
+            self.opened += 1
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout)
+
+    def release(self, scheme, netloc, connection, reusable=True):
+        """接続を返す（応答を最後まで読んでいなければ reusable=False で閉じる）"""
+        if reusable:
+            with self._lock:
+                self._idle.setdefault((scheme, netloc), []).append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+class DownloadManager:
+    """
+    並列・再開可能なダウンローダー（複数スレッドから fetch を同時に呼んでよい）
+    """
+
+    def __init__(self, max_connections=DEFAULT_CONNECTIONS, retries=DEFAULT_RETRIES, timeout=DEFAULT_TIMEOUT,
+                 backoff=RETRY_BACKOFF):
+        self.pool = ConnectionPool(max_connections, timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.results = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._bytes = 0
+        self._failed = 0
+        self._started = None
+        self._destination_locks = {}
+
+    # ------------------------------------------------------------------
+    # 1ファイル
+    # ------------------------------------------------------------------
+
+    def fetch(self, url, destination, sha256=None, size=None):
+        """
+        url を destination にダウンロードする
+
+        destination が既にあり、指定の sha256 と一致すれば取り直さない
+
+        Returns:
+            {"url", "path", "bytes", "resumed_bytes", "attempts", "seconds", "sha256", "cached"}
+        """
+        destination = Path(destination).resolve()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        with self._lock:
+            self._started = self._started or started
+            self._active += 1
+            # 同じ保存先へのダウンロードは .part を共有するので1本ずつ
+            destination_lock = self._destination_locks.setdefault(destination, threading.Lock())
+        try:
+            with destination_lock:
+                result = self._fetch_to(url, destination, sha256, size, started)
+        except DownloadError:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def _fetch_to(self, url, destination, sha256, size, started):
+        if sha256 and destination.exists() and sha256_file(destination) == sha256.lower():
+            return self._result(url, destination, started, attempts=0, cached=True)
+        return self._fetch_with_retries(url, destination, sha256, size, started)
+
+    def _result(self, url, destination, started, attempts, resumed_bytes=0, digest=None, cached=False):
+        return {
+            "url": url,
+            "path": str(destination),
+            "bytes": destination.stat().st_size,
+            "resumed_bytes": resumed_bytes,
+            "attempts": attempts,
+            "seconds": round(time.perf_counter() - started, 3),
+            "sha256": digest,
+            "cached": cached,
+        }
+
+    def _fetch_with_retries(self, url, destination, sha256, size, started):
+        """
+        取得を繰り返す（途中ファイルが伸びた試行は回数に数えず、すぐ続きから再開する）
+        """
+        part, _ = part_paths(destination)
+        resumed_bytes = 0
+        attempt = 0
+        stalled = 0
+        while True:
+            attempt += 1
+            before = part.stat().st_size if part.exists() else 0
+            try:
+                digest, resumed = self._fetch_once(url, destination, sha256, size)
+                resumed_bytes += resumed
+                return self._result(url, destination, started, attempt, resumed_bytes, digest)
+            except ChecksumMismatch:
+                # 壊れた途中ファイルから再開しても直らないので捨てる
+                for path in part_paths(destination):
+                    path.unlink(missing_ok=True)
+                stalled += 1
+                if stalled > self.retries:
+                    raise
+            except (OSError, http.client.HTTPException, DownloadError) as e:
+                if part.exists() and part.stat().st_size > before:
+                    stalled = 0
+                    continue
+                stalled += 1
+                if isinstance(e, DownloadError):
+                    if not e.retryable or stalled > self.retries:
+                        raise
+                elif stalled > self.retries:
+                    raise DownloadError(f"ダウンロード失敗: {url}: {e}") from e
+            time.sleep(self.backoff * 2 ** (stalled - 1))
+
+    def _open(self, url, headers):
+        """
+        GET を送って応答を返す（リダイレクトは辿る）
+
+        Returns:
+            (応答, 接続を返す関数)
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            if parts.scheme not in ("http", "https"):
+                raise DownloadError(f"対応していないURL: {url}", retryable=False)
+            target = parts.path or "/"
+            if parts.query:
+                target += "?" + parts.query
+            connection = self.pool.acquire(parts.scheme, parts.netloc)
+            reused = connection.sock is not None
+            try:
+                connection.request("GET", target, headers=headers)
+                response = connection.getresponse()
+            except (OSError, http.client.HTTPException):
+                self.pool.release(parts.scheme, parts.netloc, connection, reusable=False)
+                if not reused:
+                    raise
+                # 待機中にサーバーが閉じた keep-alive 接続なので、新しい接続で送り直す
+                connection = self.pool.acquire(parts.scheme, parts.netloc, fresh=True)
+                try:
+                    connection.request("GET", target, headers=headers)
+                    response = connection.getresponse()
+                except (OSError, http.client.HTTPException):
+                    self.pool.release(parts.scheme, parts.netloc, connection, reusable=False)
+                    raise
+
+            def release(reusable=True, parts=parts, connection=connection, response=response):
+                self.pool.release(parts.scheme, parts.netloc, connection,
+                                  reusable and response.isclosed() and not response.will_close)
+
+            if response.status in (301, 302, 303, 307, 308) and response.getheader("Location"):
+                response.read()
+                release()
+                url = urllib.parse.urljoin(url, response.getheader("Location"))
+                continue
+            return response, release
+        raise DownloadError(f"リダイレクトが多すぎます: {url}", retryable=False)
+
+    def _fetch_once(self, url, destination, sha256, size):
+        """
+        1回分の取得（.part があれば続きから）
+
+        Returns:
+            (sha256, 再開で省けたバイト数)
+        """
+        part, meta_path = part_paths(destination)
+        meta = {}
+        if part.exists() and meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                meta = {}
+        offset = part.stat().st_size if part.exists() and meta.get("url") == url else 0
+        if offset and meta.get("total") == offset and not (size and size != offset):
+            # 前回は全部受け取ったあとの検証・rename の前で止まっていた
+            return self._finish(part, meta_path, destination, sha256, size, offset), offset
+
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        validator = meta.get("etag") or meta.get("last_modified")
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        response, release = self._open(url, headers)
+        reusable = False
+        try:
+            if response.status == 416 and offset:
+                # 手元の途中ファイルのほうが長い（サーバーのファイルが変わった）
+                response.read()
+                reusable = True
+                part.unlink(missing_ok=True)
+                raise DownloadError(f"再開位置が範囲外のため最初から取り直します: {url}")
+            if response.status == 206:
+                start, total = parse_content_range(response.getheader("Content-Range"))
+                if start != offset:
+                    raise DownloadError(f"要求と違う範囲が返りました（{start} != {offset}）: {url}")
+                mode = "ab"
+            elif response.status == 200:
+                offset = 0
+                total = response.length
+                mode = "wb"
+            else:
+                retryable = response.status == 429 or response.status >= 500
+                raise DownloadError(f"HTTP {response.status}: {url}", retryable=retryable)
+
+            if size and total is not None and total != size:
+                raise ChecksumMismatch(f"サイズが違います（{total} != {size}）: {url}")
+            meta = {"url": url, "etag": response.getheader("ETag"),
+                    "last_modified": response.getheader("Last-Modified"), "total": total}
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+            received = offset
+            with open(part, mode) as f:
+                while chunk := response.read(CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                    with self._lock:
+                        self._bytes += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            if total is not None and received != total:
+                raise DownloadError(f"接続が途中で切れました（{received}/{total} バイト）: {url}")
+            reusable = True
+        finally:
+            release(reusable)
+
+        return self._finish(part, meta_path, destination, sha256, size, received), offset
+
+    def _finish(self, part, meta_path, destination, sha256, size, received):
+        """検証して destination に rename する"""
+        if size and received != size:
+            raise ChecksumMismatch(f"サイズが違います（{received} != {size}）: {destination.name}")
+        digest = sha256_file(part)
+        if sha256 and digest != sha256.lower():
+            raise ChecksumMismatch(f"sha256 が違います（{digest[:12]}… != {sha256[:12]}…）: {destination.name}")
+        os.replace(part, destination)
+        meta_path.unlink(missing_ok=True)
+        return digest
+
+    # ------------------------------------------------------------------
+    # まとめて
+    # ------------------------------------------------------------------
+
+    def download_all(self, jobs, progress=True):
+        """
+        jobs（{"url", "path", "sha256"?, "size"?} のリスト）を並列にダウンロードする
+
+        失敗しても残りは続ける
+
+        Returns:
+            (成功した結果のリスト, [(job, エラー), ...])
+        """
+        results, failures = [], []
+        reporter = ProgressReporter(self) if progress else None
+        if reporter:
+            reporter.start()
+        try:
+            with ThreadPoolExecutor(self.pool.max_connections) as pool:
+                futures = [(job, pool.submit(self.fetch, job["url"], job["path"], job.get("sha256"), job.get("size")))
+                           for job in jobs]
+                for job, future in futures:
+                    try:
+                        results.append(future.result())
+                    except DownloadError as e:
+                        failures.append((job, e))
+        finally:
+            if reporter:
+                reporter.stop()
+        return results, failures
+
+    def progress(self):
+        with self._lock:
+            elapsed = time.perf_counter() - self._started if self._started else 0
+            return {
+                "done": len(self.results),
+                "failed": self._failed,
+                "active": self._active,
+                "bytes": self._bytes,
+                "seconds": elapsed,
+            }
+
+    def summary(self):
+        """完了したダウンロードの集計"""
+        progress = self.progress()
+        with self._lock:
+            results = list(self.results)
+        seconds = sorted(result["seconds"] for result in results if not result["cached"])
+        elapsed = progress["seconds"]
+        return {
+            "files": len(results),
+            "cached": sum(result["cached"] for result in results),
+            "failed": progress["failed"],
+            "megabytes": round(progress["bytes"] / (1024 * 1024), 2),
+            "seconds": round(elapsed, 3),
+            "mb_per_sec": round(progress["bytes"] / (1024 * 1024) / elapsed, 2) if elapsed else 0,
+            "resumed": sum(result["resumed_bytes"] > 0 for result in results),
+            "resumed_megabytes": round(sum(result["resumed_bytes"] for result in results) / (1024 * 1024), 2),
+            "retries": sum(max(0, result["attempts"] - 1) for result in results),
+            "connections_opened": self.pool.opened,
+            "p50_seconds": seconds[len(seconds) // 2] if seconds else None,
+            "max_seconds": seconds[-1] if seconds else None,
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"📥 ダウンロード: {summary['files']}件（既存 {summary['cached']}・失敗 {summary['failed']}）"
+              f" {summary['megabytes']:.1f}MB / {summary['seconds']:.1f}s = {summary['mb_per_sec']:.1f}MB/s")
+        print(f"   再開 {summary['resumed']}件（{summary['resumed_megabytes']:.1f}MB 省略）・再試行 {summary['retries']}回"
+              f"・接続 {summary['connections_opened']}本")
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ProgressReporter:
+    """DownloadManager の進捗を一定間隔で表示するスレッド"""
+
+    def __init__(self, manager, interval=PROGRESS_INTERVAL, stream=None):
+        self.manager = manager
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._last = (0, 0.0)
+
+    def start(self):
+        self._last = (self.manager.progress()["bytes"], time.perf_counter())
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self._print(final=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._print()
+
+    def _print(self, final=False):
+        progress = self.manager.progress()
+        now = time.perf_counter()
+        last_bytes, last_time = self._last
+        rate = (progress["bytes"] - last_bytes) / (1024 * 1024) / max(now - last_time, 1e-6)
+        self._last = (progress["bytes"], now)
+        line = (f"⬇️  完了 {progress['done']}・失敗 {progress['failed']}・転送中 {progress['active']}"
+                f"  {progress['bytes'] / (1024 * 1024):.1f}MB  {rate:.1f}MB/s")
+        if self.stream.isatty():
+            self.stream.write("\r" + line.ljust(78) + ("\n" if final else ""))
+        elif not final and rate > 0:
+            # ログに残す場合は、進んでいない間の行を省く
+            self.stream.write(line + "\n")
+        self.stream.flush()
+
+def parse_content_range(value):
+    """'bytes 100-199/1000' → (100, 1000)（全体が * なら None）"""
+    try:
+        unit, _, spec = (value or "").partition(" ")
+        span, _, total = spec.partition("/")
+        start = int(span.split("-", 1)[0])
+        if unit != "bytes":
+            raise ValueError(value)
+    except ValueError:
+        raise DownloadError(f"Content-Range が読めません: {value!r}") from None
+    return start, None if total == "*" else int(total)
+
+def job_path(url, output_dir):
+    """URL のファイル名で output_dir に置くパス"""
+    name = Path(urllib.parse.unquote(urllib.parse.urlsplit(url).path)).name or "download"
+    return Path(output_dir) / name
+
+def option(args, name, default=None):
+    if name in args:
+        index = args.index(name)
+        value = args[index + 1]
+        del args[index:index + 2]
+        return value
+    return default
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    try:
+        output_dir = Path(option(args, "-o", ASSETS_DIR))
+        connections = int(option(args, "-j", DEFAULT_CONNECTIONS))
+        list_path = option(args, "--list")
+        sha256 = option(args, "--sha256")
+    except (ValueError, IndexError) as e:
+        print(f"❌ 引数エラー: {e}")
+        sys.exit(1)
+
+    if list_path:
+        with open(list_path, "r", encoding="utf-8") as f:
+            jobs = [{**job, "path": output_dir / job.get("path", job_path(job["url"], "").name)} for job in json.load(f)]
+    else:
+        jobs = [{"url": url, "path": job_path(url, output_dir), "sha256": sha256} for url in args]
+    if not jobs:
+        print(__doc__)
+        sys.exit(1)
+
+    print(f"📥 {len(jobs)}件を {output_dir} へ（同時接続 {connections}）")
+    with DownloadManager(connections) as manager:
+        results, failures = manager.download_all(jobs)
+        for job, error in failures:
+            print(f"❌ {job['url']}: {error}")
+        manager.print_summary()
+    sys.exit(1 if failures else 0)
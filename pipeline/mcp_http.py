@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+HTTP版 MCP クライアント（configs/mcp-config.json の "type": "http" のサーバー用）
+Kamui Code MCP の生成エンドポイント（t2i / t2m / i2v / i2i / i2i3d）に
+JSON-RPC を POST し、JSON または SSE（text/event-stream）の応答を読む
+
+標準ライブラリだけで動く（GitHub Actions では requests / pillow しか入れていない）
+
+使用方法:
+  python3 mcp_http.py <サーバー名>                   # ツール一覧
+  python3 mcp_http.py <サーバー名> <ツール名> [引数JSON]
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import http.client
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MCP_CONFIG_PATH = REPO_ROOT / "configs" / "mcp-config.json"
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "creative-workshop-pipeline", "version": "1.0.0"}
+
+# 1回の HTTP リクエストのタイムアウト
+DEFAULT_TIMEOUT = 300
+# submit から完了までの待ち時間の上限（URL の先頭の種類ごと。動画・3Dは混んでいると数十分かかる）
+GENERATION_TIMEOUT = 900
+GENERATION_TIMEOUTS = {"t2i": 600, "i2i": 600, "t2m": 900, "i2v": 2400, "i2i3d": 2400}
+# status / result の一時的な失敗を、同じ request_id のまま続けて再試行する回数
+POLL_RETRIES = 5
+# submit / status / result 型のツールで状態を確認する間隔
+POLL_INTERVAL = 5
+# 生成の完了・失敗を表す status の値
+DONE_STATUSES = {"completed", "succeeded", "success", "done", "ok"}
+FAILED_STATUSES = {"failed", "error", "cancelled", "canceled"}
+
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>)\]]+")
+
+class MCPHttpError(RuntimeError):
+    """HTTPエラー・JSON-RPCエラー・応答の形式違い"""
+
+class MCPHttpTransientError(MCPHttpError):
+    """接続・読み込みの失敗、5xx / 429（同じリクエストを送り直してよい）"""
+
+class GenerationPending(MCPHttpError):
+    """
+    生成は受け付けられたが、完了を確認できなかった
+
+    request_id を generate(request_id=...) に渡すと、投げ直さずに続きを待てる
+    """
+
+    def __init__(self, message, request_id):
+        super().__init__(message)
+        self.request_id = request_id
+
+def generation_timeout_for(url):
+    """URL（/i2v/... など）に合った生成の待ち時間の上限（秒）"""
+    path = urllib.parse.urlsplit(url).path.strip("/")
+    return GENERATION_TIMEOUTS.get(path.split("/", 1)[0], GENERATION_TIMEOUT)
+
+def load_http_servers(path=MCP_CONFIG_PATH):
+    """mcp-config.json の HTTP サーバー（名前 → URL）"""
+    with open(path, "r", encoding="utf-8") as f:
+        servers = json.load(f)["mcpServers"]
+    return {name: server["url"] for name, server in servers.items() if server.get("type") == "http"}
+
+def _read_sse(response, request_id):
+    """SSE の data: 行から request_id の応答を探す"""
+    data_lines = []
+    for raw in response:
+        line = raw.decode("utf-8").rstrip("\r\n")
+        if line.startswith("data:"):
+            data_lines.append(line[5:].lstrip())
+            continue
+        if line == "" and data_lines:
+            message = json.loads("\n".join(data_lines))
+            data_lines = []
+            if isinstance(message, dict) and message.get("id") == request_id:
+                return message
+    raise MCPHttpError("SSEストリームが応答前に終了しました")
+
+class MCPHttpClient:
+    """1つの HTTP MCP サーバーとのセッション（スレッドごとに1つ使う）"""
+
+    def __init__(self, url, timeout=DEFAULT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session_id = None
+        self.server_info = None
+        self._next_id = 1
+        self._tools = None
+
+    def _post(self, message, timeout=None):
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "MCP-Protocol-Version": PROTOCOL_VERSION,
+        }
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        request = urllib.request.Request(self.url, data=json.dumps(message).encode("utf-8"),
+                                         headers=headers, method="POST")
+        # 応答本文の読み込み中のタイムアウト・切断・壊れたJSONも MCPHttpError にする（呼び出し側で再試行できる）
+        try:
+            with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+                self.session_id = response.headers.get("Mcp-Session-Id", self.session_id)
+                if "id" not in message:
+                    return None
+                content_type = response.headers.get("Content-Type", "")
+                if content_type.startswith("text/event-stream"):
+                    reply = _read_sse(response, message["id"])
+                else:
+                    reply = json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            body = e.read().decode("utf-8", "replace")[:500]
+            error_class = MCPHttpTransientError if e.code >= 500 or e.code == 429 else MCPHttpError
+            raise error_class(f"HTTP {e.code}: {body}") from e
+        except (urllib.error.URLError, TimeoutError, OSError, http.client.HTTPException) as e:
+            raise MCPHttpTransientError(f"接続エラー: {e}") from e
+        except ValueError as e:
+            # json.JSONDecodeError・UnicodeDecodeError
+            raise MCPHttpError(f"応答を読めませんでした: {e}") from e
+
+        if not isinstance(reply, dict):
+            raise MCPHttpError(f"JSON-RPC の応答ではありません: {str(reply)[:200]}")
+        if "error" in reply:
+            error = reply["error"]
+            if not isinstance(error, dict):
+                raise MCPHttpError(str(error))
+            raise MCPHttpError(f"{error.get('message', 'MCP error')} (code {error.get('code')})")
+        return reply.get("result", {})
+
+    def request(self, method, params=None, timeout=None):
+        if self.server_info is None and method != "initialize":
+            self.initialize()
+        message = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        self._next_id += 1
+        if params is not None:
+            message["params"] = params
+        return self._post(message, timeout)
+
+    def initialize(self):
+        result = self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO,
+        })
+        self.server_info = result.get("serverInfo", {})
+        self._post({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        return result
+
+    def list_tools(self):
+        if self._tools is None:
+            self._tools = self.request("tools/list", {}).get("tools", [])
+        return self._tools
+
+    def call_tool(self, name, arguments=None, timeout=None):
+        result = self.request("tools/call", {"name": name, "arguments": arguments or {}}, timeout)
+        if result.get("isError"):
+            raise MCPHttpError(f"{name}: {result_text(result)[:500]}")
+        return result
+
+    def generate(self, arguments, tool=None, poll_interval=POLL_INTERVAL, timeout=None,
+                 generation_timeout=None, request_id=None):
+        """
+        生成ツールを呼んで最終結果を返す
+
+        ツールが *_submit / *_status / *_result の3つ組なら、submit して
+        完了まで status を確認してから result を取る。そうでなければ1回呼ぶだけ
+
+        status / result の一時的な失敗は同じ request_id で再試行し、それでも確認できなければ
+        GenerationPending を投げる（その request_id を渡すと submit せずに続きを待つ）
+
+        Args:
+            timeout: 1回の HTTP リクエストのタイムアウト
+            generation_timeout: 完了までの待ち時間の上限（省略時は URL の種類ごとの値）
+            request_id: 前回 submit した生成の続きを待つ
+        """
+        names = [t["name"] for t in self.list_tools()]
+        if tool is None:
+            submit = next((n for n in names if n.endswith("_submit")), None)
+            if submit is None:
+                tool = next((n for n in names if not n.endswith(("_status", "_result"))), None)
+                if tool is None:
+                    raise MCPHttpError(f"{self.url}: 生成ツールが見つかりません")
+                return self.call_tool(tool, arguments, timeout)
+        elif not tool.endswith("_submit"):
+            return self.call_tool(tool, arguments, timeout)
+        else:
+            submit = tool
+
+        base = submit[:-len("_submit")]
+        if request_id is None:
+            submitted = result_json(self.call_tool(submit, arguments, timeout))
+            request_id = submitted.get("request_id") or submitted.get("requestId") or submitted.get("id")
+            if not request_id:
+                raise MCPHttpError(f"{submit}: request_id がありません")
+
+        deadline = time.monotonic() + (generation_timeout or generation_timeout_for(self.url))
+        while True:
+            status = result_json(self._poll(f"{base}_status", request_id, deadline, poll_interval, timeout))
+            state = str(status.get("status", "")).lower()
+            if state in DONE_STATUSES:
+                break
+            if state in FAILED_STATUSES:
+                raise MCPHttpError(f"{base}: 生成に失敗しました（{status}）")
+            if time.monotonic() > deadline:
+                raise GenerationPending(f"{base}: 生成がタイムアウトしました（request_id {request_id}）", request_id)
+            time.sleep(poll_interval)
+        return self._poll(f"{base}_result", request_id, deadline, poll_interval, timeout)
+
+    def _poll(self, name, request_id, deadline, poll_interval, timeout=None):
+        """status / result を呼ぶ（一時的な失敗は同じ request_id で間隔を広げながら再試行）"""
+        for attempt in range(POLL_RETRIES + 1):
+            try:
+                return self.call_tool(name, {"request_id": request_id}, timeout)
+            except MCPHttpTransientError as e:
+                if attempt == POLL_RETRIES or time.monotonic() > deadline:
+                    raise GenerationPending(f"{name}: {e}（request_id {request_id}）", request_id) from e
+                time.sleep(min(max(poll_interval, 0.1) * 2 ** attempt, 30))
+
+def result_text(result):
+    """tools/call の結果の text コンテンツ"""
+    return "\n".join(item.get("text", "") for item in result.get("content", []) if item.get("type") == "text")
+
+def result_json(result):
+    """text コンテンツを JSON として読む（JSONでなければ {"text": ...}）"""
+    if "structuredContent" in result:
+        return result["structuredContent"]
+    text = result_text(result)
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return {"text": text}
+    return value if isinstance(value, dict) else {"value": value}
+
+def result_assets(result):
+    """
+    生成結果から素材を取り出す
+
+    Returns:
+        [("url", URL) | ("data", (バイト列, MIMEタイプ)), ...]
+    """
+    assets = []
+    for item in result.get("content", []):
+        kind = item.get("type")
+        if kind in ("image", "audio") and item.get("data"):
+            assets.append(("data", (base64.b64decode(item["data"]), item.get("mimeType"))))
+        elif kind == "resource":
+            resource = item.get("resource", {})
+            if resource.get("blob"):
+                assets.append(("data", (base64.b64decode(resource["blob"]), resource.get("mimeType"))))
+            elif str(resource.get("uri", "")).startswith("http"):
+                assets.append(("url", resource["uri"]))
+        elif kind == "resource_link" and str(item.get("uri", "")).startswith("http"):
+            assets.append(("url", item["uri"]))
+        elif kind == "text":
+            for url in URL_PATTERN.findall(item.get("text", "")):
+                if ("url", url) not in assets:
+                    assets.append(("url", url))
+    return assets
+
+def data_uri(path, mime_type=None):
+    """ローカルファイルを data: URI にする（画像URLを受け取るツールに渡す用）"""
+    path = Path(path)
+    mime_type = mime_type or {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+                              ".webp": "image/webp"}.get(path.suffix.lower(), "application/octet-stream")
+    return f"data:{mime_type};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    servers = load_http_servers()
+    if not args or args[0] not in servers:
+        print("使用方法: python3 mcp_http.py <サーバー名> [ツール名 [引数JSON]]")
+        print("サーバー:")
+        for name, url in servers.items():
+            print(f"  {name}: {url}")
+        sys.exit(1)
+
+    client = MCPHttpClient(servers[args[0]])
+    if len(args) == 1:
+        for tool in client.list_tools():
+            print(f"🔧 {tool['name']}: {tool.get('description', '')}")
+    else:
+        arguments = json.loads(args[2]) if len(args) > 2 else {}
+        result = client.call_tool(args[1], arguments)
+        print(result_text(result))
+        for kind, value in result_assets(result):
+            print(f"📦 {kind}: {value if kind == 'url' else f'{len(value[0])} bytes {value[1]}'}")
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Kamui Code MCP の生成エンドポイントのローカル代替サーバー（オフラインでの計測・回帰確認用）
+
+configs/mcp-config.json と同じパス（/t2i/google/imagen など）で HTTP MCP を受け付け、
+同じ形の submit / status / result ツールを返す。生成の代わりに、待ち時間のあとで
+用意しておいた PNG / MP3 / MP4 / GLB を /files/ から配信する
+
+- 待ち時間: ツールごとの基準値 × 対数正規分布のゆらぎ（--jitter）
+- 失敗率: ツールごとに status が failed になる割合（--fail-rate）
+- /files/ の配信は static_server.py のハンドラー（keep-alive・Range・ETag）
+- 途中切断: /files/ の応答のうち --drop-rate の割合を、本文の半分で切る（再開の確認用）
+- /__stats: ツールごとの submit・完了・失敗・status 確認の回数、ファイルの配信・切断の回数
+
+使用方法:
+  python3 mock_mcp_server.py [--port 8765] [--latency 秒 | ツール=秒 ...] [--jitter 0.3]
+                             [--fail-rate 0.1 | ツール=割合 ...] [--size ツール=KB ...]
+                             [--drop-rate 0.1] [--sse] [--seed 1] [--write-config mock-mcp-config.json]
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import zlib
+import hashlib
+import random
+import signal
+import struct
+import tempfile
+import threading
+import urllib.parse
+from pathlib import Path
+from http import HTTPStatus
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mcps" / "blender-mcp" / "scripts"))
+from static_server import StaticRequestHandler, STATS_PATH
+
+from mcp_http import MCP_CONFIG_PATH, PROTOCOL_VERSION
+
+DEFAULT_PORT = 8765
+
+# URLのパス → ツール名の接頭辞（configs/mcp-config.json のエンドポイントと同じパス）
+ENDPOINTS = {
+    "/t2i/google/imagen": "imagen",
+    "/t2m/google/lyria": "lyria",
+    "/i2v/fal/minimax/hailuo-02/pro": "hailuo",
+    "/i2i/fal/flux/kontext/max": "flux_kontext",
+    "/i2i3d/fal/hunyuan/3d-v21": "hunyuan3d",
+}
+
+# ツール → (返す素材の種類, 基準の待ち時間 秒, 大きさ KB)
+# 待ち時間は実際の生成の数十分の一（パイプライン側の処理時間を見やすくするため）
+TOOLS = {
+    "imagen": ("png", 0.5, 1024),
+    "lyria": ("mp3", 1.0, 2048),
+    "hailuo": ("mp4", 2.0, 4096),
+    "flux_kontext": ("png", 0.8, 1024),
+    "hunyuan3d": ("glb", 2.0, 4096),
+}
+
+MIME_TYPES = {"png": "image/png", "mp3": "audio/mpeg", "mp4": "video/mp4", "glb": "model/gltf-binary"}
+
+DEFAULT_JITTER = 0.3
+
+# ----------------------------------------------------------------------
+# 用意しておく素材（どれも中身として読める最小限の形式に、大きさ分の詰め物をする）
+# ----------------------------------------------------------------------
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def canned_png(size, width=64, height=64):
+    """グラデーションのPNG（大きさは私用の補助チャンクで合わせる）"""
+    rows = b"".join(b"\x00" + b"".join(bytes((x * 4, y * 4, 160)) for x in range(width)) for y in range(height))
+    data = (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b"IDAT", zlib.compress(rows)))
+    padding = size - len(data) - 12 * 2
+    if padding > 0:
+        data += _png_chunk(b"ppAd", bytes(padding))
+    return data + _png_chunk(b"IEND", b"")
+
+def canned_mp3(size):
+    """無音の MPEG-1 Layer III フレーム（128kbps・44.1kHz・1フレーム417バイト）"""
+    frame = b"\xff\xfb\x90\x64" + bytes(413)
+    return frame * max(1, size // len(frame))
+
+def canned_mp4(size):
+    """ftyp と free ボックスだけのMP4"""
+    ftyp = struct.pack(">I", 24) + b"ftypisom" + struct.pack(">I", 0x200) + b"isommp41"
+    padding = max(8, size - len(ftyp))
+    return ftyp + struct.pack(">I", padding) + b"free" + bytes(padding - 8)
+
+def canned_glb(size):
+    """三角形1枚のGLB（バッファの後ろを詰め物にする）"""
+    positions = struct.pack("<9f", 0, 0, 0, 1, 0, 0, 0, 1, 0)
+    binary_length = max(len(positions), (size - 512 + 3) // 4 * 4)
+    gltf = {
+        "asset": {"version": "2.0", "generator": "creative-workshop mock"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "name": "MockModel"}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}}]}],
+        "accessors": [{"bufferView": 0, "componentType": 5126, "count": 3, "type": "VEC3",
+                       "min": [0, 0, 0], "max": [1, 1, 0]}],
+        "bufferViews": [{"buffer": 0, "byteOffset": 0, "byteLength": len(positions)}],
+        "buffers": [{"byteLength": binary_length}],
+    }
+    json_chunk = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    json_chunk += b" " * (-len(json_chunk) % 4)
+    binary = positions + bytes(binary_length - len(positions))
+    length = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    return (struct.pack("<4sII", b"glTF", 2, length)
+            + struct.pack("<I4s", len(json_chunk), b"JSON") + json_chunk
+            + struct.pack("<I4s", len(binary), b"BIN\x00") + binary)
+
+CANNED = {"png": canned_png, "mp3": canned_mp3, "mp4": canned_mp4, "glb": canned_glb}
+
+# ----------------------------------------------------------------------
+# 生成ジョブ
+# ----------------------------------------------------------------------
+
+class MockGenerator:
+    """submit されたジョブの完了時刻と成否を決めて覚えておく"""
+
+    def __init__(self, files_dir, latency=None, fail_rate=None, sizes=None, jitter=DEFAULT_JITTER, seed=None,
+                 drop_rate=0.0):
+        self.files_dir = Path(files_dir)
+        self.latency = {tool: spec[1] for tool, spec in TOOLS.items()}
+        self.latency.update(latency or {})
+        self.fail_rate = {tool: 0.0 for tool in TOOLS}
+        self.fail_rate.update(fail_rate or {})
+        self.sizes = {tool: spec[2] * 1024 for tool, spec in TOOLS.items()}
+        self.sizes.update(sizes or {})
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self._random = random.Random(seed)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.counters = {tool: {"submitted": 0, "completed": 0, "failed": 0, "polls": 0} for tool in TOOLS}
+        self.counters["files"] = {"served": 0, "dropped": 0}
+        self.files = {}
+        self.files_dir.mkdir(parents=True, exist_ok=True)
+        for tool, (kind, _, _) in TOOLS.items():
+            name = f"{tool}.{kind}"
+            data = CANNED[kind](self.sizes[tool])
+            (self.files_dir / name).write_bytes(data)
+            self.files[tool] = (name, len(data), hashlib.sha256(data).hexdigest())
+
+    def tools(self, tool):
+        return [
+            {"name": f"{tool}_submit", "description": f"{tool} の生成を開始（モック）",
+             "inputSchema": {"type": "object", "properties": {"prompt": {"type": "string"},
+                                                               "image_url": {"type": "string"}}}},
+            {"name": f"{tool}_status", "description": "生成の状態",
+             "inputSchema": {"type": "object", "properties": {"request_id": {"type": "string"}},
+                             "required": ["request_id"]}},
+            {"name": f"{tool}_result", "description": "生成結果のURL",
+             "inputSchema": {"type": "object", "properties": {"request_id": {"type": "string"}},
+                             "required": ["request_id"]}},
+        ]
+
+    def call(self, tool, name, arguments, base_url):
+        """
+        tools/call を処理する
+
+        Returns:
+            (結果のdict, isError)
+        """
+        action = name[len(tool) + 1:] if name.startswith(f"{tool}_") else None
+        if action == "submit":
+            with self._lock:
+                delay = self.latency[tool]
+                if self.jitter:
+                    delay *= self._random.lognormvariate(0, self.jitter)
+                failed = self._random.random() < self.fail_rate[tool]
+                request_id = uuid.uuid4().hex
+                self._jobs[request_id] = (tool, time.monotonic() + delay, failed)
+                self.counters[tool]["submitted"] += 1
+            return {"request_id": request_id, "status": "IN_QUEUE"}, False
+        if action not in ("status", "result"):
+            return {"error": f"unknown tool: {name}"}, True
+
+        request_id = str(arguments.get("request_id", ""))
+        with self._lock:
+            job = self._jobs.get(request_id)
+            if job is None or job[0] != tool:
+                return {"error": f"unknown request_id: {request_id}"}, True
+            _, done_at, failed = job
+            done = time.monotonic() >= done_at
+            if action == "status":
+                self.counters[tool]["polls"] += 1
+                if not done:
+                    return {"request_id": request_id, "status": "IN_PROGRESS"}, False
+                if failed:
+                    # 失敗したジョブの result は呼ばれないので、ここで片付ける
+                    del self._jobs[request_id]
+                    self.counters[tool]["failed"] += 1
+                    return {"request_id": request_id, "status": "FAILED", "error": "mock generation failed"}, False
+                return {"request_id": request_id, "status": "COMPLETED"}, False
+            if not done:
+                return {"error": "generation is still in progress"}, True
+            del self._jobs[request_id]
+            self.counters[tool]["completed"] += 1
+
+        file_name, size, digest = self.files[tool]
+        return {
+            "request_id": request_id,
+            "url": f"{base_url}/files/{file_name}?job={request_id}",
+            "content_type": MIME_TYPES[TOOLS[tool][0]],
+            "size": size,
+            "sha256": digest,
+        }, False
+
+    def drop_download(self):
+        """/files/ の応答を途中で切るかどうか（--drop-rate）"""
+        with self._lock:
+            dropped = self._random.random() < self.drop_rate
+            self.counters["files"]["dropped" if dropped else "served"] += 1
+        return dropped
+
+class MockMCPHandler(StaticRequestHandler):
+    """POST は MCP（JSON-RPC）、GET は /files/ の配信と /__stats"""
+
+    generator = None
+    sse = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == STATS_PATH:
+            body = json.dumps(self.generator.counters, indent=2).encode("utf-8")
+            self._send_json(body)
+            return
+        super().do_GET()
+
+    def copyfile(self, source, outputfile):
+        try:
+            size = os.fstat(source.fileno()).st_size
+        except OSError:
+            size = None
+        if size is None or not self.generator.drop_download():
+            super().copyfile(source, outputfile)
+            return
+        # 回線が途中で切れた状態を再現する（本文を半分だけ送って接続を閉じる）
+        offset, count = self.send_range or (0, size)
+        self.send_range = (offset, count // 2)
+        super().copyfile(source, outputfile)
+        self.close_connection = True
+
+    def _send_json(self, body, headers=()):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        tool = ENDPOINTS.get(urllib.parse.urlsplit(self.path).path.rstrip("/"))
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        if tool is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "Unknown MCP endpoint")
+            return
+        try:
+            message = json.loads(body)
+        except json.JSONDecodeError:
+            self.send_error(HTTPStatus.BAD_REQUEST, "Invalid JSON")
+            return
+
+        if "id" not in message:
+            # 通知（notifications/initialized など）
+            self.send_response(HTTPStatus.ACCEPTED)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        headers = []
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "initialize":
+            headers.append(("Mcp-Session-Id", uuid.uuid4().hex))
+            reply = {"result": {"protocolVersion": PROTOCOL_VERSION, "capabilities": {"tools": {}},
+                                "serverInfo": {"name": f"mock-{tool}", "version": "1.0.0"}}}
+        elif method == "tools/list":
+            reply = {"result": {"tools": self.generator.tools(tool)}}
+        elif method == "tools/call":
+            base_url = f"http://{self.headers.get('Host') or '127.0.0.1:%d' % self.server.server_address[1]}"
+            value, is_error = self.generator.call(tool, params.get("name", ""), params.get("arguments") or {}, base_url)
+            reply = {"result": {"content": [{"type": "text", "text": json.dumps(value)}], "isError": is_error}}
+        elif method == "ping":
+            reply = {"result": {}}
+        else:
+            reply = {"error": {"code": -32601, "message": f"Method not found: {method}"}}
+        reply = {"jsonrpc": "2.0", "id": message["id"], **reply}
+
+        payload = json.dumps(reply).encode("utf-8")
+        if not self.sse:
+            self._send_json(payload, headers)
+            return
+        payload = b"event: message\ndata: " + payload + b"\n\n"
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 既定の5だと同時接続が多いときに SYN が落ち、1秒の再送待ちが遅延の裾に混ざる
+    request_queue_size = 128
+
+def make_mock_server(port=0, host="127.0.0.1", files_dir=None, sse=False, **generator_options):
+    """
+    モックサーバーを作る（port=0 なら空きポート）
+
+    generator_options は MockGenerator の latency / fail_rate / sizes / jitter / seed / drop_rate
+    """
+    files_dir = Path(files_dir or tempfile.mkdtemp(prefix="mock-mcp-"))
+    generator = MockGenerator(files_dir / "files", **generator_options)
+    handler_class = type("Handler", (MockMCPHandler,), {"generator": generator, "sse": sse})
+    server = MockServer((host, port), partial(handler_class, directory=str(files_dir)))
+    server.generator = generator
+    return server
+
+def mock_config(base_url, path=MCP_CONFIG_PATH):
+    """mcp-config.json の HTTP サーバーの URL をモックサーバーに向けた設定"""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    for server in config["mcpServers"].values():
+        if server.get("type") == "http":
+            server["url"] = base_url + urllib.parse.urlsplit(server["url"]).path
+    return config
+
+def parse_tool_values(values, convert, name):
+    """["0.5", "hunyuan3d=3"] → {全ツールまたは指定ツール: 値}"""
+    result = {}
+    for value in values:
+        tool, _, number = value.rpartition("=")
+        tools = [tool] if tool else list(TOOLS)
+        if tool and tool not in TOOLS:
+            raise ValueError(f"{name}: 不明なツール {tool}（{', '.join(TOOLS)}）")
+        for key in tools:
+            result[key] = convert(number)
+    return result
+
+def option_values(args, name):
+    values = []
+    while name in args:
+        index = args.index(name)
+        values.append(args[index + 1])
+        del args[index:index + 2]
+    return values
+
+def parse_mock_options(args):
+    """CLIの引数から make_mock_server のキーワード引数を作る（args から取り除く）"""
+    options = {
+        "latency": parse_tool_values(option_values(args, "--latency"), float, "--latency"),
+        "fail_rate": parse_tool_values(option_values(args, "--fail-rate"), float, "--fail-rate"),
+        "sizes": parse_tool_values(option_values(args, "--size"), lambda kb: int(float(kb) * 1024), "--size"),
+    }
+    jitter = option_values(args, "--jitter")
+    if jitter:
+        options["jitter"] = float(jitter[-1])
+    drop_rate = option_values(args, "--drop-rate")
+    if drop_rate:
+        options["drop_rate"] = float(drop_rate[-1])
+    seed = option_values(args, "--seed")
+    if seed:
+        options["seed"] = int(seed[-1])
+    return options
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    try:
+        options = parse_mock_options(args)
+        port = int((option_values(args, "--port") or [DEFAULT_PORT])[-1])
+        config_path = (option_values(args, "--write-config") or [None])[-1]
+    except (ValueError, IndexError) as e:
+        print(f"❌ 引数エラー: {e}")
+        sys.exit(1)
+    sse = "--sse" in args
+
+    # terminate() でも一時ディレクトリを片付けてから終わる
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, stop)
+
+    with tempfile.TemporaryDirectory(prefix="mock-mcp-") as files_dir, \
+            make_mock_server(port, files_dir=files_dir, sse=sse, **options) as httpd:
+        base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+        generator = httpd.generator
+        print(f"🧪 モックMCPサーバー: {base_url}（応答: {'SSE' if sse else 'JSON'}）")
+        for path, tool in ENDPOINTS.items():
+            name, size, _ = generator.files[tool]
+            print(f"  {tool:<13} {base_url}{path}  待ち {generator.latency[tool]:g}s・"
+                  f"失敗率 {generator.fail_rate[tool]:.0%}・{name} {size / 1024:.0f}KB")
+        print(f"📈 統計: {base_url}{STATS_PATH}")
+        if config_path:
+            temp_path = f"{config_path}.part"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(mock_config(base_url), f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, config_path)
+            print(f"📝 設定: {config_path}（orchestrate.py --mcp-config {config_path}）")
+        print("Press Ctrl+C to stop")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 停止しました")
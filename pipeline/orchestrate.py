@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+生成 → 後処理 → エクスポート → Three.js統合 のパイプラインを asyncio で実行
+プロジェクトごとにステージのDAGを組み、依存のないブランチ（パノラマ・音楽・モデル）は同時に進める
+
+プロジェクトごとのDAG:
+  panorama  (t2i)    パノラマ背景              ─┐
+  music     (t2m)    BGM                        │ 素材のみ（assets/<プロジェクト>/）
+  video     (i2v)    パノラマから動画 ← panorama ┘ （--video のときだけ）
+  concept   (t2i)    キャラクターのコンセプト画像
+  cleanup   (postprocess)  kamui-code-mcp/batch_process.py で背景除去 ← concept
+  model     (i2i3d)  Hunyuan3Dで3Dモデル化 → Blenderプロジェクトの exports/ へ ← cleanup
+  export    (export)       export_project.py（.blend があるときだけ）
+  integrate (integrate)    integrate_to_threejs.py ← model, export
+
+- ステージの種類ごとに同時実行数を制限（--limit t2i=2 など、複数プロジェクトで共有）
+- configs/quality-criteria.yaml の retry_conditions に該当する失敗だけ再試行
+  （missing_assets: 生成・ダウンロードの失敗、build_failed: 後処理・エクスポート・統合の失敗）
+- 生成済みの素材があれば再利用（--force で作り直す）
+- 最後にステージごとの時間とクリティカルパスを表示
+
+使用方法:
+  python3 orchestrate.py <プロジェクト名> [<プロジェクト名> ...] [--theme fantasy] [--tier standard]
+                         [--video] [--limit 種類=数] [--skip export,integrate] [--force] [--poll-interval 5]
+                         [--connections 8]
+                         [--mcp-config configs/mcp-config.json] [--json レポート.json] [--dry-run]
+"""
+
+import os
+import sys
+import json
+import time
+import string
+import asyncio
+from pathlib import Path
+
+from mcp_http import (
+    MCPHttpClient, MCPHttpError, GenerationPending, MCP_CONFIG_PATH, REPO_ROOT, POLL_INTERVAL,
+    load_http_servers, result_assets, result_json, data_uri,
+)
+from downloads import DownloadManager, DownloadError, DEFAULT_CONNECTIONS
+
+QUALITY_CRITERIA_PATH = REPO_ROOT / "configs" / "quality-criteria.yaml"
+PROMPTS_DIR = REPO_ROOT / "prompts"
+ASSETS_DIR = REPO_ROOT / "assets"
+BLENDER_SCRIPTS_DIR = REPO_ROOT / "mcps" / "blender-mcp" / "scripts"
+KAMUI_DIR = REPO_ROOT / "mcps" / "kamui-code-mcp"
+BLENDER_PROJECTS_DIR = Path("/Users/nukuiyuki/Dev/mcp-tools/Blender/projects")
+
+# ステージ → 使うMCPサーバー（configs/mcp-config.json の名前）
+STAGE_SERVERS = {
+    "panorama": "t2i-google-imagen3",
+    "music": "t2m-google-lyria",
+    "video": "i2v-fal-hailuo-02-pro",
+    "concept": "t2i-google-imagen3-fast",
+    "model": "i2i3d-fal-hunyuan3d-v21",
+}
+
+# ステージの種類ごとの同時実行数（全プロジェクト共通）
+DEFAULT_LIMITS = {
+    "t2i": 2,
+    "t2m": 1,
+    "i2v": 1,
+    "i2i3d": 1,
+    "postprocess": 2,
+    "export": 1,
+    "integrate": 1,
+}
+
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 2.0
+
+DEFAULT_THEME = "fantasy"
+DEFAULT_TIER = "standard"
+CONCEPT_PROMPT = ("A ${theme} unicorn character, full body, three-quarter view, centered, "
+                  "plain white background, soft studio lighting, game-ready 3D concept art")
+
+class StageFailed(Exception):
+    """ステージの失敗（condition は retry_conditions の名前）"""
+
+    def __init__(self, condition, message):
+        super().__init__(message)
+        self.condition = condition
+
+class StageSkipped(Exception):
+    """実行する必要がない（.blend がないなど）"""
+
+def load_retry_conditions(path=QUALITY_CRITERIA_PATH):
+    """quality-criteria.yaml の retry_conditions"""
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return set(yaml.safe_load(f).get("retry_conditions") or [])
+
+def load_prompt(name, theme):
+    """prompts/<name>.txt の ${theme} を置き換える"""
+    template = (PROMPTS_DIR / f"{name}.txt").read_text(encoding="utf-8")
+    return string.Template(template).safe_substitute(theme=theme)
+
+class Stage:
+    """DAGの1ステージ"""
+
+    def __init__(self, project, name, kind, action, deps=()):
+        self.project = project
+        self.name = name
+        self.kind = kind
+        self.action = action
+        self.deps = list(deps)
+        self.status = "pending"
+        self.attempts = 0
+        self.error = None
+        self.output = None
+        # 依存が終わった時刻・実行開始（同時実行枠の取得）時刻・終了時刻（パイプライン開始からの秒）
+        self.ready = None
+        self.started = None
+        self.finished = None
+        self.done = asyncio.Event()
+
+    @property
+    def key(self):
+        return f"{self.project}:{self.name}"
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def queued(self):
+        if self.ready is None or self.started is None:
+            return 0.0
+        return self.started - self.ready
+
+class Pipeline:
+    """ステージのDAGを依存順・同時実行数の上限内で実行する"""
+
+    def __init__(self, limits=None, retry_conditions=(), max_attempts=MAX_ATTEMPTS, backoff=RETRY_BACKOFF):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.retry_conditions = set(retry_conditions)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.stages = []
+        # 生成結果のダウンロードに使う DownloadManager（build_pipeline で設定）
+        self.downloader = None
+        self._semaphores = {}
+        self._clock = None
+
+    def add(self, stage):
+        self.stages.append(stage)
+        return stage
+
+    def _now(self):
+        return time.perf_counter() - self._clock
+
+    def _semaphore(self, kind):
+        if kind not in self._semaphores:
+            self._semaphores[kind] = asyncio.Semaphore(self.limits.get(kind, 1))
+        return self._semaphores[kind]
+
+    async def run(self):
+        self._clock = time.perf_counter()
+        await asyncio.gather(*(self._run_stage(stage) for stage in self.stages))
+        return self._now()
+
+    async def _run_stage(self, stage):
+        try:
+            for dep in stage.deps:
+                await dep.done.wait()
+            failed = [dep.key for dep in stage.deps if dep.status in ("failed", "blocked")]
+            if failed:
+                stage.status = "blocked"
+                stage.error = f"依存ステージが失敗: {', '.join(failed)}"
+                log(stage, f"⛔ {stage.error}")
+                return
+
+            stage.ready = self._now()
+            async with self._semaphore(stage.kind):
+                stage.started = self._now()
+                await self._attempt(stage)
+                stage.finished = self._now()
+        finally:
+            stage.done.set()
+
+    async def _attempt(self, stage):
+        while True:
+            stage.attempts += 1
+            try:
+                stage.output = await stage.action(stage)
+                stage.status = "ok" if stage.status != "cached" else "cached"
+                log(stage, f"✅ {describe_output(stage.output)}")
+                return
+            except StageSkipped as e:
+                stage.status = "skipped"
+                stage.error = str(e)
+                log(stage, f"⏭️  {e}")
+                return
+            except StageFailed as e:
+                stage.error = f"[{e.condition}] {e}"
+                retry = e.condition in self.retry_conditions and stage.attempts < self.max_attempts
+                if not retry:
+                    stage.status = "failed"
+                    log(stage, f"❌ {stage.error}")
+                    return
+                delay = self.backoff * 2 ** (stage.attempts - 1)
+                log(stage, f"🔁 {stage.error} → {delay:g}秒後に再試行（{stage.attempts + 1}/{self.max_attempts}）")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                stage.status = "failed"
+                stage.error = f"{type(e).__name__}: {e}"
+                log(stage, f"❌ {stage.error}")
+                return
+
+    def critical_path(self):
+        """
+        終了が最も遅いステージから、最後に終わった依存を辿った経路
+
+        Returns:
+            開始側からのステージのリスト
+        """
+        finished = [stage for stage in self.stages if stage.finished is not None]
+        if not finished:
+            return []
+        stage = max(finished, key=lambda s: s.finished)
+        path = [stage]
+        while True:
+            deps = [dep for dep in stage.deps if dep.finished is not None]
+            if not deps:
+                break
+            stage = max(deps, key=lambda s: s.finished)
+            path.append(stage)
+        return path[::-1]
+
+def log(stage, message):
+    print(f"[{stage.key}] {message}", flush=True)
+
+def describe_output(output):
+    if output is None:
+        return "完了"
+    if isinstance(output, Path):
+        try:
+            return f"{output.name}（{output.stat().st_size / (1024 * 1024):.2f}MB）"
+        except OSError:
+            return output.name
+    return str(output)
+
+# ----------------------------------------------------------------------
+# ステージの処理
+# ----------------------------------------------------------------------
+
+class ProjectContext:
+    """1プロジェクト分の設定と出力先"""
+
+    def __init__(self, name, theme=DEFAULT_THEME, tier=DEFAULT_TIER, servers=None, force=False,
+                 assets_dir=ASSETS_DIR, blender_projects_dir=BLENDER_PROJECTS_DIR, poll_interval=POLL_INTERVAL,
+                 downloader=None):
+        self.name = name
+        self.theme = theme
+        self.tier = tier
+        self.servers = servers or {}
+        self.force = force
+        self.poll_interval = poll_interval
+        # 生成結果のダウンロード（複数プロジェクトで接続数の上限を共有する）
+        self.downloader = downloader or DownloadManager()
+        self.assets_dir = Path(assets_dir) / name
+        self.blender_project_dir = Path(blender_projects_dir) / name
+        self.log_dir = self.assets_dir / "logs"
+
+def existing_output(directory, stem):
+    """directory に stem.* があればそのパス"""
+    if not directory.exists():
+        return None
+    for path in sorted(directory.glob(f"{stem}.*")):
+        if path.is_file() and not path.name.startswith("."):
+            return path
+    return None
+
+def _suffix_for(kind, value, default_suffix):
+    if kind == "url":
+        suffix = Path(value.split("?", 1)[0]).suffix
+        return suffix if 1 < len(suffix) <= 5 else default_suffix
+    mime_suffixes = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp",
+                     "audio/mpeg": ".mp3", "audio/wav": ".wav", "video/mp4": ".mp4",
+                     "model/gltf-binary": ".glb"}
+    return mime_suffixes.get(value[1], default_suffix)
+
+def generate_action(ctx, server_key, directory, stem, default_suffix, arguments):
+    """
+    MCPの生成ツールを呼んで、最初の素材を directory/stem.<拡張子> に保存するアクション
+
+    arguments は引数dict、または stage を受け取って引数dictを返す関数
+    完了を確認できなかった生成は、再試行のとき submit し直さずに同じ request_id の続きを待つ
+    （生成は1回ごとに課金される）
+    """
+    pending = {}
+
+    async def action(stage):
+        directory.mkdir(parents=True, exist_ok=True)
+        if not ctx.force:
+            cached = existing_output(directory, stem)
+            if cached:
+                stage.status = "cached"
+                return cached
+
+        server = STAGE_SERVERS[server_key]
+        url = ctx.servers.get(server)
+        if not url:
+            raise StageFailed("missing_assets", f"MCPサーバー '{server}' が設定にありません")
+        call_arguments = arguments(stage) if callable(arguments) else arguments
+
+        def run():
+            client = MCPHttpClient(url)
+            try:
+                result = client.generate(call_arguments, poll_interval=ctx.poll_interval,
+                                         request_id=pending.pop("request_id", None))
+            except GenerationPending as e:
+                pending["request_id"] = e.request_id
+                raise
+            assets = result_assets(result)
+            if not assets:
+                raise StageFailed("missing_assets", f"{server}: 結果に素材がありません")
+            kind, value = assets[0]
+            destination = directory / f"{stem}{_suffix_for(kind, value, default_suffix)}"
+            if kind == "url":
+                # 結果に sha256 / size があれば検証する
+                info = result_json(result)
+                ctx.downloader.fetch(value, destination, info.get("sha256"), info.get("size"))
+                return destination
+            temp_path = destination.with_name(f".{destination.name}.part")
+            temp_path.write_bytes(value[0])
+            os.replace(temp_path, destination)
+            return destination
+
+        try:
+            return await asyncio.to_thread(run)
+        except (MCPHttpError, DownloadError) as e:
+            raise StageFailed("missing_assets", str(e)) from e
+
+    return action
+
+async def run_command(stage, ctx, args, cwd=None):
+    """コマンドを実行し、出力を logs/<ステージ>.log に残す（失敗は build_failed）"""
+    ctx.log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = ctx.log_dir / f"{stage.name}.log"
+    process = await asyncio.create_subprocess_exec(
+        *[str(arg) for arg in args], cwd=cwd,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await process.communicate()
+    log_path.write_bytes(output)
+    if process.returncode != 0:
+        tail = output.decode("utf-8", "replace").strip().splitlines()[-3:]
+        raise StageFailed("build_failed", f"終了コード {process.returncode}（{log_path}）: {' / '.join(tail)}")
+    return log_path
+
+def cleanup_action(ctx, concept_stage):
+    """kamui-code-mcp の背景除去（batch_process.py）"""
+    async def action(stage):
+        source = concept_stage.output
+        output_dir = source.parent / "processed"
+        await run_command(stage, ctx, [
+            sys.executable, KAMUI_DIR / "batch_process.py", "remove_background", source,
+            "-o", output_dir, "-j", "1",
+        ], cwd=KAMUI_DIR)
+        result = output_dir / f"{source.stem}_transparent.png"
+        if not result.exists():
+            raise StageFailed("missing_assets", f"背景除去の出力がありません: {result}")
+        return result
+    return action
+
+def model_action(ctx, image_stage):
+    """Hunyuan3Dで3Dモデル化し、Blenderプロジェクトの exports/ に置いて最適化する"""
+    generate = generate_action(
+        ctx, "model", ctx.blender_project_dir / "exports", f"{ctx.name}_generated", ".glb",
+        lambda stage: {"image_url": data_uri(image_stage.output)},
+    )
+
+    async def action(stage):
+        path = await generate(stage)
+        if stage.status != "cached" and path.suffix == ".glb":
+            await asyncio.to_thread(optimize_generated, path)
+        return path
+    return action
+
+def optimize_generated(path):
+    """生成GLBを glb_optimize.py で最適化（numpy がなければそのまま）"""
+    sys.path.insert(0, str(BLENDER_SCRIPTS_DIR))
+    try:
+        from glb_optimize import optimize_glb, UnsupportedGLB
+    except ImportError:
+        return
+    try:
+        optimize_glb(path)
+    except UnsupportedGLB:
+        pass
+
+def export_action(ctx):
+    async def action(stage):
+        if not any(ctx.blender_project_dir.glob("**/*.blend")):
+            raise StageSkipped(".blend がないためエクスポートなし")
+        return await run_command(stage, ctx, [
+            sys.executable, BLENDER_SCRIPTS_DIR / "export_project.py", ctx.name, "--tier", ctx.tier,
+        ], cwd=BLENDER_SCRIPTS_DIR)
+    return action
+
+def integrate_action(ctx):
+    async def action(stage):
+        if not any((ctx.blender_project_dir / "exports").glob("*.glb")):
+            raise StageFailed("missing_assets", f"統合するGLBがありません: {ctx.blender_project_dir / 'exports'}")
+        return await run_command(stage, ctx, [
+            sys.executable, BLENDER_SCRIPTS_DIR / "integrate_to_threejs.py", ctx.name,
+        ], cwd=BLENDER_SCRIPTS_DIR)
+    return action
+
+def build_project_stages(pipeline, ctx, video=False, skip=()):
+    """1プロジェクト分のステージをDAGとして pipeline に追加"""
+    def add(name, kind, action, deps=()):
+        if name in skip:
+            return None
+        return pipeline.add(Stage(ctx.name, name, kind, action, [dep for dep in deps if dep]))
+
+    panorama = add("panorama", "t2i", generate_action(
+        ctx, "panorama", ctx.assets_dir / "panorama", "panorama", ".png",
+        {"prompt": load_prompt("panorama", ctx.theme)}))
+    add("music", "t2m", generate_action(
+        ctx, "music", ctx.assets_dir / "audio", "music", ".mp3",
+        {"prompt": load_prompt("music", ctx.theme)}))
+    if video and panorama:
+        add("video", "i2v", generate_action(
+            ctx, "video", ctx.assets_dir / "video", "panorama", ".mp4",
+            lambda stage: {"image_url": data_uri(panorama.output),
+                           "prompt": f"Slow cinematic camera pan across a {ctx.theme} landscape"}),
+            [panorama])
+
+    concept = add("concept", "t2i", generate_action(
+        ctx, "concept", ctx.assets_dir / "concept", "concept", ".png",
+        {"prompt": string.Template(CONCEPT_PROMPT).safe_substitute(theme=ctx.theme)}))
+    cleanup = add("cleanup", "postprocess", cleanup_action(ctx, concept), [concept]) if concept else None
+    # --skip cleanup なら背景除去前のコンセプト画像からモデル化する
+    image = cleanup or concept
+    model = add("model", "i2i3d", model_action(ctx, image), [image]) if image else None
+    export = add("export", "export", export_action(ctx))
+    add("integrate", "integrate", integrate_action(ctx), [model, export])
+
+# ----------------------------------------------------------------------
+# レポート
+# ----------------------------------------------------------------------
+
+STATUS_ICONS = {"ok": "✅", "cached": "♻️ ", "skipped": "⏭️ ", "failed": "❌", "blocked": "⛔", "pending": "…"}
+
+def print_report(pipeline, wall_time):
+    stage_total = sum(stage.duration for stage in pipeline.stages)
+    print()
+    print("📊 パイプライン結果")
+    print("=" * 78)
+    print(f"{'ステージ':<28}{'状態':<8}{'試行':>4}{'開始':>9}{'待ち':>9}{'所要':>9}")
+    print("-" * 78)
+    for stage in sorted(pipeline.stages, key=lambda s: (s.started is None, s.started or 0)):
+        started = f"{stage.started:8.1f}s" if stage.started is not None else f"{'-':>9}"
+        print(f"{stage.key:<28}{STATUS_ICONS[stage.status]:<8}{stage.attempts:>4}"
+              f"{started}{stage.queued:8.1f}s{stage.duration:8.1f}s")
+        if stage.status in ("failed", "blocked"):
+            print(f"   {stage.error}")
+    print("=" * 78)
+
+    path = pipeline.critical_path()
+    if path:
+        print("🔥 クリティカルパス:")
+        for stage in path:
+            queued = f" ＋待ち {stage.queued:.1f}s" if stage.queued >= 0.05 else ""
+            print(f"   {stage.key:<28}{stage.duration:7.1f}s{queued}")
+        print(f"   → 終了 {path[-1].finished:.1f}s")
+    parallelism = stage_total / wall_time if wall_time else 0
+    print(f"実時間: {wall_time:.1f}s  ステージ合計: {stage_total:.1f}s  （平均並列度 {parallelism:.1f}）")
+    if pipeline.downloader and (pipeline.downloader.results or pipeline.downloader.progress()["failed"]):
+        pipeline.downloader.print_summary()
+
+def report_json(pipeline, wall_time):
+    return {
+        "wall_seconds": round(wall_time, 3),
+        "stages": [{
+            "stage": stage.key,
+            "kind": stage.kind,
+            "status": stage.status,
+            "attempts": stage.attempts,
+            "ready": stage.ready,
+            "started": stage.started,
+            "finished": stage.finished,
+            "queued_seconds": round(stage.queued, 3),
+            "duration_seconds": round(stage.duration, 3),
+            "error": stage.error,
+            "output": str(stage.output) if stage.output else None,
+        } for stage in pipeline.stages],
+        "critical_path": [stage.key for stage in pipeline.critical_path()],
+        "downloads": pipeline.downloader.summary() if pipeline.downloader else None,
+    }
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def option(args, name, default=None):
+    if name in args:
+        index = args.index(name)
+        value = args[index + 1]
+        del args[index:index + 2]
+        return value
+    return default
+
+def parse_limits(values):
+    limits = {}
+    for value in values:
+        kind, _, count = value.partition("=")
+        if kind not in DEFAULT_LIMITS or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"--limit は 種類=数（種類: {', '.join(DEFAULT_LIMITS)}）: {value}")
+        limits[kind] = int(count)
+    return limits
+
+def build_pipeline(projects, theme=DEFAULT_THEME, tier=DEFAULT_TIER, video=False, skip=(), force=False,
+                   limits=None, mcp_config=MCP_CONFIG_PATH, assets_dir=ASSETS_DIR,
+                   blender_projects_dir=BLENDER_PROJECTS_DIR, max_attempts=MAX_ATTEMPTS, backoff=RETRY_BACKOFF,
+                   poll_interval=POLL_INTERVAL, connections=DEFAULT_CONNECTIONS):
+    servers = load_http_servers(mcp_config)
+    pipeline = Pipeline(limits, load_retry_conditions(), max_attempts, backoff)
+    pipeline.downloader = DownloadManager(connections)
+    for project in projects:
+        ctx = ProjectContext(project, theme, tier, servers, force, assets_dir, blender_projects_dir, poll_interval,
+                             pipeline.downloader)
+        build_project_stages(pipeline, ctx, video, skip)
+    return pipeline
+
+def main(argv):
+    args = list(argv)
+    try:
+        theme = option(args, "--theme", DEFAULT_THEME)
+        tier = option(args, "--tier", DEFAULT_TIER)
+        mcp_config = option(args, "--mcp-config", MCP_CONFIG_PATH)
+        json_path = option(args, "--json")
+        skip = set(filter(None, option(args, "--skip", "").split(",")))
+        max_attempts = int(option(args, "--max-attempts", MAX_ATTEMPTS))
+        poll_interval = float(option(args, "--poll-interval", POLL_INTERVAL))
+        connections = int(option(args, "--connections", DEFAULT_CONNECTIONS))
+        limit_values = []
+        while "--limit" in args:
+            limit_values.append(option(args, "--limit"))
+        limits = parse_limits(limit_values)
+    except (ValueError, IndexError) as e:
+        print(f"❌ 引数エラー: {e}")
+        return 1
+    video = "--video" in args
+    force = "--force" in args
+    dry_run = "--dry-run" in args
+    projects = [arg for arg in args if not arg.startswith("--")]
+    if not projects:
+        print(__doc__)
+        return 1
+
+    pipeline = build_pipeline(projects, theme, tier, video, skip, force, limits, mcp_config,
+                              max_attempts=max_attempts, poll_interval=poll_interval, connections=connections)
+    print(f"🎼 パイプライン: {len(projects)}プロジェクト / {len(pipeline.stages)}ステージ（テーマ: {theme}, ティア: {tier}）")
+    print(f"🔁 再試行する失敗: {', '.join(sorted(pipeline.retry_conditions))}（最大{pipeline.max_attempts}回）")
+    print(f"🚦 同時実行数: {', '.join(f'{kind}={count}' for kind, count in pipeline.limits.items())}")
+    if dry_run:
+        for stage in pipeline.stages:
+            deps = ", ".join(dep.name for dep in stage.deps) or "-"
+            print(f"   {stage.key:<28} [{stage.kind}] ← {deps}")
+        return 0
+
+    print()
+    wall_time = asyncio.run(pipeline.run())
+    pipeline.downloader.close()
+    print_report(pipeline, wall_time)
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report_json(pipeline, wall_time), f, indent=2, ensure_ascii=False)
+        print(f"📝 レポート: {json_path}")
+
+    return 0 if all(stage.status in ("ok", "cached", "skipped") for stage in pipeline.stages) else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+パイプラインのスループット計測（mock_mcp_server.py を相手にオフラインで動かす）
+
+モックサーバーを別プロセスで起動し、次の3つを計る:
+  generate     生成ツールの submit → status → result を同時に多数流す（MCPHttpClient）
+  download     生成結果のURLを downloads.py の DownloadManager で同時にダウンロードする
+  orchestrate  orchestrate.py のDAGを複数プロジェクト分まとめて実行する
+               （cleanup / export / integrate は外部ツールが要るので除く）
+
+モックの待ち時間を 0 にすると、パイプライン側だけの処理時間（オーバーヘッド）が見える
+
+使用方法:
+  python3 pipeline_benchmark.py [--phases generate,download,orchestrate] [--requests 40] [--concurrency 8]
+                                [--projects 4] [--video] [--poll-interval 0.1] [--json 結果.json]
+                                [--latency 秒 | ツール=秒] [--jitter 0.3] [--fail-rate 割合 | ツール=割合]
+                                [--size ツール=KB] [--drop-rate 割合] [--sse] [--seed 1]
+"""
+
+import io
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "mcps" / "blender-mcp" / "scripts"))
+from server_benchmark import free_port, wait_for_port, percentile
+
+import orchestrate
+from mcp_http import MCPHttpClient, MCPHttpError, load_http_servers, result_assets
+from downloads import DownloadManager
+from mock_mcp_server import ENDPOINTS, TOOLS
+
+PHASES = ("generate", "download", "orchestrate")
+
+DEFAULT_REQUESTS = 40
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PROJECTS = 4
+DEFAULT_POLL_INTERVAL = 0.1
+
+# モックサーバーにそのまま渡すオプション（値を1つ取るもの）
+MOCK_OPTIONS = ("--latency", "--jitter", "--fail-rate", "--size", "--drop-rate", "--seed")
+
+def start_mock_server(mock_args, work_dir):
+    """
+    モックサーバーを別プロセスで起動する
+
+    Returns:
+        (Popen, モック用の mcp-config.json のパス)
+    """
+    port = free_port()
+    config_path = Path(work_dir) / "mock-mcp-config.json"
+    process = subprocess.Popen(
+        [sys.executable, str(Path(__file__).resolve().parent / "mock_mcp_server.py"),
+         "--port", str(port), "--write-config", str(config_path), *mock_args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    # 設定ファイルは待ち受けを始めてから書かれる
+    deadline = time.monotonic() + 10
+    while not config_path.exists() and process.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if not config_path.exists() or not wait_for_port(port):
+        process.kill()
+        raise RuntimeError(f"モックサーバーが起動しませんでした: {process.stderr.read().decode('utf-8', 'replace')}")
+    return process, config_path
+
+def summarize(latencies, errors, elapsed, nbytes=None):
+    latencies = sorted(latencies)
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else float("nan"),
+    }
+    if nbytes is not None:
+        summary["megabytes"] = round(nbytes / (1024 * 1024), 1)
+        summary["mb_per_sec"] = round(nbytes / (1024 * 1024) / elapsed, 1) if elapsed else 0
+    return summary
+
+def bench_generate(servers, requests, concurrency, poll_interval):
+    """
+    生成ツールを requests 回（ツールを順番に）呼ぶ
+
+    Returns:
+        (集計, 成功した結果のURL一覧)
+    """
+    urls = sorted(set(servers.values()))
+    urls = [urls[i % len(urls)] for i in range(requests)]
+    latencies, errors, asset_urls = [], 0, []
+
+    def run(url):
+        client = MCPHttpClient(url)
+        started = time.perf_counter()
+        result = client.generate({"prompt": "benchmark"}, poll_interval=poll_interval)
+        return time.perf_counter() - started, result_assets(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for future in [pool.submit(run, url) for url in urls]:
+            try:
+                latency, assets = future.result()
+            except MCPHttpError:
+                errors += 1
+                continue
+            latencies.append(latency)
+            asset_urls.extend(value for kind, value in assets if kind == "url")
+    return summarize(latencies, errors, time.perf_counter() - started), asset_urls
+
+def bench_download(asset_urls, concurrency, work_dir):
+    """生成結果のURLを DownloadManager で並列にダウンロードする（同時接続 concurrency 本）"""
+    destination_dir = Path(work_dir) / "downloads"
+    jobs = [{"url": url, "path": destination_dir / f"{i:04d}{Path(url.split('?', 1)[0]).suffix}"}
+            for i, url in enumerate(asset_urls)]
+    with DownloadManager(concurrency, backoff=0.1) as manager:
+        started = time.perf_counter()
+        results, failures = manager.download_all(jobs, progress=False)
+        elapsed = time.perf_counter() - started
+        downloads = manager.summary()
+    summary = summarize([result["seconds"] for result in results], len(failures), elapsed,
+                        sum(result["bytes"] for result in results))
+    summary.update({key: downloads[key] for key in ("resumed", "retries", "connections_opened")})
+    return summary
+
+def bench_orchestrate(config_path, projects, video, poll_interval, work_dir, verbose=False):
+    """orchestrate.py のDAGを projects 個のプロジェクトで実行する"""
+    names = [f"bench-{i:02d}" for i in range(projects)]
+    pipeline = orchestrate.build_pipeline(
+        names, video=video, skip={"cleanup", "export", "integrate"}, force=True, mcp_config=config_path,
+        assets_dir=Path(work_dir) / "assets", blender_projects_dir=Path(work_dir) / "blender",
+        backoff=poll_interval, poll_interval=poll_interval, connections=DEFAULT_CONCURRENCY,
+    )
+    output = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if verbose else output):
+        wall_time = asyncio.run(pipeline.run())
+    pipeline.downloader.close()
+
+    kinds = {}
+    for stage in pipeline.stages:
+        if stage.status in ("ok", "cached"):
+            kinds.setdefault(stage.kind, []).append(stage.duration)
+    critical_path = pipeline.critical_path()
+    stage_total = sum(stage.duration for stage in pipeline.stages)
+    return {
+        "projects": projects,
+        "stages": len(pipeline.stages),
+        "failed": sum(stage.status in ("failed", "blocked") for stage in pipeline.stages),
+        "retries": sum(max(0, stage.attempts - 1) for stage in pipeline.stages),
+        "seconds": round(wall_time, 3),
+        "projects_per_min": round(projects / wall_time * 60, 1) if wall_time else 0,
+        "parallelism": round(stage_total / wall_time, 2) if wall_time else 0,
+        "critical_path": [stage.key for stage in critical_path],
+        "downloads": pipeline.downloader.summary(),
+        "kinds": {kind: summarize(durations, 0, wall_time) for kind, durations in sorted(kinds.items())},
+    }
+
+def print_summary(name, summary):
+    line = (f"{name:<14}{summary['requests']:>6}{summary['errors']:>7}{summary['per_sec']:>9.1f}"
+            f"{summary['p50_ms']:>10.1f}{summary['p95_ms']:>10.1f}{summary['p99_ms']:>10.1f}")
+    if "mb_per_sec" in summary:
+        line += f"{summary['mb_per_sec']:>9.1f}"
+    print(line)
+
+def print_results(results):
+    print()
+    print("📊 結果")
+    print(f"{'':<14}{'件数':>4}{'失敗':>5}{'件/秒':>7}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'MB/s':>9}")
+    print("-" * 75)
+    for name in ("generate", "download"):
+        if name in results:
+            print_summary(name, results[name])
+    if "download" in results:
+        result = results["download"]
+        print(f"{'':<14}（再開 {result['resumed']}件・再試行 {result['retries']}回・接続 {result['connections_opened']}本）")
+    if "orchestrate" in results:
+        result = results["orchestrate"]
+        for kind, summary in result["kinds"].items():
+            print_summary(f"stage:{kind}", summary)
+        print("-" * 75)
+        print(f"orchestrate: {result['projects']}プロジェクト / {result['stages']}ステージ を {result['seconds']:.2f}s"
+              f"（{result['projects_per_min']:.1f} プロジェクト/分・平均並列度 {result['parallelism']:.1f}・"
+              f"再試行 {result['retries']}・失敗 {result['failed']}）")
+        print(f"🔥 クリティカルパス: {' → '.join(result['critical_path'])}")
+
+def option(args, name, default):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    phases = option(args, "--phases", ",".join(PHASES)).split(",")
+    requests = int(option(args, "--requests", DEFAULT_REQUESTS))
+    concurrency = int(option(args, "--concurrency", DEFAULT_CONCURRENCY))
+    projects = int(option(args, "--projects", DEFAULT_PROJECTS))
+    poll_interval = float(option(args, "--poll-interval", DEFAULT_POLL_INTERVAL))
+    json_path = option(args, "--json", None)
+    mock_args = [value for i, arg in enumerate(args) if arg in MOCK_OPTIONS for value in (arg, args[i + 1])]
+    if "--sse" in args:
+        mock_args.append("--sse")
+    unknown = [phase for phase in phases if phase not in PHASES]
+    if unknown:
+        print(f"❌ 不明なフェーズ: {', '.join(unknown)}（{', '.join(PHASES)}）")
+        sys.exit(1)
+
+    print("🏁 パイプライン負荷テスト（モックMCPサーバー）")
+    print(f"🧪 モック: {' '.join(mock_args) or '既定（' + ', '.join(f'{t}={s[1]:g}s' for t, s in TOOLS.items()) + '）'}")
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="pipeline-bench-") as work_dir:
+        server, config_path = start_mock_server(mock_args, work_dir)
+        try:
+            servers = {name: url for name, url in load_http_servers(config_path).items()
+                       if any(url.endswith(path) for path in ENDPOINTS)}
+            asset_urls = []
+            if "generate" in phases or "download" in phases:
+                print(f"⏱️  generate: {requests}件・同時{concurrency}...")
+                results["generate"], asset_urls = bench_generate(servers, requests, concurrency, poll_interval)
+            if "download" in phases:
+                print(f"⏱️  download: {len(asset_urls)}件・同時{concurrency}...")
+                results["download"] = bench_download(asset_urls, concurrency, work_dir)
+            if "orchestrate" in phases:
+                print(f"⏱️  orchestrate: {projects}プロジェクト...")
+                results["orchestrate"] = bench_orchestrate(config_path, projects, "--video" in args,
+                                                           poll_interval, work_dir, "--verbose" in args)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if "generate" not in phases:
+        results.pop("generate", None)
+    print_results(results)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"📝 結果: {json_path}")